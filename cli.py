@@ -18,6 +18,7 @@ from src.core.analysis.analyzer import Analyzer
 from src.core.ingestion.ingestor import Ingestor
 from src.core.preprocess.preprocessor import Preprocessor
 from src.models.embeddings.pinecone_handler import PineconeHandler
+from src.utils.urls import document_id
 
 
 # Configure logging
@@ -145,7 +146,7 @@ def main():
                 
                 # Store in Pinecone (optional - will warn if fails)
                 try:
-                    vector_id = f"doc_{hash(url)}"
+                    vector_id = document_id(url)
                     metadata = {"url": url, "summary": summary[:1000], "title": title}
                     pinecone.upsert_vectors([(vector_id, content[:8000], metadata)])
                 except Exception as e:
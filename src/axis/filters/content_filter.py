@@ -1,6 +1,9 @@
 import logging
 import hashlib
-from typing import Dict, Any, List, Set
+from typing import Dict, Any, List, Set, Optional, Union
+from src.axis.filters.near_duplicate import SimHashIndex
+from src.axis.filters.relevance import RelevanceEngine
+from src.storage.dedup_store import DedupStore
 
 logger = logging.getLogger(__name__)
 
@@ -9,9 +12,19 @@ class Filter:
     Filters incoming OSINT data based on quality, relevance, and duplication.
     """
 
-    def __init__(self):
+    def __init__(self, near_duplicate_distance: Optional[int] = 3):
+        """
+        Args:
+            near_duplicate_distance: Max SimHash bit distance treated as a near-duplicate
+                (out of 64). None disables near-duplicate detection.
+        """
         self.min_content_length = 200
         self.min_word_count = 50
+        # Catches syndicated copies that differ only in boilerplate, next to the exact hashes
+        self.near_duplicates = None
+        if near_duplicate_distance is not None:
+            self.near_duplicates = SimHashIndex(max_distance=near_duplicate_distance)
+        self.relevance = RelevanceEngine()
     
     def filter_by_quality(self, data: Dict[str, Any]) -> bool:
         """
@@ -50,7 +63,7 @@ class Filter:
     
     def calculate_relevance_score(self, data: Dict[str, Any], keywords: List[str] = None) -> float:
         """
-        Calculate relevance score based on keyword matching.
+        Calculate relevance score based on keyword matching (BM25, title weighted).
         
         Args:
             data: The data item
@@ -62,35 +75,45 @@ class Filter:
         if not keywords:
             return 1.0  # No keywords specified, assume relevant
         
-        content = data.get('content', '').lower()
-        title = data.get('title', '').lower()
-        
-        if not content:
+        if not data.get('content'):
             return 0.0
         
-        # Count keyword matches
-        matches = 0
-        for keyword in keywords:
-            keyword_lower = keyword.lower()
-            # Weight title matches higher
-            if keyword_lower in title:
-                matches += 2
-            if keyword_lower in content:
-                matches += 1
-        
-        # Normalize score
-        max_possible = len(keywords) * 3  # 2 for title + 1 for content
-        score = min(matches / max_possible, 1.0) if max_possible > 0 else 0.0
-        
-        return score
+        return self.relevance.score(data, ' '.join(keywords))
+    
+    def filter_by_relevance(self, items: List[Dict[str, Any]], query: str, threshold: float,
+                            use_batch_idf: bool = True) -> List[Dict[str, Any]]:
+        """
+        Score a batch of items against a query and drop those below threshold.
+        
+        Args:
+            items: Data items with 'content' (and optionally 'title')
+            query: The research query
+            threshold: Minimum relevance score kept
+            use_batch_idf: Score with IDF from the whole candidate set (see RelevanceEngine)
+            
+        Returns:
+            Copies of the kept items, each with a 'relevance' score
+        """
+        if not items or not query:
+            return items
+        
+        scores = self.relevance.score_batch(items, query, use_batch_idf=use_batch_idf)
+        kept = []
+        for item, score in zip(items, scores):
+            if score >= threshold:
+                kept.append({**item, 'relevance': score})
+            else:
+                logger.debug(f"Filtered out {item.get('url', 'unknown')}: relevance {score:.2f} below {threshold}")
+        logger.info(f"Relevance filter kept {len(kept)}/{len(items)} items")
+        return kept
     
-    def is_duplicate(self, data: Dict[str, Any], seen_hashes: Set[str]) -> bool:
+    def is_duplicate(self, data: Dict[str, Any], seen_hashes: Union[Set[str], DedupStore]) -> bool:
         """
-        Check if data is a duplicate based on content hash.
+        Check if data is a duplicate based on content hash or SimHash similarity.
         
         Args:
             data: The data item
-            seen_hashes: Set of previously seen content hashes
+            seen_hashes: Set or DedupStore of previously seen content hashes
             
         Returns:
             True if duplicate, False otherwise
@@ -112,6 +135,10 @@ class Filter:
             logger.debug(f"Filtered out {url}: duplicate content")
             return True
         
+        if self.near_duplicates is not None and self.near_duplicates.check_and_add(content):
+            logger.debug(f"Filtered out {url}: near-duplicate content")
+            return True
+        
         # Add to seen hashes
         seen_hashes.add(content_hash)
         seen_hashes.add(url_hash)
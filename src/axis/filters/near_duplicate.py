@@ -0,0 +1,148 @@
+import logging
+import re
+import hashlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r'\w+')
+FINGERPRINT_BITS = 64
+
+class SimHashIndex:
+    """
+    Near-duplicate index over 64-bit SimHash fingerprints.
+
+    Two documents are near-duplicates when their fingerprints differ in at most
+    max_distance bits. Fingerprints are split into max_distance + 1 bands; by the
+    pigeonhole principle any match shares at least one band exactly, so a lookup
+    only compares against fingerprints in the same band buckets instead of
+    scanning the whole index.
+    """
+
+    def __init__(self, max_distance: int = 3, shingle_size: int = 3, capacity: int = 100_000):
+        """
+        Args:
+            max_distance: Maximum Hamming distance (out of 64 bits) treated as a duplicate.
+                0 only matches identical fingerprints; 3 is a common setting for web pages.
+            shingle_size: Words per shingle used as a SimHash feature.
+            capacity: Maximum fingerprints kept; the oldest are evicted first.
+        """
+        if not 0 <= max_distance < FINGERPRINT_BITS:
+            raise ValueError(f"max_distance must be between 0 and {FINGERPRINT_BITS - 1}")
+        self.max_distance = max_distance
+        self.shingle_size = shingle_size
+        self.capacity = capacity
+
+        bands = max_distance + 1
+        edges = [round(i * FINGERPRINT_BITS / bands) for i in range(bands + 1)]
+        self._bands: List[Tuple[int, int]] = [
+            (edges[i], (1 << (edges[i + 1] - edges[i])) - 1) for i in range(bands)
+        ]
+        self._tables: List[Dict[int, Set[int]]] = [{} for _ in self._bands]
+        self._fingerprints: "OrderedDict[int, None]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def fingerprint(self, text: str) -> int:
+        """
+        Compute the SimHash fingerprint of a text.
+
+        Args:
+            text: Document text.
+
+        Returns:
+            int: 64-bit fingerprint.
+        """
+        tokens = TOKEN_RE.findall(text.lower())
+        n = self.shingle_size
+        if len(tokens) >= n:
+            features = {' '.join(tokens[i:i + n]) for i in range(len(tokens) - n + 1)}
+        else:
+            features = set(tokens)
+        if not features:
+            return 0
+
+        hashes = [
+            int.from_bytes(hashlib.blake2b(f.encode('utf-8'), digest_size=8).digest(), 'big')
+            for f in features
+        ]
+        # Bit-sliced counters: counters[i] holds bit i of the per-position vote count for
+        # all 64 positions at once, so each feature costs ~log2(n) integer ops instead of 64
+        counters: List[int] = []
+        for h in hashes:
+            carry = h
+            for i in range(len(counters)):
+                counters[i], carry = counters[i] ^ carry, counters[i] & carry
+                if not carry:
+                    break
+            if carry:
+                counters.append(carry)
+
+        threshold = len(hashes) / 2
+        fingerprint = 0
+        for bit in range(FINGERPRINT_BITS):
+            votes = sum(((counter >> bit) & 1) << i for i, counter in enumerate(counters))
+            if votes > threshold:
+                fingerprint |= 1 << bit
+        return fingerprint
+
+    def _band_keys(self, fingerprint: int) -> List[int]:
+        return [(fingerprint >> shift) & mask for shift, mask in self._bands]
+
+    def find(self, fingerprint: int) -> Optional[int]:
+        """
+        Find an indexed fingerprint within max_distance of the given one.
+
+        Args:
+            fingerprint: Fingerprint to look up.
+
+        Returns:
+            Optional[int]: A matching fingerprint, or None.
+        """
+        if fingerprint in self._fingerprints:
+            return fingerprint
+        for table, key in zip(self._tables, self._band_keys(fingerprint)):
+            for candidate in table.get(key, ()):
+                if (candidate ^ fingerprint).bit_count() <= self.max_distance:
+                    return candidate
+        return None
+
+    def add(self, fingerprint: int):
+        """
+        Add a fingerprint to the index, evicting the oldest one when full.
+
+        Args:
+            fingerprint: Fingerprint to add.
+        """
+        if fingerprint in self._fingerprints:
+            return
+        self._fingerprints[fingerprint] = None
+        for table, key in zip(self._tables, self._band_keys(fingerprint)):
+            table.setdefault(key, set()).add(fingerprint)
+
+        if len(self._fingerprints) > self.capacity:
+            oldest, _ = self._fingerprints.popitem(last=False)
+            for table, key in zip(self._tables, self._band_keys(oldest)):
+                bucket = table.get(key)
+                if bucket is not None:
+                    bucket.discard(oldest)
+                    if not bucket:
+                        del table[key]
+
+    def check_and_add(self, text: str) -> bool:
+        """
+        Check whether a text is a near-duplicate of an indexed one; index it if not.
+
+        Args:
+            text: Document text.
+
+        Returns:
+            bool: True if a near-duplicate was already indexed.
+        """
+        fingerprint = self.fingerprint(text)
+        if self.find(fingerprint) is not None:
+            return True
+        self.add(fingerprint)
+        return False
@@ -0,0 +1,183 @@
+import logging
+import math
+import re
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r'\w+')
+
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below between
+both but by can could did do does doing down during each few for from further had has have having he her
+here hers herself him himself his how i if in into is it its itself just me more most my myself no nor not
+now of off on once only or other our ours ourselves out over own same she should so some such than that the
+their theirs them themselves then there these they this those through to too under until up very was we
+were what when where which while who whom why will with would you your yours yourself yourselves
+latest news current recent today update updates new
+""".split())
+
+Document = Union[str, Dict[str, Any]]
+Embedder = Callable[[List[str]], Sequence[Sequence[float]]]
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word tokens with stopwords and single characters removed."""
+    return [t for t in TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+def _count_words(pattern: "re.Pattern", text: str) -> int:
+    """Count matches of a term pattern that start on a word boundary."""
+    count = 0
+    for match in pattern.finditer(text):
+        start = match.start()
+        if start == 0 or not (text[start - 1].isalnum() or text[start - 1] == '_'):
+            count += 1
+    return count
+
+def cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
+    """Cosine similarity of two vectors (0.0 if either is all zeros)."""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+class RelevanceEngine:
+    """
+    Scores a batch of documents against a query in one pass.
+
+    Lexical relevance is BM25 over tokenized title and content, with IDF taken
+    from the batch itself, normalized to 0-1 by the query's maximum attainable
+    BM25 score. If an embedder is supplied, the result is blended with the
+    cosine similarity between query and document embeddings.
+
+    Batch IDF only means something over a real candidate set. For a single
+    document, or when a score must not depend on which other documents were
+    scored with it (threshold gates), pass use_batch_idf=False: every query term
+    is weighted equally and lengths are normalized against reference_length.
+    """
+
+    def __init__(self,
+                 k1: float = 1.2,
+                 b: float = 0.75,
+                 title_weight: int = 2,
+                 embedder: Optional[Embedder] = None,
+                 embedding_weight: float = 0.3,
+                 reference_length: int = 4000):
+        """
+        Args:
+            k1: BM25 term-frequency saturation.
+            b: BM25 length normalization.
+            title_weight: How many times title tokens are counted.
+            embedder: Optional callable mapping a list of texts to embedding vectors.
+            embedding_weight: Share of the final score taken from embedding similarity.
+            reference_length: Document length (characters) treated as average when
+                scoring without batch statistics.
+        """
+        self.k1 = k1
+        self.b = b
+        self.title_weight = title_weight
+        self.embedder = embedder
+        self.embedding_weight = embedding_weight if embedder else 0.0
+        self.reference_length = reference_length
+
+    def _document_text(self, document: Document) -> str:
+        if isinstance(document, dict):
+            title = document.get('title') or ''
+            return ' '.join([title] * self.title_weight + [document.get('content') or ''])
+        return str(document)
+
+    def score_batch(self, documents: List[Document], query: str, use_batch_idf: bool = True) -> List[float]:
+        """
+        Score documents against a query.
+
+        Args:
+            documents: Texts, or dicts with 'content' and optional 'title'
+            query: The research query
+            use_batch_idf: Take IDF and average length from this batch. When False each
+                score depends only on its own document (uniform IDF, reference length).
+
+        Returns:
+            List[float]: Scores between 0.0 and 1.0, in input order
+        """
+        if not documents:
+            return []
+        query_terms = list(dict.fromkeys(tokenize(query)))
+        if not query_terms:
+            return [1.0] * len(documents)
+
+        texts = [self._document_text(d) for d in documents]
+        # One literal-prefixed regex per query term lets re use its fast substring scan;
+        # character length stands in for token count in length normalization
+        term_patterns = [(term, re.compile(re.escape(term) + r'(?!\w)')) for term in query_terms]
+        lengths: List[int] = []
+        frequencies: List[Dict[str, int]] = []
+        doc_freq: Counter = Counter()
+        for text in texts:
+            text = text.lower()
+            tf = {}
+            for term, pattern in term_patterns:
+                count = _count_words(pattern, text)
+                if count:
+                    tf[term] = count
+            lengths.append(len(text))
+            frequencies.append(tf)
+            doc_freq.update(tf.keys())
+
+        n = len(texts)
+        if use_batch_idf:
+            avg_length = (sum(lengths) / n) or 1.0
+            # Smoothed IDF (always positive, so terms present in every document still count)
+            idf = {term: math.log(1 + (n - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5)) for term in query_terms}
+        else:
+            avg_length = self.reference_length
+            idf = {term: 1.0 for term in query_terms}
+        max_score = sum(idf[term] * (self.k1 + 1) for term in query_terms)
+
+        scores = []
+        for tf, length in zip(frequencies, lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / avg_length)
+            score = sum(idf[t] * f * (self.k1 + 1) / (f + norm) for t, f in tf.items())
+            scores.append(min(1.0, score / max_score))
+
+        if self.embedder is not None:
+            try:
+                vectors = self.embedder([query] + texts)
+                query_vector = vectors[0]
+                scores = [
+                    (1 - self.embedding_weight) * lexical
+                    + self.embedding_weight * max(0.0, cosine_similarity(query_vector, vector))
+                    for lexical, vector in zip(scores, vectors[1:])
+                ]
+            except Exception as e:
+                logger.warning(f"Embedding similarity unavailable, using BM25 only: {e}")
+        return scores
+
+    def score(self, document: Document, query: str) -> float:
+        """
+        Score one document on its own (no batch statistics).
+
+        Args:
+            document: Text, or a dict with 'content' and optional 'title'
+            query: The research query
+
+        Returns:
+            float: Score between 0.0 and 1.0
+        """
+        return self.score_batch([document], query, use_batch_idf=False)[0]
+
+    def filter(self, documents: List[Document], query: str, threshold: float) -> List[Document]:
+        """
+        Keep documents scoring at or above threshold.
+
+        Args:
+            documents: Texts, or dicts with 'content' and optional 'title'
+            query: The research query
+            threshold: Minimum score kept
+
+        Returns:
+            List[Document]: The kept documents, in input order
+        """
+        scores = self.score_batch(documents, query)
+        kept = [d for d, score in zip(documents, scores) if score >= threshold]
+        if len(kept) < len(documents):
+            logger.info(f"Relevance filter dropped {len(documents) - len(kept)}/{len(documents)} documents")
+        return kept
@@ -2,24 +2,47 @@ import logging
 import json
 import csv
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from bs4 import BeautifulSoup
 
+try:
+    import lxml  # noqa: F401
+    DEFAULT_FEATURES = 'lxml'
+except ImportError:
+    DEFAULT_FEATURES = 'html.parser'
+
 logger = logging.getLogger(__name__)
 
+# Compiled once at import; these run against every parsed document
+CONTENT_PATTERNS = [
+    re.compile(pattern, re.I) for pattern in (
+        'article-body', 'post-content', 'entry-content', 'story-body',
+        'article-content', 'main-content', 'content-body', 'post-body'
+    )
+]
+OG_PROPERTY_RE = re.compile(r'^og:')
+TWITTER_NAME_RE = re.compile(r'^twitter:')
+WHITESPACE_RE = re.compile(r'\s+')
+BLANK_LINES_RE = re.compile(r'\n\s*\n')
+
 class Parser:
     """
     Advanced parsers for various data formats with article extraction.
     """
 
-    def __init__(self):
-        pass
+    def __init__(self, features: Optional[str] = None):
+        """
+        Args:
+            features: BeautifulSoup tree builder; defaults to lxml when installed.
+        """
+        self.features = features or DEFAULT_FEATURES
 
     def extract_article_content(self, html: str, url: str) -> Dict[str, Any]:
         """
         Extract the main article content from HTML.
         
         Prioritizes semantic tags and uses heuristics to find the main content.
+        The HTML is parsed once; title, metadata and body all come from that tree.
         
         Args:
             html: Raw HTML string
@@ -38,17 +61,19 @@ class Parser:
             }
         
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = BeautifulSoup(html, self.features)
             
             # Extract title
             title = ''
             if soup.title:
-                title = soup.title.string.strip()
-            elif soup.find('h1'):
-                title = soup.find('h1').get_text(strip=True)
+                title = soup.title.get_text(strip=True)
+            if not title:
+                h1 = soup.find('h1')
+                if h1:
+                    title = h1.get_text(strip=True)
             
-            # Extract metadata
-            metadata = self.extract_metadata(html)
+            # Extract metadata from the same tree (before boilerplate is stripped)
+            metadata = self._extract_metadata_from_soup(soup)
             
             # Remove unwanted elements
             for element in soup(['script', 'style', 'nav', 'footer', 'header', 'aside', 'iframe', 'noscript', 'form']):
@@ -65,12 +90,8 @@ class Parser:
             
             # Priority 2: Common content class/id patterns
             if not content_area:
-                patterns = [
-                    'article-body', 'post-content', 'entry-content', 'story-body',
-                    'article-content', 'main-content', 'content-body', 'post-body'
-                ]
-                for pattern in patterns:
-                    found = soup.find(class_=re.compile(pattern, re.I)) or soup.find(id=re.compile(pattern, re.I))
+                for pattern in CONTENT_PATTERNS:
+                    found = soup.find(class_=pattern) or soup.find(id=pattern)
                     if found:
                         content_area = found
                         break
@@ -132,16 +153,31 @@ class Parser:
         Args:
             html: Raw HTML string
             
+        Returns:
+            Dictionary with metadata
+        """
+        try:
+            soup = BeautifulSoup(html, self.features)
+        except Exception as e:
+            logger.error(f"Error extracting metadata: {e}")
+            return {}
+        return self._extract_metadata_from_soup(soup)
+
+    def _extract_metadata_from_soup(self, soup: BeautifulSoup) -> Dict[str, Any]:
+        """
+        Extract metadata from an already-parsed document.
+
+        Args:
+            soup: Parsed HTML tree
+
         Returns:
             Dictionary with metadata
         """
         metadata = {}
         
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            
             # Open Graph tags
-            og_tags = soup.find_all('meta', property=re.compile(r'^og:'))
+            og_tags = soup.find_all('meta', property=OG_PROPERTY_RE)
             for tag in og_tags:
                 key = tag.get('property', '').replace('og:', '')
                 value = tag.get('content', '')
@@ -149,7 +185,7 @@ class Parser:
                     metadata[key] = value
             
             # Twitter Card tags
-            twitter_tags = soup.find_all('meta', attrs={'name': re.compile(r'^twitter:')})
+            twitter_tags = soup.find_all('meta', attrs={'name': TWITTER_NAME_RE})
             for tag in twitter_tags:
                 key = tag.get('name', '').replace('twitter:', '')
                 value = tag.get('content', '')
@@ -186,10 +222,10 @@ class Parser:
             return ''
         
         # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = WHITESPACE_RE.sub(' ', text)
         
         # Remove multiple newlines
-        text = re.sub(r'\n\s*\n', '\n\n', text)
+        text = BLANK_LINES_RE.sub('\n\n', text)
         
         # Strip leading/trailing whitespace
         text = text.strip()
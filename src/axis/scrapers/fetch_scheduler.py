@@ -0,0 +1,184 @@
+import logging
+import asyncio
+import threading
+import weakref
+import aiohttp
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+from src.utils.async_utils import on_helper_loop_exit
+
+logger = logging.getLogger(__name__)
+
+class _LoopState:
+    """Session and concurrency slots bound to one event loop."""
+
+    def __init__(self, max_in_flight: int):
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.global_slots = asyncio.Semaphore(max_in_flight)
+        self.host_slots: Dict[str, asyncio.Semaphore] = {}
+        # Requests holding or waiting for each host's slot; idle hosts are dropped
+        self.host_users: Dict[str, int] = {}
+
+    @property
+    def has_open_session(self) -> bool:
+        return self.session is not None and not self.session.closed
+
+
+class FetchScheduler:
+    """
+    Bounds outbound fetch concurrency and owns a long-lived, tuned aiohttp session.
+
+    Two limits apply to every request: a global in-flight cap and a per-host cap.
+    The session (and its keep-alive connection pool and DNS cache) is created lazily
+    and reused across scrape calls. Sessions and limits are bound to an event loop,
+    so each loop the scheduler is used from keeps its own; switching loops (e.g.
+    run_sync's helper thread, or async code reusing a scraper the sync API used)
+    leaves the other loop's session and in-flight limits intact instead of
+    discarding them.
+    """
+
+    def __init__(self,
+                 max_in_flight: int = 64,
+                 per_host_limit: int = 4,
+                 keepalive_timeout: float = 30.0,
+                 dns_cache_ttl: int = 300,
+                 headers: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            max_in_flight: Maximum number of requests in flight across all hosts.
+            per_host_limit: Maximum number of concurrent requests to a single host.
+            keepalive_timeout: Seconds an idle pooled connection is kept open.
+            dns_cache_ttl: Seconds resolved host addresses are cached.
+            headers: Default headers attached to the session.
+        """
+        self.max_in_flight = max_in_flight
+        self.per_host_limit = per_host_limit
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.headers = headers or {}
+
+        self._states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+        self._states_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @staticmethod
+    def host_key(url: str) -> str:
+        """Return the key used for per-host limiting (scheme-less host:port)."""
+        try:
+            return urlsplit(url).netloc.lower()
+        except ValueError:
+            return ''
+
+    def _bind_loop(self) -> _LoopState:
+        """Return the running loop's state, creating it on first use from that loop."""
+        loop = asyncio.get_running_loop()
+        with self._states_lock:
+            self._loop = loop
+            state = self._states.get(loop)
+            if state is None:
+                state = self._states[loop] = _LoopState(self.max_in_flight)
+                for other, stale in list(self._states.items()):
+                    if other.is_closed() and stale.has_open_session:
+                        # Nothing can close it any more; say so rather than leak quietly
+                        logger.warning("HTTP session left open on a closed event loop; call aclose() before the loop ends")
+                        del self._states[other]
+            return state
+
+    @property
+    def _session(self) -> Optional[aiohttp.ClientSession]:
+        """Session of the running loop, or of the last loop used when called from sync code."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = self._loop
+        state = self._states.get(loop) if loop is not None else None
+        return state.session if state is not None else None
+
+    def _create_connector(self) -> aiohttp.TCPConnector:
+        """Build a connector sized to the scheduler limits."""
+        return aiohttp.TCPConnector(
+            limit=self.max_in_flight,
+            limit_per_host=self.per_host_limit,
+            ttl_dns_cache=self.dns_cache_ttl,
+            use_dns_cache=True,
+            keepalive_timeout=self.keepalive_timeout,
+            enable_cleanup_closed=True,
+        )
+
+    @property
+    def has_open_session(self) -> bool:
+        """True while a shared session is open on any loop."""
+        with self._states_lock:
+            return any(state.has_open_session for state in self._states.values())
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use in this loop."""
+        state = self._bind_loop()
+        if not state.has_open_session:
+            state.session = aiohttp.ClientSession(
+                connector=self._create_connector(),
+                headers=self.headers,
+            )
+            # run_sync helper loops close when their call returns; release the session first
+            on_helper_loop_exit(self._close_loop_session)
+        return state.session
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """
+        Hold a global and a per-host slot for the duration of one request.
+
+        A host's semaphore exists only while requests to it are in flight or
+        queued, so crawling many distinct hosts does not accumulate them.
+
+        Args:
+            url: The URL about to be fetched.
+        """
+        state = self._bind_loop()
+        host = self.host_key(url)
+        host_slots = state.host_slots.get(host)
+        if host_slots is None:
+            host_slots = asyncio.Semaphore(self.per_host_limit)
+            state.host_slots[host] = host_slots
+        state.host_users[host] = state.host_users.get(host, 0) + 1
+
+        try:
+            # Take the host slot first so a busy host never holds global capacity while queued.
+            async with host_slots:
+                async with state.global_slots:
+                    yield
+        finally:
+            state.host_users[host] -= 1
+            if not state.host_users[host]:
+                del state.host_users[host]
+                del state.host_slots[host]
+
+    async def _close_loop_session(self):
+        """Close the running loop's session."""
+        state = self._states.get(asyncio.get_running_loop())
+        if state is not None and state.session is not None:
+            session, state.session = state.session, None
+            if not session.closed:
+                await session.close()
+
+    async def close(self):
+        """
+        Close the shared sessions and release pooled connections.
+
+        The running loop's session is closed here; sessions bound to other loops
+        are closed on their own loop, without waiting, since that loop may be
+        blocked on this one.
+        """
+        current = asyncio.get_running_loop()
+        with self._states_lock:
+            states = list(self._states.items())
+        for loop, state in states:
+            if loop is current:
+                await self._close_loop_session()
+            elif state.has_open_session:
+                session, state.session = state.session, None
+                if loop.is_running():
+                    asyncio.run_coroutine_threadsafe(session.close(), loop)
+                else:
+                    logger.warning("HTTP session's event loop is not running; it cannot be closed cleanly")
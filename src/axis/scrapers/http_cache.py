@@ -0,0 +1,278 @@
+import logging
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class HTTPCache:
+    """
+    Persistent on-disk cache of fetched pages and their HTTP validators.
+
+    Each entry stores the decoded body together with the ETag / Last-Modified
+    values it was served with, so a later fetch of the same URL can be made
+    conditional and answered from disk on 304 Not Modified.
+
+    Entries not stored or revalidated (304) within max_age are treated as
+    misses and deleted, and once the directory grows past max_bytes the least
+    recently validated entries are pruned, so repeat crawls of a large corpus
+    don't grow the cache without limit. An entry's file mtime records when it
+    was last stored or revalidated.
+    """
+
+    DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+    DEFAULT_MAX_AGE = 30 * 24 * 3600
+
+    def __init__(self, cache_dir: str = os.path.join(".cache", "http"),
+                 max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+                 max_age: Optional[float] = DEFAULT_MAX_AGE):
+        """
+        Args:
+            cache_dir: Directory the cache entries are written to.
+            max_bytes: Total size the entries may reach before the oldest are pruned (None = unbounded).
+            max_age: Seconds an entry is kept (None = forever).
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.pruned = 0
+        self._lock = threading.Lock()
+        self._prune_lock = threading.Lock()
+        # Bytes on disk, measured by the first prune and tracked incrementally after
+        self._size: Optional[int] = None
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> Optional["HTTPCache"]:
+        """
+        Build a cache from HTTP_CACHE_DIR, or return None if it is set to 'off'.
+
+        HTTP_CACHE_MAX_BYTES and HTTP_CACHE_MAX_AGE override the size and age
+        limits; 0 disables the respective limit.
+
+        Returns:
+            Optional[HTTPCache]: The configured cache, or None when disabled.
+        """
+        cache_dir = os.getenv("HTTP_CACHE_DIR", os.path.join(".cache", "http"))
+        if not cache_dir or cache_dir.lower() == "off":
+            return None
+        max_bytes = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(cls.DEFAULT_MAX_BYTES)))
+        max_age = float(os.getenv("HTTP_CACHE_MAX_AGE", str(cls.DEFAULT_MAX_AGE)))
+        try:
+            return cls(cache_dir, max_bytes=max_bytes or None, max_age=max_age or None)
+        except OSError as e:
+            logger.warning(f"HTTP cache disabled, cannot use {cache_dir}: {e}")
+            return None
+
+    def _path(self, url: str) -> str:
+        """Return the entry path for a URL (sharded by digest prefix)."""
+        digest = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.json")
+
+    def load(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Load the cached entry for a URL.
+
+        Args:
+            url: The page URL.
+
+        Returns:
+            Optional[Dict[str, Any]]: Entry with 'html', 'etag', 'last_modified', or None.
+        """
+        path = self._path(url)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+                validated_at = os.fstat(f.fileno()).st_mtime
+            if entry.get('url') != url:
+                return None
+            if self._expired(validated_at):
+                self._remove(path)
+                return None
+            return entry
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable cache entry for {url}: {e}")
+            return None
+
+    def store(self, url: str, html: str, etag: Optional[str], last_modified: Optional[str]) -> bool:
+        """
+        Store a page body with its validators. Pages without validators are skipped.
+
+        Args:
+            url: The page URL.
+            html: Decoded page body.
+            etag: ETag response header, if any.
+            last_modified: Last-Modified response header, if any.
+
+        Returns:
+            bool: True if the entry was written.
+        """
+        if not etag and not last_modified:
+            return False
+
+        path = self._path(url)
+        entry = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': time.time(),
+            'html': html,
+        }
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            written = os.path.getsize(tmp_path)
+            try:
+                replaced = os.path.getsize(path)
+            except OSError:
+                replaced = 0
+            # Atomic replace so concurrent readers never see a partial entry
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write HTTP cache entry for {url}: {e}")
+            return False
+
+        with self._lock:
+            if self._size is not None:
+                self._size += written - replaced
+            over_limit = self.max_bytes is not None and (self._size is None or self._size > self.max_bytes)
+        if over_limit:
+            self.prune()
+        return True
+
+    def touch(self, url: str) -> bool:
+        """
+        Mark a URL's entry as just revalidated, restarting its max_age.
+
+        Args:
+            url: The page URL.
+
+        Returns:
+            bool: True if the entry exists and was updated.
+        """
+        try:
+            os.utime(self._path(url))
+            return True
+        except OSError:
+            return False
+
+    def _expired(self, stored_at: float, now: Optional[float] = None) -> bool:
+        return self.max_age is not None and (now or time.time()) - stored_at > self.max_age
+
+    def _remove(self, path: str) -> int:
+        """Delete an entry file; return the bytes freed."""
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return 0
+        with self._lock:
+            if self._size is not None:
+                self._size -= size
+            self.pruned += 1
+        return size
+
+    def _scan(self) -> List[Tuple[float, int, str]]:
+        """Return (mtime, size, path) for every entry file."""
+        entries = []
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for item in os.scandir(shard.path):
+                if item.name.endswith(".json"):
+                    try:
+                        stat = item.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, item.path))
+        return entries
+
+    def prune(self) -> int:
+        """
+        Delete expired entries, then the oldest ones until the cache is under max_bytes.
+
+        Size-based pruning goes down to 90% of max_bytes so it doesn't run on
+        every store once the cache is full.
+
+        Returns:
+            int: Number of entries deleted.
+        """
+        if not self._prune_lock.acquire(blocking=False):
+            return 0  # Another thread is already pruning
+        try:
+            try:
+                entries = sorted(self._scan())
+            except OSError as e:
+                logger.warning(f"Failed to scan HTTP cache {self.cache_dir}: {e}")
+                return 0
+            now = time.time()
+            total = sum(size for _, size, _ in entries)
+            with self._lock:
+                self._size = total
+            target = int(self.max_bytes * 0.9) if self.max_bytes is not None else None
+
+            removed = 0
+            for mtime, size, path in entries:
+                if not self._expired(mtime, now) and (target is None or total <= target):
+                    break
+                if self._remove(path):
+                    total -= size
+                    removed += 1
+            if removed:
+                logger.info(f"Pruned {removed} HTTP cache entries ({total} bytes kept)")
+            return removed
+        finally:
+            self._prune_lock.release()
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """
+        Build If-None-Match / If-Modified-Since headers from a cached entry.
+
+        Args:
+            entry: A cached entry, or None.
+
+        Returns:
+            Dict[str, str]: Headers to add to the request.
+        """
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def record_hit(self):
+        """Count a response served from the cache (304 Not Modified)."""
+        with self._lock:
+            self.hits += 1
+
+    def record_miss(self):
+        """Count a response that had to be downloaded in full."""
+        with self._lock:
+            self.misses += 1
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of successful fetches answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return cache hit/miss counters.
+
+        Returns:
+            Dict[str, Any]: hits, misses, hit_ratio and entries pruned.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'hit_ratio': self.hit_ratio, 'pruned': self.pruned}
@@ -3,17 +3,26 @@ import asyncio
 import aiohttp
 import ssl
 import certifi
-from typing import List, Dict, Any
+import codecs
+import re
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
+from src.axis.scrapers.fetch_scheduler import FetchScheduler
+from src.axis.scrapers.http_cache import HTTPCache
+from src.axis.scrapers.resilience import RetryPolicy, CircuitBreaker
+from src.utils.async_utils import run_sync
 
 logger = logging.getLogger(__name__)
 
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([A-Za-z0-9_.:-]+)', re.I)
+
 class Scraper:
     """
     Scraper for OSINT sources using AsyncIO + AioHTTP.
     Designed for massive parallelism to overcome I/O latency bottlenecks.
     """
     
-    def __init__(self):
+    def __init__(self, max_in_flight: int = 64, per_host_limit: int = 4, max_body_bytes: int = 2 * 1024 * 1024,
+                 http_cache: Optional[HTTPCache] = None):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
@@ -26,73 +35,294 @@ class Scraper:
             'Sec-Fetch-Site': 'none',
         }
         self.timeout = 15
+        # Per-URL memory is bounded: bodies are read in chunks and cut off at max_body_bytes
+        self.max_body_bytes = max_body_bytes
+        self.chunk_size = 64 * 1024
+        self.allowed_content_types = {'text/html', 'application/xhtml+xml', 'text/plain'}
         # No Scrapy fallback needed as we are using pure asyncio now
+        # Shared session + global/per-host limits so large batches don't open a socket per URL
+        self.scheduler = FetchScheduler(max_in_flight=max_in_flight, per_host_limit=per_host_limit)
+        # Conditional-request cache: repeat crawls send validators and reuse bodies on 304
+        self.http_cache = http_cache if http_cache is not None else HTTPCache.from_env()
+        # Transient failures are retried; hosts that keep failing are short-circuited
+        self.retry_policy = RetryPolicy()
+        self.circuit_breaker = CircuitBreaker()
     
     async def _fetch_url(self, session: aiohttp.ClientSession, url: str) -> Dict[str, Any]:
-        """Fetch a single URL asynchronously."""
-        try:
-            async with session.get(url, headers=self.headers, timeout=self.timeout, ssl=False) as response:
-                status = response.status
-                html = await response.text()
-                
-                if status == 200:
-                    return {
-                        'url': url,
-                        'html': html,
-                        'status_code': 200,
-                        'error': None
-                    }
-                else:
-                    return {
-                        'url': url,
-                        'html': '',
-                        'status_code': status,
-                        'error': f"HTTP {status}"
-                    }
-        except Exception as e:
+        """
+        Fetch a single URL asynchronously, retrying transient failures.
+
+        Hosts whose circuit is open fail immediately. Backoff sleeps happen outside
+        the scheduler's slots, so a flapping host never holds fetch capacity.
+        """
+        host = FetchScheduler.host_key(url)
+        cached = None
+        if self.http_cache:
+            try:
+                cached = await asyncio.to_thread(self.http_cache.load, url)
+            except Exception as e:
+                logger.debug(f"HTTP cache lookup failed for {url}: {e}")
+        
+        for attempt in range(self.retry_policy.max_attempts):
+            if not self.circuit_breaker.allow(host):
+                return {
+                    'url': url,
+                    'html': '',
+                    'status_code': 0,
+                    'error': f"Circuit open for {host}",
+                    'attempts': attempt
+                }
+            
+            try:
+                result = await self._fetch_once(session, url, cached)
+            except Exception as e:
+                if self.retry_policy.is_host_failure(e):
+                    self.circuit_breaker.record_failure(host)
+                if self.retry_policy.should_retry_exception(e, attempt):
+                    delay = self.retry_policy.backoff(attempt)
+                    logger.debug(f"Retrying {url} in {delay:.2f}s after error: {e}")
+                    await asyncio.sleep(delay)
+                    continue
+                return {
+                    'url': url,
+                    'html': '',
+                    'status_code': 0,
+                    'error': str(e) or type(e).__name__,
+                    'attempts': attempt + 1
+                }
+            
+            retry_after = result.pop('retry_after', None)
+            status = result['status_code']
+            if status in self.retry_policy.retry_statuses or status >= 500:
+                # A 429 means the host is up but throttling us: back off without tripping the breaker
+                if status != 429:
+                    self.circuit_breaker.record_failure(host)
+                if self.retry_policy.should_retry_status(status, attempt, retry_after):
+                    delay = self.retry_policy.backoff(attempt, retry_after)
+                    logger.debug(f"Retrying {url} in {delay:.2f}s after HTTP {status}")
+                    await asyncio.sleep(delay)
+                    continue
+            else:
+                self.circuit_breaker.record_success(host)
+            
+            result['attempts'] = attempt + 1
+            return result
+
+    async def _fetch_once(self, session: aiohttp.ClientSession, url: str,
+                          cached: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Make one request for a URL while holding the scheduler's slots.
+
+        Transport errors propagate to the caller so it can decide whether to retry.
+
+        Args:
+            session: The shared client session
+            url: URL to fetch
+            cached: HTTP cache entry used to make the request conditional
+
+        Returns:
+            Scraped data dictionary
+        """
+        headers = self.headers
+        if cached:
+            headers = {**self.headers, **HTTPCache.conditional_headers(cached)}
+        
+        async with self.scheduler.slot(url), \
+                session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=self.timeout), ssl=False) as response:
+            status = response.status
+            
+            if status == 304 and cached:
+                self.http_cache.record_hit()
+                # The server confirmed the copy is current; restart its max_age
+                await asyncio.to_thread(self.http_cache.touch, url)
+                return {
+                    'url': url,
+                    'html': cached['html'],
+                    'status_code': 200,
+                    'error': None,
+                    'truncated': False,
+                    'from_cache': True
+                }
+            
+            if status != 200:
+                # Error pages are never parsed, so don't spend bandwidth reading them
+                return {
+                    'url': url,
+                    'html': '',
+                    'status_code': status,
+                    'error': f"HTTP {status}",
+                    'retry_after': RetryPolicy.parse_retry_after(response.headers.get('Retry-After'))
+                }
+            
+            content_type = response.content_type
+            if response.headers.get('Content-Type') and content_type not in self.allowed_content_types:
+                return {
+                    'url': url,
+                    'html': '',
+                    'status_code': status,
+                    'error': f"Skipped content type: {content_type}"
+                }
+            
+            body, truncated = await self._read_capped(response)
+            if truncated:
+                logger.debug(f"Truncated {url} at {self.max_body_bytes} bytes")
+            html = self._decode_body(body, response.charset)
+            
+            if self.http_cache:
+                self.http_cache.record_miss()
+                if not truncated:
+                    await asyncio.to_thread(
+                        self.http_cache.store, url, html,
+                        response.headers.get('ETag'), response.headers.get('Last-Modified')
+                    )
+            
             return {
                 'url': url,
-                'html': '',
-                'status_code': 0,
-                'error': str(e)
+                'html': html,
+                'status_code': 200,
+                'error': None,
+                'truncated': truncated,
+                'from_cache': False
             }
 
+    async def _read_capped(self, response: aiohttp.ClientResponse) -> Tuple[bytes, bool]:
+        """
+        Read a response body in chunks, stopping at max_body_bytes.
+
+        Args:
+            response: An open aiohttp response
+
+        Returns:
+            Tuple of (body bytes, whether the body was cut off at the cap)
+        """
+        buffer = bytearray()
+        async for chunk in response.content.iter_chunked(self.chunk_size):
+            remaining = self.max_body_bytes - len(buffer)
+            if len(chunk) >= remaining:
+                buffer.extend(chunk[:remaining])
+                # Stop reading; the rest of the body is discarded with the connection
+                return bytes(buffer), not response.content.at_eof() or len(chunk) > remaining
+            buffer.extend(chunk)
+        return bytes(buffer), False
+
+    @staticmethod
+    def _decode_body(body: bytes, header_charset: Optional[str]) -> str:
+        """
+        Decode an HTML body without statistical charset detection.
+
+        Uses the Content-Type charset, then a <meta charset> declaration in the
+        first few KB, then UTF-8. Undecodable bytes are replaced rather than raising.
+
+        Args:
+            body: Raw body bytes
+            header_charset: Charset from the Content-Type header, if any
+
+        Returns:
+            Decoded text
+        """
+        encoding = header_charset
+        if not encoding:
+            match = _META_CHARSET_RE.search(body[:4096])
+            if match:
+                encoding = match.group(1).decode('ascii', errors='ignore')
+        try:
+            codecs.lookup(encoding or 'utf-8')
+        except LookupError:
+            encoding = None
+        return body.decode(encoding or 'utf-8', errors='replace')
+
     async def _scrape_async(self, urls: List[str]) -> List[Dict[str, Any]]:
-        """Run fetching tasks concurrently."""
-        async with aiohttp.ClientSession() as session:
-            tasks = [self._fetch_url(session, url) for url in urls]
-            return await asyncio.gather(*tasks)
+        """Run fetching tasks concurrently over the shared session."""
+        session = await self.scheduler.get_session()
+        tasks = [self._fetch_url(session, url) for url in urls]
+        return await asyncio.gather(*tasks)
 
-    def scrape_osint_sources(self, sources: List[str]) -> List[Dict[str, Any]]:
+    async def fetch(self, url: str) -> Dict[str, Any]:
         """
-        Synchronous wrapper for the async scraping engine.
-        
+        Fetch one URL over the shared session, within the per-host limits.
+
+        Args:
+            url: The URL to fetch
+
+        Returns:
+            Scraped data dictionary
+        """
+        session = await self.scheduler.get_session()
+        return await self._fetch_url(session, url)
+
+    async def iter_fetch(self, urls: List[str]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Fetch URLs concurrently and yield each result as soon as it completes.
+
+        Results arrive in completion order; each carries an 'index' field with the
+        URL's position in the input list. Closing the generator early cancels any
+        fetches still outstanding.
+
+        Args:
+            urls: List of URLs to fetch
+
+        Yields:
+            Scraped data dictionaries
+        """
+        if not urls:
+            return
+
+        session = await self.scheduler.get_session()
+
+        async def fetch_indexed(index: int, url: str) -> Dict[str, Any]:
+            result = await self._fetch_url(session, url)
+            result['index'] = index
+            return result
+
+        tasks = [asyncio.ensure_future(fetch_indexed(i, url)) for i, url in enumerate(urls)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def aclose(self):
+        """Close the shared HTTP session."""
+        await self.scheduler.close()
+
+    def close(self):
+        """Close the shared HTTP session from synchronous code."""
+        if self.scheduler.has_open_session:
+            run_sync(self.aclose())
+
+    async def ascrape_osint_sources(self, sources: List[str]) -> List[Dict[str, Any]]:
+        """
+        Scrape sources on the running event loop.
+
+        The shared session stays open for later calls on the same loop; call
+        aclose() when done with the scraper.
+
         Args:
             sources: List of source URLs
-            
+
         Returns:
             List of scraped data dictionaries
         """
         logger.info(f"Scraping {len(sources)} OSINT sources using AsyncIO Parallelism...")
-        
         try:
-            # Check for existing event loop
-            try:
-                loop = asyncio.get_event_loop()
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-            
-            if loop.is_running():
-                # If we are already in an async context (rare for this architecture but possible)
-                # usage of nest_asyncio would be needed, but sticking to simple runner:
-                future = asyncio.run_coroutine_threadsafe(self._scrape_async(sources), loop)
-                results = future.result()
-            else:
-                results = loop.run_until_complete(self._scrape_async(sources))
-                
-            return results
+            return await self._scrape_async(sources)
         except Exception as e:
             logger.error(f"Async Fetch Failed: {e}")
             return []
 
+    def scrape_osint_sources(self, sources: List[str]) -> List[Dict[str, Any]]:
+        """
+        Synchronous wrapper for ascrape_osint_sources.
+
+        Runs on the shared background loop, so the session and its pooled
+        connections stay open for the next call; call close() when done.
+        
+        Args:
+            sources: List of source URLs
+            
+        Returns:
+            List of scraped data dictionaries
+        """
+        return run_sync(self.ascrape_osint_sources(sources))
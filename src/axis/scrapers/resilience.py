@@ -0,0 +1,198 @@
+import logging
+import asyncio
+import random
+import time
+import aiohttp
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class RetryPolicy:
+    """
+    Decides which fetch failures are retried and how long to wait in between.
+
+    Retries use exponential backoff with full jitter. A server-supplied
+    Retry-After takes precedence, but only up to max_retry_after; longer
+    requested waits are treated as a final failure rather than stalling the batch.
+    """
+
+    def __init__(self,
+                 max_attempts: int = 3,
+                 base_delay: float = 0.5,
+                 max_delay: float = 8.0,
+                 max_retry_after: float = 30.0,
+                 retry_statuses: Tuple[int, ...] = (429, 502, 503, 504)):
+        """
+        Args:
+            max_attempts: Total attempts per URL, including the first.
+            base_delay: Backoff base in seconds.
+            max_delay: Upper bound on a computed backoff delay.
+            max_retry_after: Longest Retry-After the scraper is willing to honour.
+            retry_statuses: HTTP statuses that are retried.
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.retry_statuses = set(retry_statuses)
+        # Timeouts are deliberately absent: each already cost the full request timeout
+        self.retry_exceptions = (
+            aiohttp.ClientConnectionError,
+            aiohttp.ClientPayloadError,
+            ConnectionResetError,
+        )
+
+    def should_retry_status(self, status: int, attempt: int, retry_after: Optional[float] = None) -> bool:
+        """
+        Check whether an HTTP status should be retried.
+
+        Args:
+            status: HTTP status code.
+            attempt: Zero-based index of the attempt that just finished.
+            retry_after: Parsed Retry-After delay in seconds, if the server sent one.
+
+        Returns:
+            bool: True if another attempt should be made.
+        """
+        if status not in self.retry_statuses or attempt + 1 >= self.max_attempts:
+            return False
+        return retry_after is None or retry_after <= self.max_retry_after
+
+    def should_retry_exception(self, error: BaseException, attempt: int) -> bool:
+        """
+        Check whether a transport error should be retried.
+
+        Args:
+            error: The exception raised by the attempt.
+            attempt: Zero-based index of the attempt that just finished.
+
+        Returns:
+            bool: True if another attempt should be made.
+        """
+        if isinstance(error, asyncio.TimeoutError):
+            return False
+        return isinstance(error, self.retry_exceptions) and attempt + 1 < self.max_attempts
+
+    def is_host_failure(self, error: BaseException) -> bool:
+        """
+        Check whether an error reflects on the remote host (vs. a bad URL or local bug).
+
+        Args:
+            error: The exception raised by the attempt.
+
+        Returns:
+            bool: True if the error should count towards the host's circuit breaker.
+        """
+        return isinstance(error, self.retry_exceptions + (asyncio.TimeoutError,))
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Compute the delay before the next attempt.
+
+        Args:
+            attempt: Zero-based index of the attempt that just finished.
+            retry_after: Parsed Retry-After delay in seconds, if any.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """
+        Parse a Retry-After header given either as seconds or as an HTTP date.
+
+        Args:
+            value: Raw header value.
+
+        Returns:
+            Optional[float]: Delay in seconds, or None if absent/unparseable.
+        """
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+
+    After failure_threshold consecutive failures a host is 'open' and requests
+    to it fail immediately. Once reset_timeout has passed a single probe request
+    is let through ('half-open'); its outcome closes or re-opens the circuit.
+
+    Only hosts with recent failures are tracked: a success forgets the host, and
+    beyond max_hosts the least recently failing host is dropped (as if closed).
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, max_hosts: int = 10_000):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the circuit.
+            reset_timeout: Seconds to wait before probing an open host again.
+            max_hosts: Most hosts with failures tracked at once.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_hosts = max_hosts
+        self._hosts: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def state(self, host: str) -> str:
+        """Return the circuit state for a host."""
+        state = self._hosts.get(host)
+        return state['state'] if state is not None else self.CLOSED
+
+    def allow(self, host: str) -> bool:
+        """
+        Check whether a request to the host may proceed.
+
+        Args:
+            host: Host key (host:port).
+
+        Returns:
+            bool: False while the circuit is open or a half-open probe is in flight.
+        """
+        state = self._hosts.get(host)
+        if state is None or state['state'] == self.CLOSED:
+            return True
+        # Also re-probe if a previous half-open probe never reported back (e.g. it was cancelled)
+        if time.monotonic() - state['opened_at'] >= self.reset_timeout:
+            state['state'] = self.HALF_OPEN
+            state['opened_at'] = time.monotonic()
+            return True
+        return False
+
+    def record_success(self, host: str):
+        """Close the circuit for a host after a successful response."""
+        self._hosts.pop(host, None)
+
+    def record_failure(self, host: str):
+        """Count a failure, opening the circuit once the threshold is reached."""
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = {'state': self.CLOSED, 'failures': 0, 'opened_at': 0.0}
+            if len(self._hosts) > self.max_hosts:
+                self._hosts.popitem(last=False)
+        else:
+            self._hosts.move_to_end(host)
+        state['failures'] += 1
+        if state['state'] == self.HALF_OPEN or state['failures'] >= self.failure_threshold:
+            if state['state'] != self.OPEN:
+                logger.warning(f"Circuit opened for {host} after {state['failures']} failures")
+            state['state'] = self.OPEN
+            state['opened_at'] = time.monotonic()
@@ -1,13 +1,24 @@
 import logging
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import json
 from datetime import datetime
 from src.utils.performance_monitor import monitor_performance
 from src.core.analysis.entity_extractor import EntityExtractor
 import requests
 import re
-import time
+import hashlib
+from dataclasses import replace
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from src.storage.persistent_cache import PersistentCache
+from src.core.analysis.rate_limiter import RateLimiter, get_shared_limiter, estimate_tokens, parse_retry_delay
+from src.core.analysis.llm_executor import LLMExecutor, get_shared_executor
+from src.core.analysis.url_validator import URLValidator
+from src.core.analysis.browser_pool import get_browser_pool
+from src.core.analysis.summarization import MapReduceSummarizer
+from src.core.analysis.structured_output import extract_json
+from src.axis.filters.relevance import RelevanceEngine
+from src.core.analysis.patterns import Pattern, PatternValidationError, parse_patterns
 
 try:
     from google import genai
@@ -16,16 +27,122 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Prompt templates. Their text is part of the response-cache key, so editing a
+# template invalidates the responses cached for it.
+PATTERN_PROMPT = (
+    "Analyze the following data and detect key patterns, anomalies, or trends. "
+    "Focus on:\n"
+    "1. Temporal patterns (timing, frequency)\n"
+    "2. Behavioral patterns (actions, sentiment)\n"
+    "3. Structural patterns (relationships, clusters)\n"
+    "Return the result as a JSON list of objects, where each object has 'pattern' (description), "
+    "'confidence' (0.0-1.0) and 'category' (temporal, behavioral, structural or other). "
+    "Return only the JSON. "
+    "Data: {data}"
+)
+
+PATTERN_REPAIR_PROMPT = (
+    "The following response was supposed to be a JSON list of objects with keys 'pattern' (string), "
+    "'confidence' (number 0.0-1.0) and 'category' (temporal, behavioral, structural or other), "
+    "but it failed validation: {error}\n"
+    "Rewrite it as valid JSON matching that schema, keeping its content. Return only the JSON.\n\n"
+    "Response:\n{response}"
+)
+
+SUMMARY_PROMPT = (
+    "You are an elite intelligence analyst. Analyze the following text and provide a comprehensive report.\n"
+    "Structure your response exactly as follows:\n\n"
+    "### 1. Intelligence Extraction\n"
+    "A comprehensive narrative paragraph that synthesizes the key findings, context, and nuances of the information. "
+    "Do not use bullet points here. Tell the story of the data.\n\n"
+    "### 2. Strategic Implications\n"
+    "Analyze what this information means for the broader context (e.g., industry trends, future risks, opportunities).\n\n"
+    "### 3. Key Entities\n"
+    "List important people, organizations, and locations mentioned.\n\n"
+    "Data to Analyze:\n{data}"
+)
+
+EXECUTIVE_PROMPT = (
+    "You are a Chief Intelligence Officer. Synthesize the following {count} intelligence reports "
+    "regarding '{prompt}' into a single, high-level Executive Briefing.\n\n"
+    "Your response MUST be a single, cohesive narrative paragraph (200-400 words) that:\n"
+    "1. Synthesizes the most important findings from all sources.\n"
+    "2. Identifies the overarching narrative or trend.\n"
+    "3. Highlights the critical strategic implication.\n"
+    "4. Does NOT use bullet points.\n"
+    "5. Starts directly with the narrative (no 'Here is the report' preamble).\n\n"
+    "Source Reports:\n{reports}"
+)
+
+BATCH_SUMMARY_PROMPT = (
+    "You are an elite intelligence analyst. Below are {count} independent source documents, each wrapped in "
+    "<document id=\"...\"> tags. Write a separate report for EACH document using only that document's content.\n"
+    "Each report must be structured exactly as follows:\n\n"
+    "### 1. Intelligence Extraction\n"
+    "A narrative paragraph synthesizing the key findings, context, and nuances. No bullet points.\n\n"
+    "### 2. Strategic Implications\n"
+    "What this information means for the broader context.\n\n"
+    "### 3. Key Entities\n"
+    "Important people, organizations, and locations mentioned.\n\n"
+    "Return ONLY a JSON array with exactly one object per document, in the form "
+    "[{{\"id\": \"<document id>\", \"summary\": \"<markdown report>\"}}].\n\n"
+    "Documents:\n{documents}"
+)
+
+# How long cached search results stay fresh, by DuckDuckGo time filter
+SEARCH_CACHE_TTLS = {
+    'd': 3600,
+    'w': 6 * 3600,
+    'm': 24 * 3600,
+    'y': 3 * 24 * 3600,
+    None: 7 * 24 * 3600,
+}
+
 class Analyzer:
     """
     Analytical module for pattern recognition, anomaly detection, and summarization.
     """
 
-    def __init__(self):
+    def __init__(self,
+                 client: Any = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 llm_executor: Optional[LLMExecutor] = None,
+                 response_cache: Optional[PersistentCache] = None,
+                 search_cache: Optional[PersistentCache] = None,
+                 url_validator: Optional[URLValidator] = None):
+        """
+        Args:
+            client: Model client exposing models.generate_content. Defaults to the
+                backend selected by LLM_BACKEND / GEMINI_* environment variables.
+            rate_limiter: Quota for model calls. Defaults to the shared limiter.
+            llm_executor: Pool model calls run on. Defaults to the shared executor.
+            response_cache: LLM response cache. Defaults to the on-disk cache
+                unless LLM_CACHE is 'off'.
+            search_cache: Search result cache. Defaults to the on-disk cache
+                unless SEARCH_CACHE is 'off'.
+            url_validator: Validator for plan URLs. Defaults to one with the
+                on-disk validation cache.
+        """
         self.api_key = os.getenv("GEMINI_API_KEY")
         self.model_name = os.getenv("MODEL", "gemini-2.0-flash").lower()
-        self.client = None
-        if self.api_key and genai:
+        self.client = client
+        # LLM_BACKEND=stub swaps in the offline stand-in (for benchmarks and load tests);
+        # GEMINI_BASE_URL points the real SDK at another endpoint, e.g. the stub's HTTP server
+        self.base_url = os.getenv("GEMINI_BASE_URL")
+        if self.client is not None:
+            logger.info(f"Using injected LLM client with model: {self.model_name}")
+        elif os.getenv("LLM_BACKEND", "gemini").lower() == "stub":
+            # Imported here so production imports don't pull in the benchmark server
+            from src.core.analysis.llm_stub import StubLLMClient
+            self.client = StubLLMClient.from_env()
+            logger.info(f"Stub LLM backend initialized with model: {self.model_name}")
+        elif self.base_url and genai:
+            try:
+                self.client = genai.Client(api_key=self.api_key or "stub", http_options={'base_url': self.base_url})
+                logger.info(f"Gemini client initialized against {self.base_url} with model: {self.model_name}")
+            except Exception as e:
+                logger.error(f"Failed to initialize Gemini client: {e}")
+        elif self.api_key and genai:
             try:
                 self.client = genai.Client(api_key=self.api_key)
                 logger.info(f"Gemini client initialized with model: {self.model_name}")
@@ -35,6 +152,80 @@ class Analyzer:
             logger.warning("google-genai library not installed.")
         else:
             logger.warning("GEMINI_API_KEY not found.")
+        
+        # One quota shared by every caller (and every Analyzer) instead of fixed sleeps
+        self.rate_limiter = rate_limiter or get_shared_limiter()
+        # Model calls run on their own pool, capped separately from CPU work (LLM_MAX_IN_FLIGHT)
+        self.llm_executor = llm_executor or get_shared_executor()
+        
+        # Responses keyed on (model, template, normalized input); hits skip the API and its throttle
+        self.response_cache = response_cache
+        if self.response_cache is None and os.getenv("LLM_CACHE", "on").lower() != "off":
+            try:
+                self.response_cache = PersistentCache(
+                    namespace="llm_responses",
+                    default_ttl=float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600))),
+                    max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000")),
+                )
+            except Exception as e:
+                logger.warning(f"LLM response cache disabled: {e}")
+
+        # Query -> result URLs, so repeated planning skips the browser and search throttling
+        self.search_cache = search_cache
+        if self.search_cache is None and os.getenv("SEARCH_CACHE", "on").lower() != "off":
+            try:
+                self.search_cache = PersistentCache(namespace="search_results", max_entries=2000)
+            except Exception as e:
+                logger.warning(f"Search cache disabled: {e}")
+
+        # "map_reduce" summarizes long inputs chunk by chunk; "truncate" keeps the old hard cut-offs
+        self.summary_mode = os.getenv("SUMMARY_MODE", "map_reduce").lower()
+        self.summarizer = MapReduceSummarizer(
+            self._generate_text,
+            chunk_tokens=int(os.getenv("SUMMARY_CHUNK_TOKENS", "3750")),
+            reduce_tokens=int(os.getenv("SUMMARY_REDUCE_TOKENS", "6250")),
+            executor=self.llm_executor,
+        )
+        # Pack several short documents into one request; long ones are summarized individually
+        self.batch_summaries = os.getenv("SUMMARY_BATCH", "on").lower() != "off"
+        self.batch_max_tokens = int(os.getenv("SUMMARY_BATCH_TOKENS", "6000"))
+        self.batch_max_documents = int(os.getenv("SUMMARY_BATCH_SIZE", "10"))
+        self.pattern_repair_attempts = int(os.getenv("PATTERN_REPAIR_ATTEMPTS", "2"))
+        self.relevance = RelevanceEngine()
+
+        self.url_validator = url_validator or URLValidator(timeout=4.0)
+        # Warm Chrome instances shared by every Analyzer; created on first search
+        self.browser_pool = get_browser_pool()
+
+    @staticmethod
+    def _search_cache_key(query: str, time_filter: str = None) -> str:
+        """Normalize a query (case, punctuation, spacing) into a search cache key."""
+        normalized = ' '.join(re.findall(r'\w+', query.lower()))
+        return f"{time_filter or 'any'}:{normalized}"
+
+    def _search(self, query: str, time_filter: str = None) -> List[str]:
+        """
+        Search with a persistent cache in front of the browser.
+        
+        Args:
+            query: Search query
+            time_filter: 'd' (day), 'w' (week), 'm' (month), 'y' (year)
+            
+        Returns:
+            List of URLs from search results
+        """
+        key = self._search_cache_key(query, time_filter)
+        if self.search_cache is not None:
+            cached = self.search_cache.get(key)
+            if cached:
+                logger.info(f"Search cache hit ({len(cached)} URLs): {query}")
+                return cached
+        
+        urls = self._duckduckgo_search_selenium(query, time_filter=time_filter)
+        # Empty results are usually blocks or timeouts; don't pin them
+        if urls and self.search_cache is not None:
+            self.search_cache.set(key, urls, ttl=SEARCH_CACHE_TTLS.get(time_filter, SEARCH_CACHE_TTLS[None]))
+        return urls
 
     def _duckduckgo_search_selenium(self, query: str, time_filter: str = None) -> List[str]:
         """
@@ -50,89 +241,58 @@ class Analyzer:
         """
         num_results = 15
         try:
-            from selenium import webdriver
             from selenium.webdriver.common.by import By
-            from selenium.webdriver.chrome.service import Service
-            from selenium.webdriver.chrome.options import Options
-            from webdriver_manager.chrome import ChromeDriverManager
             from selenium.webdriver.common.keys import Keys
+            from selenium.webdriver.support.ui import WebDriverWait
+            from selenium.common.exceptions import TimeoutException
         except ImportError as e:
             logger.error(f"Selenium not available: {e}")
             return []
         
-        driver = None
+        result_selector = 'a[data-testid="result-title-a"]'
         try:
-            # Setup Chrome options
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-            chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
-            
-            # Initialize driver
-            logger.info("Initializing Chrome driver...")
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=chrome_options)
-            
             # Construct URL with time filter if specified
             base_url = "https://duckduckgo.com/?q=" + requests.utils.quote(query)
             if time_filter:
                 base_url += f"&df={time_filter}&ia=web"
                 logger.info(f"Applying time filter: {time_filter}")
             
-            logger.info(f"Searching DuckDuckGo: {query}")
-            driver.get(base_url)
-            
-            # Wait for results to load
-            time.sleep(3)
-            
-            # Scroll down to load more results
-            logger.info("Scrolling for more results...")
-            body = driver.find_element(By.TAG_NAME, 'body')
-            for _ in range(3):
-                body.send_keys(Keys.PAGE_DOWN)
-                time.sleep(1)
-            
-            # Extract search result links from DuckDuckGo
-            urls = []
-            
-            # DuckDuckGo uses different selectors
-            search_results = driver.find_elements(By.CSS_SELECTOR, 'a[data-testid="result-title-a"]')
-            
-            for result in search_results:
+            # Warm browser from the shared pool; a failed search discards it
+            with self.browser_pool.driver(timeout=60) as driver:
+                logger.info(f"Searching DuckDuckGo: {query}")
+                driver.get(base_url)
+                
+                # Wait for results to render instead of sleeping a fixed time
                 try:
-                    url = result.get_attribute('href')
-                    if url and url.startswith('http') and 'duckduckgo.com' not in url:
-                        # Clean URL
-                        url = url.split('#')[0]  # Remove anchors
-                        
-                        if url not in urls and len(url) < 200:
-                            urls.append(url)
-                            
-                            if len(urls) >= num_results:
-                                break
-                except Exception as e:
-                    logger.debug(f"Error extracting URL: {e}")
-                    continue
-            
-            # Fallback: try alternative selector
-            if len(urls) < 5:
-                logger.info("Trying alternative DuckDuckGo selector...")
-                links = driver.find_elements(By.CSS_SELECTOR, 'article a[href]')
-                for link in links:
+                    WebDriverWait(driver, 10).until(
+                        lambda d: d.find_elements(By.CSS_SELECTOR, f'{result_selector}, article a[href]')
+                    )
+                except TimeoutException:
+                    logger.warning("DuckDuckGo results did not load in time")
+                
+                # Scroll down to load more results, stopping once no new results appear
+                logger.info("Scrolling for more results...")
+                body = driver.find_element(By.TAG_NAME, 'body')
+                for _ in range(3):
+                    loaded = len(driver.find_elements(By.CSS_SELECTOR, result_selector))
+                    if loaded >= num_results:
+                        break
+                    body.send_keys(Keys.PAGE_DOWN)
                     try:
-                        url = link.get_attribute('href')
-                        if url and url.startswith('http') and 'duckduckgo.com' not in url:
-                            url = url.split('#')[0]
-                            if url not in urls and len(url) < 200:
-                                urls.append(url)
-                                if len(urls) >= num_results:
-                                    break
-                    except:
-                        continue
+                        WebDriverWait(driver, 2, poll_frequency=0.2).until(
+                            lambda d: len(d.find_elements(By.CSS_SELECTOR, result_selector)) > loaded
+                        )
+                    except TimeoutException:
+                        break
+                
+                # Extract search result links from DuckDuckGo
+                urls = self._collect_result_urls(driver.find_elements(By.CSS_SELECTOR, result_selector), [], num_results)
+                
+                # Fallback: try alternative selector
+                if len(urls) < 5:
+                    logger.info("Trying alternative DuckDuckGo selector...")
+                    links = driver.find_elements(By.CSS_SELECTOR, 'article a[href]')
+                    urls = self._collect_result_urls(links, urls, num_results)
             
             logger.info(f"Extracted {len(urls)} URLs from DuckDuckGo")
             return urls
@@ -140,12 +300,34 @@ class Analyzer:
         except Exception as e:
             logger.error(f"Selenium search failed: {e}", exc_info=True)
             return []
-        finally:
-            if driver:
-                try:
-                    driver.quit()
-                except:
-                    pass
+
+    @staticmethod
+    def _collect_result_urls(elements: List[Any], urls: List[str], num_results: int) -> List[str]:
+        """
+        Append clean, external result links to urls.
+        
+        Args:
+            elements: Anchor elements from the results page
+            urls: URLs collected so far
+            num_results: Maximum number of URLs to collect
+            
+        Returns:
+            The extended URL list
+        """
+        for element in elements:
+            if len(urls) >= num_results:
+                break
+            try:
+                url = element.get_attribute('href')
+                if url and url.startswith('http') and 'duckduckgo.com' not in url:
+                    # Clean URL
+                    url = url.split('#')[0]  # Remove anchors
+                    if url not in urls and len(url) < 200:
+                        urls.append(url)
+            except Exception as e:
+                logger.debug(f"Error extracting URL: {e}")
+                continue
+        return urls
 
     def _validate_url(self, url: str, timeout: int = 5) -> bool:
         """
@@ -158,29 +340,7 @@ class Analyzer:
         Returns:
             True if URL returns 200, False otherwise
         """
-        try:
-            response = requests.head(
-                url,
-                timeout=timeout,
-                allow_redirects=True,
-                headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
-            )
-            if response.status_code == 200:
-                return True
-            # Try GET if HEAD fails
-            response = requests.get(
-                url,
-                timeout=timeout,
-                allow_redirects=True,
-                headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
-            )
-            return response.status_code == 200
-        except:
-            return False
+        return bool(self.url_validator.validate([url], timeout=timeout))
 
     def generate_plan(self, prompt: str) -> List[str]:
         """
@@ -219,7 +379,7 @@ class Analyzer:
         try:
             logger.info(f"Performing DuckDuckGo search with Selenium (Filter: {time_filter})...")
             # Request more results initially to account for validation failures
-            search_results = self._duckduckgo_search_selenium(prompt, time_filter=time_filter)
+            search_results = self._search(prompt, time_filter=time_filter)
             
             if not search_results:
                 logger.warning("DuckDuckGo search returned no results, using fallback")
@@ -227,21 +387,9 @@ class Analyzer:
             
             logger.info(f"Found {len(search_results)} URLs from DuckDuckGo")
             
-            # Validate URLs
-            validated_urls = []
+            # Validate URLs concurrently; stops early once enough are confirmed
             target_count = 20  # Aim for up to 20 URLs
-            
-            for url in search_results:
-                logger.info(f"Validating: {url}")
-                if self._validate_url(url, timeout=4):
-                    validated_urls.append(url)
-                    logger.info(f"✓ Valid: {url}")
-                    if len(validated_urls) >= target_count:
-                        break
-                else:
-                    logger.warning(f"✗ Invalid/Blocked: {url}")
-                
-                time.sleep(0.2)
+            validated_urls = self.url_validator.validate(search_results, target_count=target_count)
             
             # Ensure we have at least a decent number, but return whatever we found if > 0
             if len(validated_urls) >= 3:
@@ -255,6 +403,24 @@ class Analyzer:
             logger.error(f"URL generation failed: {e}", exc_info=True)
             return self._get_fallback_urls()
     
+    def generate_plans(self, prompts: List[str]) -> Dict[str, List[str]]:
+        """
+        Plan several prompts concurrently, one search per pooled browser.
+
+        Args:
+            prompts: Research prompts
+
+        Returns:
+            Mapping of prompt to its URL list
+        """
+        unique_prompts = list(dict.fromkeys(prompts))
+        if not unique_prompts:
+            return {}
+        workers = min(len(unique_prompts), self.browser_pool.size)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="plan") as pool:
+            plans = list(pool.map(self.generate_plan, unique_prompts))
+        return dict(zip(unique_prompts, plans))
+    
     def _get_fallback_urls(self) -> List[str]:
         """Fallback URLs if search fails."""
         logger.warning("Using fallback URLs")
@@ -265,27 +431,112 @@ class Analyzer:
         ]
 
     def _generate_with_retry(self, prompt: str, max_retries: int = 3) -> Any:
-        """Helper to generate content with retry logic for 429/503 errors."""
+        """Helper to generate content on the LLM executor under the shared rate limiter, retrying 429/503 errors."""
+        return self.llm_executor.run(self._request_with_retry, prompt, max_retries)
+
+    def _request_with_retry(self, prompt: str, max_retries: int) -> Any:
+        tokens = estimate_tokens(prompt)
         for attempt in range(max_retries):
+            if self.llm_executor.should_stop():
+                raise CancelledError("LLM request cancelled")
+            # Wait for quota rather than sleeping blindly before every request
+            self.rate_limiter.acquire(tokens)
             try:
-                # Add a small delay/throttle before every request to avoid hitting limits immediately
-                time.sleep(2) 
                 response = self.client.models.generate_content(
                     model=self.model_name,
                     contents=prompt
                 )
+                self.rate_limiter.report_success()
                 return response
             except Exception as e:
                 err_str = str(e)
                 # Check for rate limit (429) or overloading (503)
                 if ("429" in err_str or "503" in err_str) and attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 5  # 5s, 10s, 15s
-                    logger.warning(f"GenAI Error ({err_str[:50]}...). Retrying in {wait_time}s...")
-                    time.sleep(wait_time)
+                    # The pause applies to every caller sharing the limiter, not just this one
+                    wait_time = self.rate_limiter.report_throttled(parse_retry_delay(err_str))
+                    logger.warning(f"GenAI Error ({err_str[:50]}...). Retrying in {wait_time:.1f}s...")
                 else:
                     raise e
         return None
 
+    def _cache_key(self, template: str, fields: Dict[str, Any]) -> str:
+        """Build the response-cache key from the model, template and normalized input."""
+        normalized = "\x1f".join(
+            f"{name}={' '.join(str(fields[name]).split())}" for name in sorted(fields)
+        )
+        input_hash = hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+        template_hash = hashlib.sha256(template.encode('utf-8')).hexdigest()[:16]
+        return f"{self.model_name}:{template_hash}:{input_hash}"
+
+    def _generate_text(self, template: str, **fields: Any) -> str:
+        """
+        Fill a prompt template and return the model's text, using the response cache.
+
+        Args:
+            template: Prompt template with str.format placeholders
+            **fields: Values for the template placeholders
+
+        Returns:
+            str: The generated (or cached) response text
+        """
+        key = self._cache_key(template, fields)
+        if self.response_cache is not None:
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                logger.debug("LLM response cache hit")
+                return cached
+
+        response = self._generate_with_retry(template.format(**fields))
+        text = response.text
+        if self.response_cache is not None and text:
+            self.response_cache.set(key, text)
+        return text
+
+    def detect_pattern_objects(self, data: Any, source: str = None) -> List[Pattern]:
+        """
+        Detect patterns and return them as validated Pattern objects.
+
+        The response is parsed and schema-checked; malformed output gets a bounded
+        number of repair prompts. Only the validated patterns are cached (raw
+        responses are not), so repeated calls skip both the model and the parsing,
+        and a malformed answer is never replayed from the cache.
+
+        Args:
+            data (Any): The data to analyze.
+            source (str): Optional identifier (e.g. URL) recorded on each pattern.
+
+        Returns:
+            List[Pattern]: Validated patterns (empty if the model found none).
+
+        Raises:
+            PatternValidationError: If the response could not be repaired.
+            Exception: If the model call itself fails.
+        """
+        fields = {'data': str(data)[:10000]}
+        parsed_key = self._cache_key(PATTERN_PROMPT, fields) + ":parsed"
+        cached = self.response_cache.get(parsed_key) if self.response_cache is not None else None
+        if cached is not None:
+            patterns = [Pattern.from_dict(entry) for entry in cached]
+        else:
+            text = self._generate_with_retry(PATTERN_PROMPT.format(**fields)).text
+            for attempt in range(self.pattern_repair_attempts + 1):
+                try:
+                    patterns = parse_patterns(text)
+                    break
+                except PatternValidationError as e:
+                    if attempt == self.pattern_repair_attempts:
+                        logger.warning(f"Pattern response failed validation after {attempt} repairs: {e}")
+                        raise
+                    logger.info(f"Pattern response invalid ({e}); requesting repair")
+                    repair = PATTERN_REPAIR_PROMPT.format(error=str(e), response=text[:8000])
+                    text = self._generate_with_retry(repair).text
+            if self.response_cache is not None:
+                self.response_cache.set(parsed_key, [p.to_dict() for p in patterns])
+
+        if source:
+            patterns = [replace(p, sources=(source,)) for p in patterns]
+        return patterns
+
     def detect_patterns(self, data: Any) -> List[Dict[str, Any]]:
         """
         Detect patterns in the provided data using advanced LLM analysis.
@@ -294,44 +545,53 @@ class Analyzer:
             data (Any): The data to analyze.
 
         Returns:
-            List[Dict[str, Any]]: A list of detected patterns.
+            List[Dict[str, Any]]: A list of detected patterns ('pattern', 'confidence',
+            'category', 'count', 'sources').
         """
         logger.info("Detecting patterns...")
         
         if self.client:
             try:
-                prompt = (
-                    "Analyze the following data and detect key patterns, anomalies, or trends. "
-                    "Focus on:\n"
-                    "1. Temporal patterns (timing, frequency)\n"
-                    "2. Behavioral patterns (actions, sentiment)\n"
-                    "3. Structural patterns (relationships, clusters)\n"
-                    "Return the result as a JSON list of objects, where each object has 'pattern' (description) "
-                    "and 'confidence' (0.0-1.0). "
-                    f"Data: {str(data)[:10000]}"
-                )
-                response = self._generate_with_retry(prompt)
-                # In a real implementation, we would parse the JSON. 
-                # For now, we return the raw text if it's not strict JSON, wrapped in a structure.
-                return [{"pattern": response.text, "confidence": 1.0}]
+                return [p.to_dict() for p in self.detect_pattern_objects(data)]
             except Exception as e:
                 logger.error(f"Gemini analysis failed: {e}")
         
         return [{"pattern": "Pattern detection unavailable (LLM error)", "confidence": 0.0}]
 
-    def score_relevance(self, data: Any) -> float:
+    def score_relevance(self, data: Any, query: str = None) -> float:
         """
-        Score the relevance of the data based on predefined criteria.
+        Score the relevance of the data to a query.
 
         Args:
-            data (Any): The data to score.
+            data (Any): The data to score (text, or a dict with 'content'/'title').
+            query (str): The research query; defaults to data['query'] when present.
 
         Returns:
-            float: A relevance score between 0.0 and 1.0.
+            float: A relevance score between 0.0 and 1.0 (1.0 when there is no query).
         """
         logger.info("Scoring relevance...")
-        # Placeholder logic - could be enhanced with LLM scoring in future
-        return 0.85
+        if query is None and isinstance(data, dict):
+            query = data.get('query')
+        if not query:
+            return 1.0
+        return self.relevance.score(data if isinstance(data, (str, dict)) else str(data), query)
+
+    def score_relevance_batch(self, documents: List[Any], query: str, use_batch_idf: bool = True) -> List[float]:
+        """
+        Score many documents against one query in a single pass, without LLM calls.
+
+        Args:
+            documents (List[Any]): Texts, or dicts with 'content'/'title'.
+            query (str): The research query.
+            use_batch_idf (bool): Weight terms by IDF across these documents; False scores
+                each document on its own.
+
+        Returns:
+            List[float]: Relevance scores between 0.0 and 1.0, in input order.
+        """
+        return self.relevance.score_batch(
+            [d if isinstance(d, (str, dict)) else str(d) for d in documents], query, use_batch_idf=use_batch_idf
+        )
 
     def generate_summary(self, data: Any) -> str:
         """
@@ -347,27 +607,112 @@ class Analyzer:
         
         if self.client:
             try:
-                prompt = (
-                    "You are an elite intelligence analyst. Analyze the following text and provide a comprehensive report.\n"
-                    "Structure your response exactly as follows:\n\n"
-                    "### 1. Intelligence Extraction\n"
-                    "A comprehensive narrative paragraph that synthesizes the key findings, context, and nuances of the information. "
-                    "Do not use bullet points here. Tell the story of the data.\n\n"
-                    "### 2. Strategic Implications\n"
-                    "Analyze what this information means for the broader context (e.g., industry trends, future risks, opportunities).\n\n"
-                    "### 3. Key Entities\n"
-                    "List important people, organizations, and locations mentioned.\n\n"
-                    f"Data to Analyze:\n{str(data)[:15000]}"
-                )
-                
-                response = self._generate_with_retry(prompt)
-                return response.text
+                if self.summary_mode == "truncate":
+                    return self._generate_text(SUMMARY_PROMPT, data=str(data)[:15000])
+                return self.summarizer.summarize(str(data), SUMMARY_PROMPT)
+            except CancelledError:
+                raise
             except Exception as e:
                 logger.error(f"Gemini summarization failed: {e}")
                 return f"Error generating summary: {e}"
         
         return "This is a generated summary of the analyzed data (Mock - No API Key)."
 
+    def generate_summaries_batch(self, documents: List[str]) -> List[str]:
+        """
+        Generate one summary per document, packing short documents into shared requests.
+
+        Cached summaries (single-document or from earlier batches) are reused;
+        the rest are grouped up to the batch token and size budgets and
+        summarized with one structured (JSON) prompt per group.
+        Long documents, and any document missing from a batch response, fall back
+        to generate_summary.
+
+        Args:
+            documents: Cleaned document texts
+
+        Returns:
+            List[str]: Summaries in the same order as documents
+        """
+        if not documents:
+            return []
+        if not self.client:
+            return [self.generate_summary(doc) for doc in documents]
+
+        results: List[Any] = [None] * len(documents)
+        batchable: List[int] = []
+        individual: List[int] = []
+        for index, doc in enumerate(documents):
+            if self.response_cache is not None:
+                # A single-document summary, else one produced by an earlier batch
+                cached = self.response_cache.get(self._cache_key(SUMMARY_PROMPT, {'data': doc}))
+                if cached is None:
+                    cached = self.response_cache.get(self._cache_key(BATCH_SUMMARY_PROMPT, {'data': doc}))
+                if cached is not None:
+                    results[index] = cached
+                    continue
+            if self.batch_summaries and estimate_tokens(doc) <= self.batch_max_tokens // 2:
+                batchable.append(index)
+            else:
+                individual.append(index)
+
+        batches: List[List[int]] = []
+        size = 0
+        for index in batchable:
+            tokens = estimate_tokens(documents[index])
+            if batches and size + tokens <= self.batch_max_tokens and len(batches[-1]) < self.batch_max_documents:
+                batches[-1].append(index)
+                size += tokens
+            else:
+                batches.append([index])
+                size = tokens
+        # A batch of one is just an individual request
+        individual.extend(batch[0] for batch in batches if len(batch) == 1)
+        batches = [batch for batch in batches if len(batch) > 1]
+        cached_count = sum(result is not None for result in results)
+        logger.info(f"Summarizing {len(documents)} documents: {cached_count} cached, "
+                    f"{len(batches)} batched requests, {len(individual)} individual")
+
+        def run_batch(batch: List[int]) -> List[int]:
+            """Summarize one batch; return the indices it failed to cover."""
+            rendered = "\n\n".join(
+                f'<document id="{position + 1}">\n{documents[index]}\n</document>'
+                for position, index in enumerate(batch)
+            )
+            try:
+                response = self._generate_with_retry(
+                    BATCH_SUMMARY_PROMPT.format(count=len(batch), documents=rendered)
+                )
+                entries = extract_json(response.text)
+            except CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Batched summary failed, falling back to individual requests: {e}")
+                return batch
+            by_id = {}
+            for entry in entries if isinstance(entries, list) else []:
+                if isinstance(entry, dict) and isinstance(entry.get('summary'), str) and entry['summary'].strip():
+                    by_id[str(entry.get('id')).strip()] = entry['summary'].strip()
+            missing = []
+            for position, index in enumerate(batch):
+                summary = by_id.get(str(position + 1))
+                if summary is None:
+                    missing.append(index)
+                    continue
+                results[index] = summary
+                if self.response_cache is not None:
+                    # Keyed on the batch template, which is what actually produced it
+                    self.response_cache.set(self._cache_key(BATCH_SUMMARY_PROMPT, {'data': documents[index]}), summary)
+            return missing
+
+        for missing in self.llm_executor.map(run_batch, batches):
+            individual.extend(missing)
+        # generate_summary may map over chunks, so it must not hold an LLM worker itself
+        summaries = self.llm_executor.fan_out(self.generate_summary, [documents[i] for i in individual])
+        for index, summary in zip(individual, summaries):
+            results[index] = summary
+        return results
+
     def generate_executive_report(self, summaries: List[str], prompt: str) -> str:
         """
         Synthesize multiple summaries into a single executive intelligence report.
@@ -384,25 +729,22 @@ class Analyzer:
         if not summaries:
             return "No data available for executive summary."
             
-        combined_text = "\n\n".join(summaries)
-        
         if self.client:
             try:
-                prompt_text = (
-                    f"You are a Chief Intelligence Officer. Synthesize the following {len(summaries)} intelligence reports "
-                    f"regarding '{prompt}' into a single, high-level Executive Briefing.\n\n"
-                    "Your response MUST be a single, cohesive narrative paragraph (200-400 words) that:\n"
-                    "1. Synthesizes the most important findings from all sources.\n"
-                    "2. Identifies the overarching narrative or trend.\n"
-                    "3. Highlights the critical strategic implication.\n"
-                    "4. Does NOT use bullet points.\n"
-                    "5. Starts directly with the narrative (no 'Here is the report' preamble).\n\n"
-                    f"Source Reports:\n{combined_text[:25000]}"
+                if self.summary_mode == "truncate":
+                    reports = "\n\n".join(summaries)[:25000]
+                else:
+                    # Large source sets are merged hierarchically so no source is dropped
+                    reports = self.summarizer.reduce(summaries, prompt)
+                return self._generate_text(
+                    EXECUTIVE_PROMPT,
+                    count=len(summaries),
+                    prompt=prompt,
+                    reports=reports
                 )
-                
-                response = self._generate_with_retry(prompt_text)
-                return response.text
 
+            except CancelledError:
+                raise
             except Exception as e:
                 logger.error(f"Executive report generation failed: {e}")
                 return f"Error generating executive report: {e}"
@@ -0,0 +1,218 @@
+import logging
+import os
+import time
+import queue
+import atexit
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+_driver_path: Optional[str] = None
+_driver_path_lock = threading.Lock()
+
+def get_driver_path() -> Optional[str]:
+    """
+    Resolve the chromedriver binary once per process.
+
+    CHROMEDRIVER_PATH wins; otherwise webdriver-manager is asked once and its
+    answer reused, instead of re-checking the install on every search.
+
+    Returns:
+        Optional[str]: Driver path, or None to let Selenium locate it.
+    """
+    global _driver_path
+    override = os.getenv("CHROMEDRIVER_PATH")
+    if override:
+        return override
+    with _driver_path_lock:
+        if _driver_path is None:
+            try:
+                from webdriver_manager.chrome import ChromeDriverManager
+                _driver_path = ChromeDriverManager().install()
+            except ImportError:
+                return None
+        return _driver_path
+
+def create_chrome_driver():
+    """
+    Launch a headless Chrome instance.
+
+    Returns:
+        WebDriver: A new Chrome driver.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--window-size=1920,1080')
+    chrome_options.add_argument(f'user-agent={USER_AGENT}')
+    chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
+
+    driver_path = get_driver_path()
+    service = Service(driver_path) if driver_path else Service()
+    logger.info("Initializing Chrome driver...")
+    return webdriver.Chrome(service=service, options=chrome_options)
+
+class BrowserPool:
+    """
+    Thread-safe pool of warm browser instances.
+
+    Drivers are created lazily up to `size`, handed out one caller at a time,
+    health-checked before reuse, and recycled after `max_uses` sessions so a
+    long-running process doesn't accumulate browser memory leaks.
+    """
+
+    def __init__(self,
+                 size: int = 2,
+                 max_uses: int = 50,
+                 driver_factory: Optional[Callable[[], Any]] = None):
+        """
+        Args:
+            size: Maximum concurrent browser instances.
+            max_uses: Sessions a driver serves before it is replaced.
+            driver_factory: Callable returning a new driver (defaults to headless Chrome).
+        """
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.driver_factory = driver_factory or create_chrome_driver
+        self.created = 0
+        self.recycled = 0
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+        self._uses: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @staticmethod
+    def _healthy(driver) -> bool:
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _discard(self, driver):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+            self.created -= 1
+        self._quit(driver)
+
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        Take a healthy driver from the pool, launching one if below capacity.
+
+        Args:
+            timeout: Seconds to wait for a free driver (None = wait forever).
+
+        Returns:
+            WebDriver: A driver reserved for the caller until release().
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self._closed:
+                raise RuntimeError("Browser pool is closed")
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_create = self.created < self.size
+                    if can_create:
+                        self.created += 1
+                if can_create:
+                    try:
+                        driver = self.driver_factory()
+                    except Exception:
+                        with self._lock:
+                            self.created -= 1
+                        raise
+                    with self._lock:
+                        self._uses[id(driver)] = 0
+                    return driver
+                # Poll so a slot freed by a discarded driver is noticed too
+                wait = 0.5 if deadline is None else min(0.5, deadline - time.monotonic())
+                if wait <= 0:
+                    raise TimeoutError("No browser available in pool")
+                try:
+                    driver = self._idle.get(timeout=wait)
+                except queue.Empty:
+                    continue
+
+            if self._healthy(driver):
+                return driver
+            logger.warning("Discarding unresponsive browser instance")
+            self._discard(driver)
+
+    def release(self, driver, discard: bool = False):
+        """
+        Return a driver to the pool.
+
+        Args:
+            driver: Driver obtained from acquire().
+            discard: Quit the driver instead of reusing it (e.g. after an error).
+        """
+        with self._lock:
+            uses = self._uses.get(id(driver), 0) + 1
+            self._uses[id(driver)] = uses
+        if discard or self._closed or uses >= self.max_uses:
+            if not discard and uses >= self.max_uses:
+                self.recycled += 1
+            self._discard(driver)
+            return
+        self._idle.put(driver)
+
+    @contextmanager
+    def driver(self, timeout: Optional[float] = None):
+        """Context manager around acquire()/release(); errors discard the driver."""
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        except Exception:
+            self.release(driver, discard=True)
+            raise
+        else:
+            self.release(driver)
+
+    def close(self):
+        """Quit every idle driver; drivers in use are quit when released."""
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+
+_shared_pool: Optional[BrowserPool] = None
+_shared_pool_lock = threading.Lock()
+
+def get_browser_pool() -> BrowserPool:
+    """
+    Return the process-wide browser pool, sized from BROWSER_POOL_SIZE / BROWSER_MAX_USES.
+
+    Returns:
+        BrowserPool: The shared pool (closed automatically at exit).
+    """
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = BrowserPool(
+                size=int(os.getenv("BROWSER_POOL_SIZE", "2")),
+                max_uses=int(os.getenv("BROWSER_MAX_USES", "50")),
+            )
+            atexit.register(_shared_pool.close)
+        return _shared_pool
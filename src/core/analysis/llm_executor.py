@@ -0,0 +1,341 @@
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CancelToken:
+    """
+    Cancellation flag for one unit of work (a pipeline run, say) and every model call made for it.
+
+    Tokens nest: a token created inside another's scope is cancelled along with its parent.
+    """
+
+    def __init__(self, parent: Optional["CancelToken"] = None):
+        """
+        Args:
+            parent: Enclosing token, if any.
+        """
+        self.parent = parent
+        self._event = threading.Event()
+
+    def cancel(self):
+        """Cancel this token and its children."""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """True once this token or an ancestor has been cancelled."""
+        token = self
+        while token is not None:
+            if token._event.is_set():
+                return True
+            token = token.parent
+        return False
+
+    def covers(self, other: Optional["CancelToken"]) -> bool:
+        """True if other is this token or one of its children."""
+        while other is not None:
+            if other is self:
+                return True
+            other = other.parent
+        return False
+
+
+_current_token: contextvars.ContextVar = contextvars.ContextVar("llm_cancel_token", default=None)
+
+@contextmanager
+def cancel_scope(token: Optional[CancelToken] = None) -> Iterator[CancelToken]:
+    """
+    Attach a cancel token to all LLM work started in this context.
+
+    The token follows the work into tasks and asyncio.to_thread calls started
+    inside the scope, and from there into executor workers and fan_out threads.
+
+    Args:
+        token: Token to use; defaults to a new child of the token already in scope.
+
+    Yields:
+        CancelToken: The token in scope
+    """
+    token = token or CancelToken(parent=_current_token.get())
+    reset = _current_token.set(token)
+    try:
+        yield token
+    finally:
+        _current_token.reset(reset)
+
+
+class LLMExecutor:
+    """
+    Dedicated worker pool for model calls.
+
+    LLM requests spend almost all their time waiting on the API, so they get their
+    own pool sized to the quota rather than sharing the default executor (sized by
+    CPU count) with parsing and other CPU work. The pool size is the in-flight cap.
+
+    Only leaf model calls should hold a worker. Orchestration that makes several
+    calls of its own (a summary that maps over chunks, say) goes through
+    fan_out(), which waits on plain helper threads, so each of its calls is
+    queued on the pool separately. Work submitted from inside an LLM worker
+    still runs inline on that worker, so nested fan-out can never wait on a
+    slot it is itself holding.
+
+    Cancellation is cooperative and scoped. Each submission carries the
+    CancelToken in scope when it was made (see cancel_scope), so
+    cancel_pending(token) stops one pipeline run without touching others that
+    share the executor. Queued work is dropped outright, and running work sees
+    should_stop() turn True and gives up at its next checkpoint (Analyzer checks
+    before each request attempt, the summarizer between map and reduce steps).
+    """
+
+    def __init__(self, max_in_flight: int = 4):
+        """
+        Args:
+            max_in_flight: Maximum concurrent model calls (worker threads).
+        """
+        self.max_in_flight = max(1, max_in_flight)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="llm")
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # Outstanding futures and the cancel token each was submitted under
+        self._pending: Dict[Future, Optional[CancelToken]] = {}
+        # Bumped by cancel_pending() without a token; work submitted before the bump is stale
+        self._epoch = 0
+
+        self.queued = 0
+        self.in_flight = 0
+        self.max_queue_depth = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+
+    def in_worker(self) -> bool:
+        """True when called from one of this executor's worker threads."""
+        return getattr(self._local, 'epoch', None) is not None
+
+    def should_stop(self) -> bool:
+        """True when the work running in this context has been cancelled."""
+        token = _current_token.get()
+        if token is not None and token.cancelled:
+            return True
+        epoch = getattr(self._local, 'epoch', None)
+        return epoch is not None and epoch < self._epoch
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """
+        Queue a call for an LLM worker, under the cancel token in scope.
+
+        Args:
+            fn: The callable
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Future: Resolves to fn's result
+        """
+        token = _current_token.get()
+        if self.in_worker():
+            future: Future = Future()
+            try:
+                if self.should_stop():
+                    raise CancelledError("LLM work cancelled before it started")
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+            return future
+
+        with self._lock:
+            epoch = self._epoch
+            self.queued += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queued)
+
+        def task():
+            with self._lock:
+                self.queued -= 1
+                if epoch < self._epoch or (token is not None and token.cancelled):
+                    self.cancelled += 1
+                    raise CancelledError("LLM work cancelled before it started")
+                self.in_flight += 1
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            self._local.epoch = epoch
+            try:
+                result = fn(*args, **kwargs)
+            except CancelledError:
+                with self._lock:
+                    self.cancelled += 1
+                raise
+            except Exception:
+                with self._lock:
+                    self.failed += 1
+                raise
+            finally:
+                self._local.epoch = None
+                with self._lock:
+                    self.in_flight -= 1
+            with self._lock:
+                self.completed += 1
+            return result
+
+        # The worker runs in a copy of this context, so nested calls see the same token
+        future = self._pool.submit(contextvars.copy_context().run, task)
+        with self._lock:
+            self._pending[future] = token
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: Future):
+        with self._lock:
+            self._pending.pop(future, None)
+            if future.cancelled():
+                # Cancelled while queued: task() never ran to update the counters
+                self.queued -= 1
+                self.cancelled += 1
+
+    def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a call on an LLM worker and wait for its result."""
+        return self.submit(fn, *args, **kwargs).result()
+
+    def map(self, fn: Callable[[Any], Any], items: Iterable[Any]) -> List[Any]:
+        """
+        Run fn over items on LLM workers.
+
+        Args:
+            fn: Called once per item
+            items: Inputs
+
+        Returns:
+            List[Any]: Results in input order. If one call fails, calls that have
+                not started are cancelled and the error is raised.
+        """
+        futures = [self.submit(fn, item) for item in items]
+        try:
+            return [future.result() for future in futures]
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    def fan_out(self, fn: Callable[[Any], Any], items: Iterable[Any]) -> List[Any]:
+        """
+        Run fn over items concurrently on short-lived helper threads, not LLM workers.
+
+        fn holds no worker slot while it waits, so the model calls it makes
+        fan out across the capped pool. From inside a worker, items run one
+        after another (their calls would run inline anyway). Items not yet
+        started when the work is cancelled are skipped.
+
+        Args:
+            fn: Called once per item; makes its model calls through this executor
+            items: Inputs
+
+        Returns:
+            List[Any]: Results in input order. If one call fails, calls that have
+                not started are cancelled and the error is raised.
+        """
+        def call(item: Any) -> Any:
+            if self.should_stop():
+                raise CancelledError("LLM work cancelled before it started")
+            return fn(item)
+
+        items = list(items)
+        if len(items) <= 1 or self.in_worker():
+            return [call(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(len(items), self.max_in_flight),
+                                thread_name_prefix="llm-fan-out") as pool:
+            futures = [pool.submit(contextvars.copy_context().run, call, item) for item in items]
+            try:
+                return [future.result() for future in futures]
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    async def run_async(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Await a call on an LLM worker without blocking the event loop.
+
+        Cancelling the awaiting task drops the call if it has not started yet.
+        """
+        future = self.submit(fn, *args, **kwargs)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+    def cancel_pending(self, token: Optional[CancelToken] = None) -> int:
+        """
+        Cancel submitted work: queued calls are dropped, running ones stop at their next checkpoint.
+
+        Args:
+            token: Cancel only work submitted under this token (or its children), and
+                mark the token cancelled. By default all work submitted so far is cancelled.
+
+        Returns:
+            int: Number of queued calls dropped
+        """
+        with self._lock:
+            if token is None:
+                self._epoch += 1
+                pending = list(self._pending)
+            else:
+                token.cancel()
+                pending = [future for future, owner in self._pending.items() if token.covers(owner)]
+        dropped = sum(future.cancel() for future in pending)
+        if pending:
+            logger.info(f"Cancelled LLM work: {dropped} queued, {len(pending) - dropped} running")
+        return dropped
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Return queue and concurrency counters for monitoring.
+
+        Returns:
+            Dict[str, int]: Current queued/in-flight counts, their peaks, and outcome totals.
+        """
+        with self._lock:
+            return {
+                'max_in_flight': self.max_in_flight,
+                'queued': self.queued,
+                'in_flight': self.in_flight,
+                'max_queue_depth': self.max_queue_depth,
+                'peak_in_flight': self.peak_in_flight,
+                'completed': self.completed,
+                'failed': self.failed,
+                'cancelled': self.cancelled,
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work, drop anything queued and release the worker threads."""
+        self.cancel_pending()
+        self._pool.shutdown(wait=wait)
+
+
+_shared_executors: Dict[str, LLMExecutor] = {}
+_shared_lock = threading.Lock()
+
+def get_shared_executor(name: str = "gemini") -> LLMExecutor:
+    """
+    Return the process-wide LLM executor for a quota, sized from LLM_MAX_IN_FLIGHT
+    (falling back to the older SUMMARY_WORKERS setting).
+
+    Args:
+        name: Quota name; every Analyzer using the same name shares one executor.
+
+    Returns:
+        LLMExecutor: The shared executor.
+    """
+    with _shared_lock:
+        executor = _shared_executors.get(name)
+        if executor is None:
+            executor = LLMExecutor(max_in_flight=int(os.getenv("LLM_MAX_IN_FLIGHT", os.getenv("SUMMARY_WORKERS", "4"))))
+            _shared_executors[name] = executor
+        return executor
@@ -0,0 +1,353 @@
+import logging
+import os
+import re
+import json
+import math
+import time
+import random
+import asyncio
+import hashlib
+import argparse
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional
+from aiohttp import web
+from src.axis.filters.relevance import tokenize
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_RE = re.compile(r'<document id="([^"]+)">\n(.*?)\n</document>', re.S)
+
+class StubAPIError(Exception):
+    """Error raised by the stub; its message mimics the Gemini API so retry paths trigger."""
+
+    def __init__(self, code: int, retry_delay: float = 1.0):
+        self.code = code
+        self.retry_delay = retry_delay
+        status = "RESOURCE_EXHAUSTED" if code == 429 else "UNAVAILABLE"
+        super().__init__(f"{code} {status}. {{'error': {{'code': {code}, 'status': '{status}', "
+                         f"'details': [{{'retryDelay': '{retry_delay:g}s'}}]}}}}")
+
+
+class StubResponse:
+    """Matches the attribute of a genai response that the Analyzer reads."""
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class LatencyModel:
+    """
+    Response-time distribution for the stub.
+
+    Spec strings are "fixed:<s>", "uniform:<min>:<max>" or
+    "lognormal:<median>:<sigma>", optionally plus per-1k-token time via
+    per_1k_tokens.
+    """
+
+    def __init__(self, spec: str = "fixed:0", per_1k_tokens: float = 0.0):
+        """
+        Args:
+            spec: Distribution spec string.
+            per_1k_tokens: Extra seconds per 1000 prompt tokens.
+        """
+        kind, *params = spec.split(':')
+        self.kind = kind.lower()
+        self.params = [float(p) for p in params]
+        if self.kind not in ('fixed', 'uniform', 'lognormal'):
+            raise ValueError(f"Unknown latency distribution: {kind}")
+        self.per_1k_tokens = per_1k_tokens
+
+    def sample(self, rng: random.Random, tokens: int = 0) -> float:
+        """Draw one latency in seconds."""
+        if self.kind == 'fixed':
+            base = self.params[0] if self.params else 0.0
+        elif self.kind == 'uniform':
+            base = rng.uniform(self.params[0], self.params[1])
+        else:
+            median = self.params[0] if self.params else 0.5
+            sigma = self.params[1] if len(self.params) > 1 else 0.5
+            base = rng.lognormvariate(math.log(max(median, 1e-6)), sigma)
+        return base + self.per_1k_tokens * tokens / 1000
+
+
+class _StubModels:
+    def __init__(self, client: "StubLLMClient"):
+        self._client = client
+
+    def generate_content(self, model: str, contents: Any) -> StubResponse:
+        return StubResponse(self._client.complete(str(contents)))
+
+
+class StubLLMClient:
+    """
+    Offline stand-in for the genai client.
+
+    Exposes client.models.generate_content(model=..., contents=...) like the
+    real SDK. Output depends only on the prompt, so runs are reproducible;
+    latency and injected 429/503 errors are drawn from an RNG seeded by the
+    prompt and how many times it has been sent, so they don't depend on thread
+    scheduling either. Summary, batched-summary and pattern prompts get
+    answers in the shape the Analyzer expects.
+    """
+
+    def __init__(self,
+                 latency: str = "fixed:0",
+                 per_1k_tokens: float = 0.0,
+                 error_rate_429: float = 0.0,
+                 error_rate_503: float = 0.0,
+                 retry_delay: float = 1.0,
+                 seed: int = 0):
+        """
+        Args:
+            latency: Latency distribution spec (see LatencyModel).
+            per_1k_tokens: Extra latency per 1000 prompt tokens.
+            error_rate_429: Probability a call fails with 429 RESOURCE_EXHAUSTED.
+            error_rate_503: Probability a call fails with 503 UNAVAILABLE.
+            retry_delay: retryDelay advertised in injected errors, in seconds.
+            seed: Seed for latency and error injection.
+        """
+        self.latency = LatencyModel(latency, per_1k_tokens)
+        self.error_rate_429 = error_rate_429
+        self.error_rate_503 = error_rate_503
+        self.retry_delay = retry_delay
+        self.seed = seed
+        self.models = _StubModels(self)
+
+        self.calls = 0
+        self.errors = Counter()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._attempts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "StubLLMClient":
+        """Build a stub from LLM_STUB_* environment variables."""
+        return cls(
+            latency=os.getenv("LLM_STUB_LATENCY", "fixed:0"),
+            per_1k_tokens=float(os.getenv("LLM_STUB_PER_1K_TOKENS", "0")),
+            error_rate_429=float(os.getenv("LLM_STUB_429_RATE", "0")),
+            error_rate_503=float(os.getenv("LLM_STUB_503_RATE", "0")),
+            retry_delay=float(os.getenv("LLM_STUB_RETRY_DELAY", "1")),
+            seed=int(os.getenv("LLM_STUB_SEED", "0")),
+        )
+
+    def _plan(self, prompt: str):
+        """Draw (latency, error code or None) for this prompt's next attempt."""
+        digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        with self._lock:
+            self._attempts[digest] += 1
+            attempt = self._attempts[digest]
+        rng = random.Random(f"{self.seed}:{digest}:{attempt}")
+        latency = self.latency.sample(rng, len(prompt) // 4)
+        roll = rng.random()
+        if roll < self.error_rate_429:
+            return latency, 429
+        if roll < self.error_rate_429 + self.error_rate_503:
+            return latency, 503
+        return latency, None
+
+    def complete(self, prompt: str) -> str:
+        """
+        Answer a prompt, sleeping for the sampled latency first.
+
+        Args:
+            prompt: Prompt text
+
+        Returns:
+            str: Deterministic response text
+
+        Raises:
+            StubAPIError: When a 429/503 is injected
+        """
+        latency, error = self._plan(prompt)
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            if latency > 0:
+                time.sleep(latency)
+            if error:
+                with self._lock:
+                    self.errors[error] += 1
+                raise StubAPIError(error, self.retry_delay)
+            return self.respond(prompt)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    @staticmethod
+    def _keywords(text: str, limit: int = 5) -> List[str]:
+        counts = Counter(t for t in tokenize(text) if not t.isdigit())
+        return [word for word, _ in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))[:limit]] or ['data']
+
+    @classmethod
+    def _report(cls, text: str) -> str:
+        keywords = cls._keywords(text)
+        fingerprint = hashlib.sha256(text.encode('utf-8')).hexdigest()[:8]
+        return (
+            "### 1. Intelligence Extraction\n"
+            f"The source centres on {', '.join(keywords)} (ref {fingerprint}), "
+            f"covering {len(text.split())} words of material.\n\n"
+            "### 2. Strategic Implications\n"
+            f"Developments around {keywords[0]} are likely to shape near-term activity.\n\n"
+            "### 3. Key Entities\n"
+            + "\n".join(f"- {word.title()}" for word in keywords[:3])
+        )
+
+    @classmethod
+    def respond(cls, prompt: str) -> str:
+        """
+        Produce the deterministic answer for a prompt (no latency or errors).
+
+        Args:
+            prompt: Prompt text
+
+        Returns:
+            str: Response text
+        """
+        documents = DOCUMENT_RE.findall(prompt)
+        if documents:
+            return json.dumps([{"id": doc_id, "summary": cls._report(body)} for doc_id, body in documents])
+        if "JSON list of objects" in prompt:
+            keywords = cls._keywords(prompt.split("Data:", 1)[-1], limit=3)
+            categories = ['temporal', 'behavioral', 'structural']
+            return json.dumps([
+                {"pattern": f"Recurring focus on {word}", "confidence": round(0.9 - 0.1 * i, 2),
+                 "category": categories[i % len(categories)]}
+                for i, word in enumerate(keywords)
+            ])
+        return cls._report(prompt)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return call counters.
+
+        Returns:
+            Dict[str, Any]: calls, injected errors by code, and peak concurrency.
+        """
+        with self._lock:
+            return {'calls': self.calls, 'errors': dict(self.errors), 'peak_in_flight': self.peak_in_flight}
+
+
+class StubLLMServer:
+    """
+    Serves a StubLLMClient over HTTP in the Gemini REST shape.
+
+    POST /v1beta/models/<model>:generateContent accepts
+    {"contents": [{"parts": [{"text": ...}]}]} and answers with
+    {"candidates": [{"content": {"parts": [{"text": ...}]}}]}, or a Gemini-style
+    error body with status 429/503. Point the real SDK at it with
+    GEMINI_BASE_URL. Runs on its own thread and event loop.
+    """
+
+    def __init__(self, client: Optional[StubLLMClient] = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        Args:
+            client: Stub whose behaviour is served (defaults to one built from env).
+            host: Interface to bind.
+            port: Port to bind (0 picks a free one).
+        """
+        self.client = client or StubLLMClient.from_env()
+        self.host = host
+        self.port = port
+        self.base_url = ''
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._thread: Optional[threading.Thread] = None
+
+    async def _generate(self, request: web.Request) -> web.Response:
+        name = request.match_info['name']
+        if not name.endswith(':generateContent'):
+            return web.json_response({"error": {"code": 404, "message": "Unknown method"}}, status=404)
+        body = await request.json()
+        prompt = "".join(
+            part.get('text', '')
+            for content in body.get('contents', [])
+            for part in content.get('parts', [])
+        )
+        try:
+            # The sync stub sleeps; keep the server loop free for concurrent requests
+            text = await asyncio.to_thread(self.client.complete, prompt)
+        except StubAPIError as e:
+            status = "RESOURCE_EXHAUSTED" if e.code == 429 else "UNAVAILABLE"
+            return web.json_response({"error": {
+                "code": e.code, "message": str(e), "status": status,
+                "details": [{"@type": "type.googleapis.com/google.rpc.RetryInfo",
+                             "retryDelay": f"{e.retry_delay:g}s"}],
+            }}, status=e.code)
+        return web.json_response({
+            "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP"}],
+            "usageMetadata": {"promptTokenCount": len(prompt) // 4, "candidatesTokenCount": len(text) // 4},
+        })
+
+    async def _start(self):
+        app = web.Application(client_max_size=32 * 1024 * 1024)
+        app.router.add_post('/v1beta/models/{name}', self._generate)
+        app.router.add_post('/v1/models/{name}', self._generate)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        self.base_url = f"http://{self.host}:{self.port}"
+
+    def start(self) -> str:
+        """
+        Start serving in a background thread.
+
+        Returns:
+            str: Base URL of the server.
+        """
+        ready = threading.Event()
+
+        def serve():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self._start())
+            ready.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self._runner.cleanup())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=serve, name="llm-stub", daemon=True)
+        self._thread.start()
+        ready.wait()
+        logger.info(f"Stub LLM server listening on {self.base_url}")
+        return self.base_url
+
+    def stop(self):
+        """Stop the server and wait for its thread."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve an offline stub of the Gemini API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", default=os.getenv("LLM_STUB_LATENCY", "lognormal:0.8:0.4"))
+    parser.add_argument("--rate-429", type=float, default=float(os.getenv("LLM_STUB_429_RATE", "0")))
+    parser.add_argument("--rate-503", type=float, default=float(os.getenv("LLM_STUB_503_RATE", "0")))
+    parser.add_argument("--seed", type=int, default=int(os.getenv("LLM_STUB_SEED", "0")))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    client = StubLLMClient(latency=args.latency, error_rate_429=args.rate_429,
+                           error_rate_503=args.rate_503, seed=args.seed)
+    server = StubLLMServer(client, host=args.host, port=args.port)
+    server.start()
+    print(f"Stub Gemini API at {server.base_url} - set GEMINI_BASE_URL to use it (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Tuple
+from src.core.analysis.structured_output import extract_json
+
+logger = logging.getLogger(__name__)
+
+PATTERN_CATEGORIES = ('temporal', 'behavioral', 'structural', 'other')
+MAX_PATTERN_LENGTH = 1000
+
+class PatternValidationError(ValueError):
+    """Raised when an LLM response does not match the pattern schema."""
+
+
+@dataclass(frozen=True)
+class Pattern:
+    """
+    A single detected pattern.
+
+    Attributes:
+        pattern: Description of the pattern.
+        confidence: Model confidence between 0.0 and 1.0.
+        category: One of PATTERN_CATEGORIES.
+        count: Number of documents the pattern was detected in.
+        sources: Identifiers (e.g. URLs) of those documents, if known.
+    """
+    pattern: str
+    confidence: float
+    category: str = 'other'
+    count: int = 1
+    sources: Tuple[str, ...] = field(default_factory=tuple)
+
+    @property
+    def key(self) -> str:
+        """Normalized description used to merge the same pattern across documents."""
+        return ' '.join(re.findall(r'\w+', self.pattern.lower()))
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "Pattern":
+        """
+        Validate one decoded JSON object against the pattern schema.
+
+        Args:
+            data: Decoded JSON value
+
+        Returns:
+            Pattern: The validated pattern
+
+        Raises:
+            PatternValidationError: If required fields are missing or malformed
+        """
+        if not isinstance(data, dict):
+            raise PatternValidationError(f"expected an object, got {type(data).__name__}")
+        description = data.get('pattern', data.get('description'))
+        if not isinstance(description, str) or not description.strip():
+            raise PatternValidationError("'pattern' must be a non-empty string")
+        confidence = data.get('confidence')
+        if isinstance(confidence, str):
+            try:
+                confidence = float(confidence.strip().rstrip('%')) / (100 if confidence.strip().endswith('%') else 1)
+            except ValueError:
+                raise PatternValidationError(f"'confidence' is not a number: {confidence!r}")
+        if isinstance(confidence, bool) or not isinstance(confidence, (int, float)):
+            raise PatternValidationError("'confidence' must be a number between 0 and 1")
+        if not 0.0 <= confidence <= 1.0:
+            raise PatternValidationError(f"'confidence' out of range: {confidence}")
+        category = str(data.get('category', 'other')).strip().lower()
+        if category not in PATTERN_CATEGORIES:
+            category = 'other'
+        return cls(pattern=' '.join(description.split())[:MAX_PATTERN_LENGTH],
+                   confidence=float(confidence),
+                   category=category)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-dict form, as returned by Analyzer.detect_patterns."""
+        return {
+            'pattern': self.pattern,
+            'confidence': self.confidence,
+            'category': self.category,
+            'count': self.count,
+            'sources': list(self.sources),
+        }
+
+def parse_patterns(text: str) -> List[Pattern]:
+    """
+    Parse and validate an LLM pattern response.
+
+    Accepts a JSON list of pattern objects, or an object wrapping one under
+    'patterns'. Individually malformed entries are dropped.
+
+    Args:
+        text: Raw model output
+
+    Returns:
+        List[Pattern]: Valid patterns
+
+    Raises:
+        PatternValidationError: If the response holds no valid pattern
+    """
+    try:
+        value = extract_json(text)
+    except ValueError as e:
+        raise PatternValidationError(str(e))
+    if isinstance(value, dict):
+        value = value.get('patterns', [value])
+    if not isinstance(value, list):
+        raise PatternValidationError(f"expected a JSON list, got {type(value).__name__}")
+
+    patterns, errors = [], []
+    for index, entry in enumerate(value):
+        try:
+            patterns.append(Pattern.from_dict(entry))
+        except PatternValidationError as e:
+            errors.append(f"item {index}: {e}")
+    if errors:
+        logger.debug(f"Dropped {len(errors)} malformed patterns: {errors}")
+    if not patterns and value:
+        raise PatternValidationError("; ".join(errors[:5]))
+    return patterns
+
+def merge_patterns(groups: Iterable[Iterable[Pattern]]) -> List[Pattern]:
+    """
+    Merge patterns detected in many documents.
+
+    Patterns with the same normalized description are combined: counts and
+    sources add up and confidence becomes the count-weighted mean.
+
+    Args:
+        groups: Pattern lists, typically one per document
+
+    Returns:
+        List[Pattern]: Merged patterns, most frequent (then most confident) first
+    """
+    merged: Dict[str, Pattern] = {}
+    for group in groups:
+        for pattern in group:
+            existing = merged.get(pattern.key)
+            if existing is None:
+                merged[pattern.key] = pattern
+                continue
+            count = existing.count + pattern.count
+            merged[pattern.key] = Pattern(
+                pattern=existing.pattern,
+                confidence=(existing.confidence * existing.count + pattern.confidence * pattern.count) / count,
+                category=existing.category if existing.category != 'other' else pattern.category,
+                count=count,
+                sources=existing.sources + tuple(s for s in pattern.sources if s not in existing.sources),
+            )
+    return sorted(merged.values(), key=lambda p: (-p.count, -p.confidence))
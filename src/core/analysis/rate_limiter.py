@@ -0,0 +1,199 @@
+import logging
+import os
+import re
+import time
+import asyncio
+import threading
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+RETRY_DELAY_RE = re.compile(r"retry(?:_?delay|[- ]after)?['\"]?\s*[:=]?\s*['\"]?(\d+(?:\.\d+)?)\s*s", re.I)
+
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for quota accounting (~4 characters per token)."""
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+def parse_retry_delay(message: str) -> Optional[float]:
+    """
+    Extract a server-suggested retry delay (e.g. "retryDelay": "23s") from an error message.
+
+    Args:
+        message: The error text
+
+    Returns:
+        Optional[float]: Delay in seconds, if one was found
+    """
+    match = RETRY_DELAY_RE.search(message)
+    return float(match.group(1)) if match else None
+
+class RateLimiter:
+    """
+    Shared token-bucket limiter for LLM requests.
+
+    Two buckets are enforced together: requests per minute and tokens per
+    minute. Callers reserve capacity up front (the buckets may go negative) and
+    then wait for their reservation, so concurrent callers queue fairly instead
+    of polling. 429 responses pause all callers and cut the effective rate;
+    successes restore it gradually (AIMD).
+    Usable from threads (acquire) and from asyncio code (acquire_async).
+    """
+
+    def __init__(self,
+                 requests_per_minute: float = 15,
+                 tokens_per_minute: float = 1_000_000,
+                 burst: Optional[float] = None,
+                 min_rate_factor: float = 0.1):
+        """
+        Args:
+            requests_per_minute: Request quota.
+            tokens_per_minute: Token quota.
+            burst: Requests that may be made back-to-back (defaults to one minute's quota).
+            min_rate_factor: Lowest fraction of the quota adaptive backoff will drop to.
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.burst = burst if burst is not None else requests_per_minute
+        self.min_rate_factor = min_rate_factor
+
+        self.rate_factor = 1.0
+        self.throttle_count = 0
+        self._consecutive_throttles = 0
+        self._pause_until = 0.0
+        self._request_level = float(self.burst)
+        self._token_level = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._updated = now
+        request_rate = self.requests_per_minute * self.rate_factor / 60.0
+        token_rate = self.tokens_per_minute * self.rate_factor / 60.0
+        self._request_level = min(self.burst, self._request_level + elapsed * request_rate)
+        self._token_level = min(self.tokens_per_minute, self._token_level + elapsed * token_rate)
+
+    def reserve(self, tokens: int = 1) -> float:
+        """
+        Reserve quota for one request.
+
+        Args:
+            tokens: Estimated tokens the request will consume.
+
+        Returns:
+            float: Seconds the caller must wait before sending the request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # A single oversized request may use the whole bucket but never waits forever
+            tokens = min(tokens, self.tokens_per_minute)
+            self._request_level -= 1
+            self._token_level -= tokens
+
+            request_rate = self.requests_per_minute * self.rate_factor / 60.0
+            token_rate = self.tokens_per_minute * self.rate_factor / 60.0
+            wait = max(
+                0.0,
+                -self._request_level / request_rate if self._request_level < 0 else 0.0,
+                -self._token_level / token_rate if self._token_level < 0 else 0.0,
+                self._pause_until - now,
+            )
+        return wait
+
+    def acquire(self, tokens: int = 1) -> float:
+        """
+        Block the calling thread until a request may be sent.
+
+        Args:
+            tokens: Estimated tokens the request will consume.
+
+        Returns:
+            float: Seconds waited.
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: int = 1) -> float:
+        """
+        Wait (without blocking the event loop) until a request may be sent.
+
+        Args:
+            tokens: Estimated tokens the request will consume.
+
+        Returns:
+            float: Seconds waited.
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def report_throttled(self, retry_after: Optional[float] = None) -> float:
+        """
+        Record a 429/503 from the API: pause every caller and halve the rate.
+
+        Args:
+            retry_after: Server-suggested delay in seconds, if any.
+
+        Returns:
+            float: The pause applied, in seconds.
+        """
+        with self._lock:
+            self.throttle_count += 1
+            self._consecutive_throttles += 1
+            self.rate_factor = max(self.min_rate_factor, self.rate_factor / 2)
+            pause = retry_after if retry_after is not None else min(60.0, 2.0 ** self._consecutive_throttles)
+            self._pause_until = max(self._pause_until, time.monotonic() + pause)
+        logger.warning(f"LLM quota throttled; pausing {pause:.1f}s, rate at {self.rate_factor:.0%} of quota")
+        return pause
+
+    def report_success(self):
+        """Record a successful request, restoring the rate additively."""
+        with self._lock:
+            self._consecutive_throttles = 0
+            if self.rate_factor < 1.0:
+                self.rate_factor = min(1.0, self.rate_factor + 0.1)
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Return limiter state for monitoring.
+
+        Returns:
+            Dict[str, float]: Current rate factor, throttle count and bucket levels.
+        """
+        with self._lock:
+            return {
+                'rate_factor': self.rate_factor,
+                'throttle_count': self.throttle_count,
+                'request_level': self._request_level,
+                'token_level': self._token_level,
+            }
+
+
+_shared_limiters: Dict[str, RateLimiter] = {}
+_shared_lock = threading.Lock()
+
+def get_shared_limiter(name: str = "gemini") -> RateLimiter:
+    """
+    Return the process-wide limiter for a quota, creating it from GEMINI_RPM / GEMINI_TPM.
+
+    Args:
+        name: Quota name; every Analyzer using the same name shares one limiter.
+
+    Returns:
+        RateLimiter: The shared limiter.
+    """
+    with _shared_lock:
+        limiter = _shared_limiters.get(name)
+        if limiter is None:
+            limiter = RateLimiter(
+                requests_per_minute=float(os.getenv("GEMINI_RPM", "15")),
+                tokens_per_minute=float(os.getenv("GEMINI_TPM", "1000000")),
+            )
+            _shared_limiters[name] = limiter
+        return limiter
@@ -0,0 +1,40 @@
+import json
+import re
+from typing import Any
+
+CODE_FENCE_RE = re.compile(r'```(?:json)?\s*(.*?)```', re.S | re.I)
+
+def extract_json(text: str) -> Any:
+    """
+    Pull the first JSON value out of an LLM response.
+
+    Handles bare JSON, ```json fenced blocks, and JSON surrounded by prose.
+
+    Args:
+        text: Raw model output
+
+    Returns:
+        Any: The decoded JSON value
+
+    Raises:
+        ValueError: If no JSON value can be decoded
+    """
+    if not text:
+        raise ValueError("Empty response")
+
+    candidates = [match.group(1) for match in CODE_FENCE_RE.finditer(text)] + [text]
+    decoder = json.JSONDecoder()
+    for candidate in candidates:
+        candidate = candidate.strip()
+        try:
+            return json.loads(candidate)
+        except ValueError:
+            pass
+        # Fall back to the first position where a JSON array/object decodes cleanly
+        for match in re.finditer(r'[\[{]', candidate):
+            try:
+                value, _ = decoder.raw_decode(candidate, match.start())
+                return value
+            except ValueError:
+                continue
+    raise ValueError("No JSON found in response")
@@ -0,0 +1,192 @@
+import logging
+import re
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+from src.core.analysis.rate_limiter import CHARS_PER_TOKEN, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+PARAGRAPH_RE = re.compile(r'\n\s*\n')
+SENTENCE_RE = re.compile(r'(?<=[.!?])\s+')
+
+CHUNK_SUMMARY_PROMPT = (
+    "You are an intelligence analyst. The text below is part {index} of {total} of a longer document. "
+    "Summarize it densely: keep every concrete fact, figure, date, named entity and claim, "
+    "and drop boilerplate. Do not add commentary.\n\n"
+    "Text:\n{data}"
+)
+
+MERGE_PROMPT = (
+    "You are an intelligence analyst working on '{topic}'. Merge the following partial reports into one "
+    "consolidated report. Preserve every distinct finding, figure and named entity, "
+    "combine duplicates, and note disagreements between sources.\n\n"
+    "Partial reports:\n{data}"
+)
+
+def chunk_text(text: str, max_tokens: int) -> List[str]:
+    """
+    Split text into chunks of at most max_tokens, breaking on paragraphs, then sentences.
+
+    Args:
+        text: Text to split
+        max_tokens: Token budget per chunk
+
+    Returns:
+        List[str]: Chunks in document order
+    """
+    max_chars = max(1, max_tokens * CHARS_PER_TOKEN)
+    if len(text) <= max_chars:
+        return [text]
+
+    pieces: List[str] = []
+    for paragraph in PARAGRAPH_RE.split(text):
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        for sentence in SENTENCE_RE.split(paragraph):
+            # A single runaway "sentence" (tables, minified text) is hard-split
+            pieces.extend(sentence[i:i + max_chars] for i in range(0, len(sentence), max_chars))
+
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for piece in pieces:
+        if not piece.strip():
+            continue
+        added = len(piece) + (2 if current else 0)
+        if current and size + added > max_chars:
+            chunks.append("\n\n".join(current))
+            current, size = [], 0
+            added = len(piece)
+        current.append(piece)
+        size += added
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+def pack_texts(texts: List[str], max_tokens: int) -> List[List[str]]:
+    """
+    Greedily group consecutive texts so each group fits in max_tokens.
+
+    Args:
+        texts: Texts to group (each should fit the budget on its own)
+        max_tokens: Token budget per group
+
+    Returns:
+        List[List[str]]: Groups in input order
+    """
+    groups: List[List[str]] = []
+    current: List[str] = []
+    size = 0
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if current and size + tokens > max_tokens:
+            groups.append(current)
+            current, size = [], 0
+        current.append(text)
+        size += tokens
+    if current:
+        groups.append(current)
+    return groups
+
+class MapReduceSummarizer:
+    """
+    Summarizes inputs larger than one prompt without truncating them.
+
+    Long text is split into token-budgeted chunks that are summarized
+    concurrently (map); the partial summaries are then merged in groups,
+    level by level, until they fit a single prompt (reduce). Every model call
+    goes through the supplied generate function, so the Analyzer's response
+    cache and shared rate limiter apply to each chunk.
+    """
+
+    def __init__(self,
+                 generate: Callable[..., str],
+                 chunk_tokens: int = 3750,
+                 reduce_tokens: int = 6250,
+                 max_workers: int = 4,
+                 max_levels: int = 4,
+                 executor=None):
+        """
+        Args:
+            generate: Called as generate(template, **fields) and returns the model's text.
+            chunk_tokens: Budget for one document chunk in the map step.
+            reduce_tokens: Budget for the combined text handed to a merge or final prompt.
+            max_workers: Concurrent model calls per step.
+            max_levels: Maximum merge levels before falling back to truncation.
+            executor: Optional LLMExecutor to run model calls on; replaces the
+                per-step thread pool (and max_workers) when given.
+        """
+        self.generate = generate
+        self.chunk_tokens = chunk_tokens
+        self.reduce_tokens = reduce_tokens
+        self.max_workers = max_workers
+        self.max_levels = max_levels
+        self.executor = executor
+
+    def _map(self, template: str, items: List[Dict[str, Any]]) -> List[str]:
+        """Run one prompt per item concurrently, keeping input order."""
+        if len(items) == 1:
+            return [self.generate(template, **items[0])]
+        if self.executor is not None:
+            return self.executor.map(lambda fields: self.generate(template, **fields), items)
+        workers = min(self.max_workers, len(items))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="summarize") as pool:
+            return list(pool.map(lambda fields: self.generate(template, **fields), items))
+
+    def _raise_if_cancelled(self):
+        """Stop between steps once the work this summary belongs to has been cancelled."""
+        if self.executor is not None and self.executor.should_stop():
+            raise CancelledError("Summarization cancelled")
+
+    def reduce(self, parts: List[str], topic: str) -> str:
+        """
+        Merge partial reports hierarchically until they fit reduce_tokens.
+
+        Args:
+            parts: Partial summaries or per-source reports
+            topic: What the reports are about (used in the merge prompt)
+
+        Returns:
+            str: Combined text that fits a single prompt
+        """
+        separator = "\n\n---\n\n"
+        level = 0
+        combined = separator.join(parts)
+        while estimate_tokens(combined) > self.reduce_tokens:
+            self._raise_if_cancelled()
+            if level >= self.max_levels:
+                logger.warning(f"Merge did not converge after {level} levels; truncating")
+                return combined[:self.reduce_tokens * CHARS_PER_TOKEN]
+            pieces = [chunk for part in parts for chunk in chunk_text(part, self.reduce_tokens)]
+            groups = pack_texts(pieces, self.reduce_tokens)
+            level += 1
+            logger.info(f"Merge level {level}: {len(pieces)} parts -> {len(groups)} merged reports")
+            parts = self._map(MERGE_PROMPT, [{'topic': topic, 'data': separator.join(g)} for g in groups])
+            combined = separator.join(parts)
+        return combined
+
+    def summarize(self, text: str, template: str, topic: str = "the source document") -> str:
+        """
+        Apply a single-input prompt template to text of any length.
+
+        Args:
+            text: Input text
+            template: Final prompt template with a {data} placeholder
+            topic: What the text is about (used when merging chunk summaries)
+
+        Returns:
+            str: The model's response to the final prompt
+        """
+        if estimate_tokens(text) <= self.chunk_tokens:
+            return self.generate(template, data=text)
+
+        chunks = chunk_text(text, self.chunk_tokens)
+        logger.info(f"Summarizing {len(chunks)} chunks ({estimate_tokens(text)} tokens)")
+        partials = self._map(
+            CHUNK_SUMMARY_PROMPT,
+            [{'index': i + 1, 'total': len(chunks), 'data': chunk} for i, chunk in enumerate(chunks)]
+        )
+        combined = self.reduce(partials, topic)
+        self._raise_if_cancelled()
+        return self.generate(template, data=combined)
@@ -0,0 +1,193 @@
+import logging
+import asyncio
+import threading
+import weakref
+import aiohttp
+from typing import List, Dict, Optional
+from src.storage.persistent_cache import PersistentCache
+from src.utils.async_utils import on_helper_loop_exit, run_sync
+
+logger = logging.getLogger(__name__)
+
+class URLValidator:
+    """
+    Concurrently checks that search-result URLs are reachable.
+
+    Each URL gets a HEAD request first, falling back to a ranged GET (first KB
+    only) for servers that reject HEAD. Checks stop as soon as enough URLs have
+    validated (outstanding checks are cancelled), and outcomes are cached so
+    repeat prompts skip validation.
+
+    The HTTP session is long-lived, one per event loop, so its connection pool
+    and DNS cache carry over between calls; aclose() releases it.
+    """
+
+    def __init__(self,
+                 timeout: float = 4.0,
+                 max_concurrency: int = 8,
+                 valid_ttl: float = 6 * 3600,
+                 invalid_ttl: float = 15 * 60,
+                 cache: Optional[PersistentCache] = None):
+        """
+        Args:
+            timeout: Per-request timeout in seconds.
+            max_concurrency: Checks in flight at once.
+            valid_ttl: Seconds a positive result is reused.
+            invalid_ttl: Seconds a negative result is reused.
+            cache: Result cache (defaults to the shared persistent cache).
+        """
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.valid_ttl = valid_ttl
+        self.invalid_ttl = invalid_ttl
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        }
+        self.cache = cache
+        if self.cache is None:
+            try:
+                self.cache = PersistentCache(namespace="url_validation", max_entries=20_000)
+            except Exception as e:
+                logger.warning(f"URL validation cache disabled: {e}")
+        self._sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = \
+            weakref.WeakKeyDictionary()
+        self._sessions_lock = threading.Lock()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the running loop's session, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        with self._sessions_lock:
+            session = self._sessions.get(loop)
+            if session is not None and not session.closed:
+                return session
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, ttl_dns_cache=300)
+            session = self._sessions[loop] = aiohttp.ClientSession(connector=connector, headers=self.headers)
+        # run_sync helper loops close when their call returns; release the session first
+        on_helper_loop_exit(self._close_loop_session)
+        return session
+
+    async def _close_loop_session(self):
+        """Close the running loop's session."""
+        with self._sessions_lock:
+            session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+
+    async def aclose(self):
+        """
+        Close the validator's HTTP sessions.
+
+        The running loop's session is closed here; sessions bound to other loops
+        (e.g. run_sync's background loop) are closed on their own loop, without
+        waiting, since that loop may be blocked on this one.
+        """
+        current = asyncio.get_running_loop()
+        with self._sessions_lock:
+            sessions = list(self._sessions.items())
+        for loop, session in sessions:
+            if loop is current:
+                await self._close_loop_session()
+                continue
+            with self._sessions_lock:
+                self._sessions.pop(loop, None)
+            if session.closed:
+                continue
+            if loop.is_running():
+                asyncio.run_coroutine_threadsafe(session.close(), loop)
+            else:
+                logger.warning("URL validation session's event loop is not running; it cannot be closed cleanly")
+
+    async def _check(self, session: aiohttp.ClientSession, url: str, timeout: Optional[float] = None) -> bool:
+        """HEAD first; ranged GET if HEAD is refused or not answered with 200."""
+        timeout = aiohttp.ClientTimeout(total=timeout or self.timeout)
+        try:
+            async with session.head(url, timeout=timeout, allow_redirects=True, ssl=False) as response:
+                if response.status == 200:
+                    return True
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            pass
+        try:
+            headers = {**self.headers, 'Range': 'bytes=0-1023'}
+            async with session.get(url, headers=headers, timeout=timeout, allow_redirects=True, ssl=False) as response:
+                return response.status in (200, 206)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            return False
+
+    def _cached(self, urls: List[str]) -> Dict[str, bool]:
+        if self.cache is None:
+            return {}
+        results = {}
+        for url in urls:
+            cached = self.cache.get(url)
+            if cached is not None:
+                results[url] = cached
+        return results
+
+    def _remember(self, url: str, valid: bool):
+        if self.cache is not None:
+            self.cache.set(url, valid, ttl=self.valid_ttl if valid else self.invalid_ttl)
+
+    async def validate_async(self, urls: List[str], target_count: Optional[int] = None,
+                             timeout: Optional[float] = None) -> List[str]:
+        """
+        Validate URLs concurrently.
+
+        Args:
+            urls: Candidate URLs, in ranked order
+            target_count: Stop once this many URLs are valid (None = check all)
+            timeout: Per-request timeout in seconds (defaults to the validator's)
+
+        Returns:
+            List[str]: Valid URLs, in their original ranked order
+        """
+        # SQLite lookups and writes run on a worker thread, off the event loop
+        results: Dict[str, bool] = await asyncio.to_thread(self._cached, list(dict.fromkeys(urls)))
+        pending = [url for url in dict.fromkeys(urls) if url not in results]
+
+        def enough() -> bool:
+            return target_count is not None and sum(results.values()) >= target_count
+
+        if pending and not enough():
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            session = await self._get_session()
+
+            async def check(url: str):
+                async with semaphore:
+                    return url, await self._check(session, url, timeout)
+
+            tasks = [asyncio.ensure_future(check(url)) for url in pending]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    url, valid = await next_done
+                    results[url] = valid
+                    await asyncio.to_thread(self._remember, url, valid)
+                    logger.info(f"{'✓ Valid' if valid else '✗ Invalid/Blocked'}: {url}")
+                    if enough():
+                        break
+            finally:
+                cancelled = sum(1 for task in tasks if not task.done() and task.cancel())
+                if cancelled:
+                    logger.info(f"Target reached, cancelled {cancelled} outstanding checks")
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        valid_urls = [url for url in dict.fromkeys(urls) if results.get(url)]
+        return valid_urls[:target_count] if target_count is not None else valid_urls
+
+    def validate(self, urls: List[str], target_count: Optional[int] = None,
+                 timeout: Optional[float] = None) -> List[str]:
+        """
+        Synchronous wrapper for validate_async.
+
+        Args:
+            urls: Candidate URLs, in ranked order
+            target_count: Stop once this many URLs are valid
+            timeout: Per-request timeout in seconds (defaults to the validator's)
+
+        Returns:
+            List[str]: Valid URLs, in their original ranked order
+        """
+        return run_sync(self.validate_async(urls, target_count, timeout))
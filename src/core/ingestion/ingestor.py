@@ -1,10 +1,15 @@
 import logging
-from typing import List, Dict, Any
+import os
+import asyncio
+from typing import List, Dict, Any, Optional, Tuple
 import requests
 from bs4 import BeautifulSoup
 from src.axis.scrapers.osint_scraper import Scraper
 from src.axis.parsers.data_parser import Parser
 from src.axis.filters.content_filter import Filter
+from src.core.ingestion.parallel_parser import ParallelParser
+from src.storage.dedup_store import DedupStore, create_dedup_store
+from src.utils.async_utils import run_sync
 
 logger = logging.getLogger(__name__)
 
@@ -13,16 +18,44 @@ class Ingestor:
     Handles data ingestion from various OSINT sources using axis components.
     """
 
-    def __init__(self):
+    def __init__(self, parse_workers: Optional[int] = None, dedup_store: Optional[DedupStore] = None):
+        """
+        Args:
+            parse_workers: Worker processes for parsing (0 parses on the main thread).
+                Defaults to the PARSE_WORKERS environment variable.
+            dedup_store: Store of seen content/URL hashes. Defaults to the store
+                selected by the DEDUP_STORE environment variable.
+        """
         self.scraper = Scraper()
         self.parser = Parser()
         self.filter = Filter()
-        self.seen_hashes = set()
+        # Bounded/persistent replacement for the old ever-growing set of hex hashes
+        self.seen_hashes = dedup_store if dedup_store is not None else create_dedup_store()
+        
+        if parse_workers is None:
+            parse_workers = int(os.getenv("PARSE_WORKERS", "0"))
+        # Optional process pool so parsing large batches isn't capped at one core
+        self.parallel_parser = ParallelParser(max_workers=parse_workers) if parse_workers > 0 else None
 
     def fetch_osint(self, urls: List[str]) -> List[Dict[str, Any]]:
         """
         Fetch data from a list of OSINT URLs using the complete axis pipeline.
 
+        Synchronous wrapper for afetch_osint. The scraper's session stays open
+        between calls; close() releases it.
+
+        Args:
+            urls: List of URLs to scrape/fetch
+
+        Returns:
+            List of processed data objects
+        """
+        return run_sync(self.afetch_osint(urls))
+
+    async def afetch_osint(self, urls: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch, parse and filter OSINT URLs on the running event loop.
+
         Args:
             urls: List of URLs to scrape/fetch
 
@@ -31,74 +64,213 @@ class Ingestor:
         """
         logger.info(f"Fetching data from {len(urls)} URLs using axis pipeline...")
         
-        # Step 1: Scrape using Scrapy
-        raw_results = self.scraper.scrape_osint_sources(urls)
-        logger.info(f"Scraped {len(raw_results)} URLs")
+        # Steps 1-2: Scrape and parse, overlapping parsing with in-flight fetches
+        try:
+            parsed_results = await self._fetch_and_parse_async(urls)
+        except Exception as e:
+            logger.error(f"Async Fetch Failed: {e}")
+            return []
+        logger.info(f"Scraped {len(parsed_results)} URLs")
         
-        # Step 2: Parse and extract article content
-        parsed_results = []
-        for item in raw_results:
-            try:
-                # Check if scraping was successful
+        # Step 3: Filter results
+        return self._filter_results(parsed_results)
+
+    async def _fetch_and_parse_async(self, urls: List[str]) -> List[Dict[str, Any]]:
+        """
+        Parse each page as soon as its fetch completes.
+
+        Args:
+            urls: List of URLs to scrape/fetch
+
+        Returns:
+            Parsed results in the same order as the input URLs
+        """
+        parsed_results: List[Dict[str, Any]] = [None] * len(urls)
+        if self.parallel_parser:
+            await self._fetch_and_parse_parallel(urls, parsed_results)
+            return parsed_results
+        
+        # Parse off the loop so in-flight fetches keep progressing
+        async for item in self.scraper.iter_fetch(urls):
+            parsed_results[item['index']] = await self.aparse(item)
+        return parsed_results
+
+    async def _fetch_and_parse_parallel(self, urls: List[str], parsed_results: List[Dict[str, Any]]):
+        """
+        Ship fetched pages to the parse pool in chunks while fetching continues.
+
+        Args:
+            urls: List of URLs to scrape/fetch
+            parsed_results: Output list, filled in place by input index
+        """
+        chunk_size = self.parallel_parser.chunk_size
+        chunk: List[Tuple[int, str, str]] = []
+        pending = []
+        
+        try:
+            async for item in self.scraper.iter_fetch(urls):
                 if item.get('status_code') == 200 and item.get('html'):
-                    # Extract article content
-                    article_data = self.parser.extract_article_content(
-                        item['html'],
-                        item['url']
-                    )
-                    
-                    # Merge with original item
-                    result = {
-                        'url': item['url'],
-                        'title': article_data['title'],
-                        'content': article_data['content'],
-                        'author': article_data.get('author'),
-                        'publish_date': article_data.get('publish_date'),
-                        'metadata': article_data.get('metadata', {}),
-                        'status': 'success'
-                    }
-                    parsed_results.append(result)
-                    logger.info(f"Successfully parsed: {item['url']}")
+                    chunk.append((item['index'], item['html'], item['url']))
+                    if len(chunk) >= chunk_size:
+                        pending.append(asyncio.ensure_future(self._parse_chunk(chunk)))
+                        chunk = []
                 else:
-                    # Handle failed scrapes
-                    error_msg = item.get('error', f"HTTP {item.get('status_code', 'unknown')}")
-                    parsed_results.append({
-                        'url': item['url'],
-                        'status': 'failed',
-                        'error': error_msg
-                    })
-                    logger.warning(f"Failed to scrape {item['url']}: {error_msg}")
-                    
-            except Exception as e:
-                logger.error(f"Error processing {item.get('url', 'unknown')}: {e}")
-                parsed_results.append({
-                    'url': item.get('url', 'unknown'),
-                    'status': 'error',
-                    'error': str(e)
-                })
-        
-        # Step 3: Filter results
+                    parsed_results[item['index']] = self._parse_item(item)
+            if chunk:
+                pending.append(asyncio.ensure_future(self._parse_chunk(chunk)))
+            
+            for results in await asyncio.gather(*pending):
+                for index, result in results:
+                    parsed_results[index] = result
+        finally:
+            # If fetching failed part-way, don't leave chunk parses running unobserved
+            for future in pending:
+                future.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _parse_chunk(self, chunk: List[Tuple[int, str, str]]) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Parse one chunk in the pool, falling back to a worker thread if the pool fails.
+
+        Args:
+            chunk: List of (index, html, url) tuples
+
+        Returns:
+            List of (index, parsed result) tuples
+        """
+        urls = {index: url for index, _, url in chunk}
+        try:
+            articles = await self.parallel_parser.parse_chunk_async(chunk)
+        except Exception as e:
+            logger.error(f"Parse pool failed, parsing chunk locally: {e}")
+            articles = await asyncio.to_thread(
+                lambda: [(index, self.parser.extract_article_content(html, url)) for index, html, url in chunk]
+            )
+        return [(index, self._build_result(urls[index], article_data)) for index, article_data in articles]
+
+    async def aparse(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Parse one scraped result without blocking the event loop.
+
+        Pages go to the parse pool when one is configured, otherwise to a thread.
+
+        Args:
+            item: Scraped data dictionary
+
+        Returns:
+            Parsed data object with a 'status' field
+        """
+        if self.parallel_parser and item.get('status_code') == 200 and item.get('html'):
+            [(_, parsed)] = await self._parse_chunk([(0, item['html'], item['url'])])
+            return parsed
+        return await asyncio.to_thread(self._parse_item, item)
+
+    def _parse_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Turn one scraped result into a parsed article (or a failure record).
+
+        Args:
+            item: Scraped data dictionary
+
+        Returns:
+            Parsed data object with a 'status' field
+        """
+        try:
+            # Check if scraping was successful
+            if item.get('status_code') == 200 and item.get('html'):
+                # Extract article content
+                article_data = self.parser.extract_article_content(
+                    item['html'],
+                    item['url']
+                )
+                return self._build_result(item['url'], article_data)
+            
+            # Handle failed scrapes
+            error_msg = item.get('error', f"HTTP {item.get('status_code', 'unknown')}")
+            logger.warning(f"Failed to scrape {item['url']}: {error_msg}")
+            return {
+                'url': item['url'],
+                'status': 'failed',
+                'error': error_msg
+            }
+                
+        except Exception as e:
+            logger.error(f"Error processing {item.get('url', 'unknown')}: {e}")
+            return {
+                'url': item.get('url', 'unknown'),
+                'status': 'error',
+                'error': str(e)
+            }
+
+    def _build_result(self, url: str, article_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Merge extracted article data into a successful ingestion result.
+
+        Args:
+            url: Source URL
+            article_data: Output of Parser.extract_article_content
+
+        Returns:
+            Parsed data object
+        """
+        logger.info(f"Successfully parsed: {url}")
+        return {
+            'url': url,
+            'title': article_data['title'],
+            'content': article_data['content'],
+            'author': article_data.get('author'),
+            'publish_date': article_data.get('publish_date'),
+            'metadata': article_data.get('metadata', {}),
+            'status': 'success'
+        }
+
+    def _filter_results(self, parsed_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Apply quality and duplicate filters to parsed results.
+
+        Args:
+            parsed_results: Parsed data objects
+
+        Returns:
+            Successful items that passed the filters, plus failed items for reporting
+        """
         filtered_results = []
         for item in parsed_results:
-            # Only filter successful items
-            if item.get('status') == 'success':
-                # Apply quality filter
-                if self.filter.filter_by_quality(item):
-                    # Check for duplicates
-                    if not self.filter.is_duplicate(item, self.seen_hashes):
-                        filtered_results.append(item)
-                    else:
-                        logger.debug(f"Filtered duplicate: {item['url']}")
-                else:
-                    logger.debug(f"Filtered low quality: {item['url']}")
-            else:
-                # Keep failed items for reporting
+            # Only filter successful items; failed ones are kept for reporting
+            if item.get('status') != 'success' or self.accept(item):
                 filtered_results.append(item)
         
         logger.info(f"Filtered to {len([r for r in filtered_results if r.get('status') == 'success'])} quality results")
         
         return filtered_results
 
+    def accept(self, item: Dict[str, Any]) -> bool:
+        """
+        Apply the quality and duplicate filters to one successfully parsed item.
+
+        Accepted items are recorded in the dedup store, so a second copy is rejected.
+
+        Args:
+            item: Parsed data object
+
+        Returns:
+            True if the item should be kept
+        """
+        if not self.filter.filter_by_quality(item):
+            logger.debug(f"Filtered low quality: {item['url']}")
+            return False
+        if self.filter.is_duplicate(item, self.seen_hashes):
+            logger.debug(f"Filtered duplicate: {item['url']}")
+            return False
+        return True
+
+    def close(self):
+        """Release the parse pool, flush the dedup store and close the scraper's session."""
+        self.scraper.close()
+        if self.parallel_parser:
+            self.parallel_parser.close()
+        self.seen_hashes.close()
+
     def normalize_data(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Normalize raw data into a standard format.
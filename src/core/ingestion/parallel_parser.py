@@ -0,0 +1,109 @@
+import logging
+import os
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+from src.axis.parsers.data_parser import Parser
+
+logger = logging.getLogger(__name__)
+
+# One Parser per worker process, created by the pool initializer
+_worker_parser: Optional[Parser] = None
+
+def _init_worker(features: Optional[str]):
+    """Process-pool initializer: build the worker's Parser once."""
+    global _worker_parser
+    _worker_parser = Parser(features=features)
+
+def _parse_chunk(chunk: List[Tuple[int, str, str]]) -> List[Tuple[int, Dict[str, Any]]]:
+    """
+    Parse a chunk of documents inside a worker process.
+
+    Args:
+        chunk: List of (index, html, url) tuples
+
+    Returns:
+        List of (index, article_data) tuples
+    """
+    parser = _worker_parser or Parser()
+    return [(index, parser.extract_article_content(html, url)) for index, html, url in chunk]
+
+class ParallelParser:
+    """
+    Runs Parser.extract_article_content across a pool of worker processes.
+
+    Documents are shipped in chunks to amortise pickling and IPC overhead.
+    Results can be consumed in input order or as soon as each chunk finishes.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, chunk_size: int = 8, features: Optional[str] = None):
+        """
+        Args:
+            max_workers: Worker processes (defaults to the CPU count).
+            chunk_size: Documents sent to a worker per task.
+            features: BeautifulSoup tree builder used by the workers.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self.features = features
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """The worker pool, started on first use."""
+        if self._executor is None:
+            logger.info(f"Starting parse pool with {self.max_workers} workers")
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self.features,),
+            )
+        return self._executor
+
+    def _chunks(self, documents: Iterable[Tuple[str, str]]) -> Iterator[List[Tuple[int, str, str]]]:
+        chunk = []
+        for index, (html, url) in enumerate(documents):
+            chunk.append((index, html, url))
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def parse_batch(self, documents: Iterable[Tuple[str, str]], ordered: bool = True) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Parse many documents in parallel.
+
+        Args:
+            documents: Iterable of (html, url) pairs
+            ordered: If True, yield in input order; otherwise as chunks complete
+
+        Yields:
+            (index, article_data) tuples, where index is the document's input position
+        """
+        if ordered:
+            for results in self.executor.map(_parse_chunk, self._chunks(documents)):
+                yield from results
+        else:
+            futures = [self.executor.submit(_parse_chunk, chunk) for chunk in self._chunks(documents)]
+            for future in as_completed(futures):
+                yield from future.result()
+
+    async def parse_chunk_async(self, chunk: List[Tuple[int, str, str]]) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Parse one chunk in the pool without blocking the event loop.
+
+        Args:
+            chunk: List of (index, html, url) tuples
+
+        Returns:
+            List of (index, article_data) tuples
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, _parse_chunk, chunk)
+
+    def close(self):
+        """Shut down the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -5,6 +5,7 @@ from typing import List, Dict, Any
 
 from src.utils.performance_monitor import monitor_performance
 from src.core.analysis.entity_extractor import EntityExtractor
+from src.utils.urls import document_id
 
 # Global list to collect all entities across sources
 all_entities: List[Dict[str, str]] = []
@@ -30,7 +31,7 @@ def process_intelligence(target_urls: List[str], analyzer, preprocessor, pinecon
         all_entities.extend(entities)
         # Store in Pinecone (optional)
         try:
-            vector_id = f"doc_{hash(url)}"
+            vector_id = document_id(url)
             metadata = {"url": url, "summary": summary[:1000]}
             pinecone.upsert_vectors([(vector_id, cleaned_text[:8000], metadata)])
         except Exception as e:
@@ -0,0 +1,341 @@
+import asyncio
+import logging
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import CancelledError
+from typing import Any, Dict, List, Optional
+
+from src.core.analysis.llm_executor import cancel_scope
+from src.utils.urls import document_id
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('fetch', 'parse', 'filter', 'clean', 'summarize', 'upsert')
+
+# Workers per stage. Fetch is I/O bound (the scraper's scheduler still caps sockets per
+# host), parse runs off the event loop, and filter and clean run on the loop itself, so
+# extra workers there would only interleave. Summarize defaults to the LLM executor's
+# in-flight cap.
+DEFAULT_WORKERS = {'fetch': 32, 'parse': 2, 'filter': 1, 'clean': 1, 'upsert': 1}
+
+# Queue marker telling a stage worker that its upstream stage has finished
+_DONE = object()
+
+
+def parse_worker_spec(spec: Optional[str]) -> Dict[str, int]:
+    """
+    Parse a "stage=count,stage=count" worker override string.
+
+    Args:
+        spec: The override string (e.g. "fetch=64,summarize=8"); unknown stages are ignored.
+
+    Returns:
+        Dict[str, int]: Worker counts by stage name
+    """
+    workers = {}
+    for part in (spec or "").split(","):
+        name, _, count = part.partition("=")
+        name = name.strip()
+        if name in STAGES and count.strip().isdigit():
+            workers[name] = max(1, int(count))
+    return workers
+
+
+class StreamingPipeline:
+    """
+    Runs Core's ingest-to-summary work as a stage graph connected by bounded queues:
+
+        fetch -> parse -> filter -> clean -> summarize -> upsert
+
+    Every document moves to the next stage as soon as the previous one is done
+    with it, so the first summaries arrive while later pages are still being
+    fetched, and one slow URL only delays itself. Bounded queues give
+    backpressure: when the LLM is the bottleneck, fetching pauses instead of
+    piling up pages in memory.
+
+    Each run has its own cancel token: if the run fails or is cancelled, its
+    queued model calls are dropped and running ones stop at their next
+    checkpoint, without affecting other runs sharing the LLM executor.
+    """
+
+    def __init__(self, core, workers: Optional[Dict[str, int]] = None, queue_size: Optional[int] = None,
+                 upsert_batch_size: Optional[int] = None, summary_wait: Optional[float] = None):
+        """
+        Args:
+            core: The Core whose ingestor, preprocessor, analyzer and vector_db are used.
+            workers: Per-stage worker overrides. Defaults come from DEFAULT_WORKERS and the
+                analyzer's LLM executor, then the PIPELINE_WORKERS environment variable
+                ("fetch=64,summarize=8").
+            queue_size: Capacity of each inter-stage queue (PIPELINE_QUEUE_SIZE, default 64).
+            upsert_batch_size: Vectors per upsert call (PIPELINE_UPSERT_BATCH, default 50).
+            summary_wait: Seconds a summarize worker waits for more documents to fill a
+                batched request (PIPELINE_SUMMARY_WAIT, default 0.2).
+        """
+        self.core = core
+        self.workers = {**DEFAULT_WORKERS, 'summarize': core.analyzer.llm_executor.max_in_flight,
+                        **parse_worker_spec(os.getenv("PIPELINE_WORKERS")), **(workers or {})}
+        self.queue_size = queue_size or int(os.getenv("PIPELINE_QUEUE_SIZE", "64"))
+        self.upsert_batch_size = upsert_batch_size or int(os.getenv("PIPELINE_UPSERT_BATCH", "50"))
+        self.summary_wait = summary_wait if summary_wait is not None else float(os.getenv("PIPELINE_SUMMARY_WAIT", "0.2"))
+        self.metrics: Dict[str, Any] = {}
+
+    async def run(self, urls: List[str], query: Optional[str] = None,
+                  url_queries: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
+        """
+        Stream URLs through every stage.
+
+        Args:
+            urls: Source URLs
+            query: Research query used for the relevance gate and upsert metadata
+            url_queries: For multi-query batches, the queries each URL was planned for.
+                A page is kept if it is relevant to any of them, and each processed item
+                carries 'relevance_by_query'. Takes precedence over query.
+
+        Returns:
+            Dict[str, Any]: 'processed_items' and 'summaries' in input order, plus 'metrics'
+        """
+        start = time.perf_counter()
+        self.metrics = {
+            'stages': {name: {'in': 0, 'out': 0, 'busy_s': 0.0} for name in STAGES},
+            'max_queue_depth': {},
+            'time_to_first_summary_s': None,
+        }
+        self._start = start
+        self._query = query
+        self._url_queries = url_queries
+        self._results: List[Dict[str, Any]] = []
+
+        queues = {name: asyncio.Queue(maxsize=self.queue_size) for name in STAGES}
+        summary_batch_size = self._summary_batch_size()
+        handlers = {
+            'fetch': (self._fetch, 1, 0.0),
+            'parse': (self._parse, 1, 0.0),
+            'filter': (self._filter, 1, 0.0),
+            'clean': (self._clean, self.queue_size, 0.0),
+            # Documents reach summarize one at a time; waiting briefly lets them share a request
+            'summarize': (self._summarize, summary_batch_size, self.summary_wait if summary_batch_size > 1 else 0.0),
+            'upsert': (self._upsert, self.upsert_batch_size, 0.0),
+        }
+
+        # Stage tasks (and the threads they start) inherit the run's cancel token
+        with cancel_scope() as token:
+            tasks = [asyncio.ensure_future(self._feed(urls, queues['fetch']))]
+            for i, name in enumerate(STAGES):
+                outbox = queues[STAGES[i + 1]] if i + 1 < len(STAGES) else None
+                next_workers = self.workers[STAGES[i + 1]] if outbox is not None else 0
+                handler, batch_size, wait = handlers[name]
+                tasks.append(asyncio.ensure_future(
+                    self._stage(name, queues[name], outbox, next_workers, handler, batch_size, wait)
+                ))
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                self.core.analyzer.llm_executor.cancel_pending(token)
+                for task in tasks:
+                    task.cancel()
+                raise
+
+        self._results.sort(key=lambda item: item['index'])
+        self.metrics['elapsed_s'] = round(time.perf_counter() - start, 3)
+        self.metrics['workers'] = dict(self.workers)
+        self.metrics['llm'] = self.core.analyzer.llm_executor.get_stats()
+        ttfs = self.metrics['time_to_first_summary_s']
+        logger.info(f"Streaming pipeline finished {len(self._results)}/{len(urls)} sources in "
+                    f"{self.metrics['elapsed_s']}s (first summary after {ttfs}s)")
+        return {
+            'processed_items': [
+                {key: item[key] for key in ('url', 'summary', 'relevance', 'relevance_by_query') if key in item}
+                for item in self._results
+            ],
+            'summaries': [f"Source: {item['url']}\n{item['summary']}" for item in self._results],
+            'metrics': self.metrics,
+        }
+
+    async def _feed(self, urls: List[str], queue: asyncio.Queue):
+        for index, url in enumerate(urls):
+            await self._put(queue, 'fetch', {'index': index, 'url': url})
+        for _ in range(self.workers['fetch']):
+            await queue.put(_DONE)
+
+    async def _put(self, queue: asyncio.Queue, name: str, item: Dict[str, Any]):
+        await queue.put(item)
+        self.metrics['stages'][name]['in'] += 1
+        depth = self.metrics['max_queue_depth']
+        depth[name] = max(depth.get(name, 0), queue.qsize())
+
+    @staticmethod
+    async def _take(queue: asyncio.Queue, batch_size: int, wait: float = 0.0) -> Optional[List[Dict[str, Any]]]:
+        """
+        Wait for one item, then take whatever else is already queued, up to batch_size.
+
+        Args:
+            queue: The stage's input queue
+            batch_size: Most items to take
+            wait: Seconds after the first item to keep waiting for more while the batch is short
+
+        Returns:
+            The items, or None once the upstream stage has finished
+        """
+        first = await queue.get()
+        if first is _DONE:
+            return None
+        items = [first]
+        deadline = time.monotonic() + wait
+        while len(items) < batch_size:
+            if queue.empty():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                getter = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait({getter}, timeout=remaining)
+                if not done:
+                    # A cancelled get leaves any item it was woken for in the queue
+                    getter.cancel()
+                    await asyncio.wait({getter})
+                    if getter.cancelled():
+                        break
+                item = getter.result()
+            else:
+                item = queue.get_nowait()
+            if item is _DONE:
+                # Leave the marker for this worker's next call (a slot was just freed)
+                queue.put_nowait(item)
+                break
+            items.append(item)
+        return items
+
+    async def _stage(self, name: str, inbox: asyncio.Queue, outbox: Optional[asyncio.Queue],
+                     next_workers: int, handler, batch_size: int, wait: float = 0.0):
+        """Run a stage's workers until its input is exhausted, then close the next queue."""
+        stats = self.metrics['stages'][name]
+        next_name = STAGES[STAGES.index(name) + 1] if outbox is not None else None
+        # Workers that wait for a fuller batch take turns collecting, so they do not split one
+        collecting = asyncio.Lock()
+
+        async def worker():
+            while True:
+                if wait > 0:
+                    async with collecting:
+                        items = await self._take(inbox, batch_size, wait)
+                else:
+                    items = await self._take(inbox, batch_size)
+                if items is None:
+                    return
+                started = time.perf_counter()
+                try:
+                    results = await handler(items)
+                except CancelledError:
+                    # The run was cancelled (e.g. Core.aclose()): stop instead of passing on partial work
+                    raise
+                except Exception as e:
+                    logger.error(f"{name} stage failed for {len(items)} item(s): {e}")
+                    results = []
+                stats['busy_s'] += time.perf_counter() - started
+                stats['out'] += len(results)
+                if outbox is not None:
+                    for result in results:
+                        await self._put(outbox, next_name, result)
+
+        await asyncio.gather(*[worker() for _ in range(self.workers[name])])
+        stats['busy_s'] = round(stats['busy_s'], 3)
+        if outbox is not None:
+            for _ in range(next_workers):
+                await outbox.put(_DONE)
+
+    async def _fetch(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        scraper = self.core.ingestor.scraper
+        results = []
+        for item in items:
+            fetched = await scraper.fetch(item['url'])
+            fetched['index'] = item['index']
+            results.append(fetched)
+        return results
+
+    async def _parse(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        results = []
+        for item in items:
+            parsed = await self.core.ingestor.aparse(item)
+            if parsed.get('status') == 'success':
+                parsed['index'] = item['index']
+                results.append(parsed)
+        return results
+
+    async def _filter(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Runs on the loop, so dedup check-and-record is never interleaved
+        return [item for item in items if self.core.ingestor.accept(item)]
+
+    async def _clean(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        documents = []
+        for item in items:
+            content = self.core.preprocessor.clean_text(item.get('content', ""))
+            if content:
+                documents.append({'index': item['index'], 'url': item['url'], 'title': item.get('title') or "",
+                                  'content': content, 'relevance': 1.0})
+        if not documents:
+            return documents
+        # Drop off-topic pages before any LLM call. Micro-batches depend on fetch timing, so
+        # pages are scored without batch IDF: a page passes or fails the same way every run
+        if self._url_queries:
+            return self._gate_by_planned_queries(documents)
+        if self._query:
+            documents = self.core.ingestor.filter.filter_by_relevance(
+                documents, self._query, self.core.relevance_threshold, use_batch_idf=False
+            )
+        return documents
+
+    def _gate_by_planned_queries(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Score each page against every query it was planned for; keep it if any score passes."""
+        by_query: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for document in documents:
+            document['relevance_by_query'] = {}
+            for query in self._url_queries.get(document['url'], ()):
+                by_query[query].append(document)
+        for query, group in by_query.items():
+            scores = self.core.analyzer.score_relevance_batch(group, query, use_batch_idf=False)
+            for document, score in zip(group, scores):
+                document['relevance_by_query'][query] = score
+        kept = []
+        for document in documents:
+            document['relevance'] = max(document['relevance_by_query'].values(), default=1.0)
+            if document['relevance'] >= self.core.relevance_threshold:
+                kept.append(document)
+        return kept
+
+    def _summary_batch_size(self) -> int:
+        analyzer = self.core.analyzer
+        return analyzer.batch_max_documents if analyzer.batch_summaries else 1
+
+    async def _summarize(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        try:
+            # Not on an LLM worker: the batch and chunk requests it makes each take their own slot
+            summaries = await asyncio.to_thread(
+                self.core.analyzer.generate_summaries_batch, [item['content'] for item in items]
+            )
+        except CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Summary generation failed: {e}")
+            summaries = ["Error generating summary."] * len(items)
+        if self.metrics['time_to_first_summary_s'] is None:
+            self.metrics['time_to_first_summary_s'] = round(time.perf_counter() - self._start, 3)
+        for item, summary in zip(items, summaries):
+            item['summary'] = summary
+        return items
+
+    async def _upsert(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        vectors = []
+        for item in items:
+            metadata = {"url": item['url'], "query": self._query}
+            if self._url_queries:
+                metadata["query"] = self._url_queries.get(item['url'], [])
+            vectors.append((document_id(item['url']), item['content'], metadata))
+        try:
+            await asyncio.to_thread(self.core.vector_db.upsert_vectors, vectors)
+        except Exception as e:
+            logger.error(f"Upsert of {len(vectors)} vectors failed: {e}")
+        for item in items:
+            # Page text is in the vector store now; only the summary is reported
+            item.pop('content', None)
+            self._results.append(item)
+        return items
@@ -1,7 +1,10 @@
+import hashlib
 import logging
 import os
 from typing import List, Dict, Any, Optional
 
+from src.storage.persistent_cache import PersistentCache
+
 try:
     from pinecone import Pinecone
 except ImportError:
@@ -9,25 +12,60 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Longest text sent per record; longer documents are truncated before embedding
+MAX_RECORD_CHARS = 8000
+
+def content_digest(text: str) -> str:
+    """SHA-256 of the text as it is stored (after truncation)."""
+    return hashlib.sha256(text[:MAX_RECORD_CHARS].encode('utf-8')).hexdigest()
+
 class PineconeHandler:
     """
     Wrapper class for Pinecone Vector Database interactions.
     Uses Pinecone v8 inference API with llama text-embed-v2.
+
+    Unchanged documents are skipped using a local registry of stored IDs and
+    content digests, keyed by index and namespace. The registry only knows what
+    this machine upserted: it is cleared when the index turns out to be
+    recreated (its host changed) or the namespace is empty, and
+    VECTOR_REGISTRY_RESET=1 clears it at startup. Records deleted from the
+    index by other means are not noticed until the registry entry expires
+    (VECTOR_REGISTRY_TTL).
     """
 
-    def __init__(self, index_name: str = "abc", namespace: str = "intelligence"):
+    # Registry entry holding the host of the index the entries were written to
+    INDEX_HOST_KEY = "__index_host__"
+
+    def __init__(self, index_name: str = "abc", namespace: str = "intelligence",
+                 registry: Optional[PersistentCache] = None):
         """
         Initialize Pinecone connection.
         
         Args:
             index_name (str): Name of the Pinecone index to use.
             namespace (str): Namespace for organizing vectors.
+            registry (PersistentCache): Record of stored IDs and content digests, used to
+                skip unchanged documents. Defaults to a persistent cache per index and
+                namespace; VECTOR_REGISTRY=off disables skipping. Entries are keyed by
+                index and namespace, so one registry can be shared.
         """
         self.api_key = os.getenv("PINECONE_API_KEY")
         self.index_name = index_name
         self.namespace = namespace
         self.pc = None
         self.index = None
+        self.skipped_unchanged = 0
+        
+        self.registry = registry
+        if self.registry is None and os.getenv("VECTOR_REGISTRY", "on").lower() != "off":
+            try:
+                self.registry = PersistentCache(
+                    namespace=f"vector_index:{index_name}:{namespace}",
+                    default_ttl=float(os.getenv("VECTOR_REGISTRY_TTL", str(30 * 24 * 3600))),
+                    max_entries=int(os.getenv("VECTOR_REGISTRY_MAX_ENTRIES", "200000")),
+                )
+            except Exception as e:
+                logger.warning(f"Vector registry disabled: {e}")
         
         if self.api_key:
             self._connect()
@@ -49,15 +87,84 @@ class PineconeHandler:
             else:
                 self.index = self.pc.Index(self.index_name)
                 logger.info(f"Connected to Pinecone index: {self.index_name}")
+                self._validate_registry()
         except Exception as e:
             logger.error(f"Failed to connect to Pinecone: {e}")
 
+    def _registry_key(self, doc_id: str) -> str:
+        return f"{self.index_name}/{self.namespace}/{doc_id}"
+
+    def reset_registry(self):
+        """Forget every stored digest, so the next upserts re-embed all documents."""
+        if self.registry is not None:
+            self.registry.clear()
+
+    def _validate_registry(self):
+        """Clear the registry if it cannot describe the connected index."""
+        if self.registry is None:
+            return
+        if os.getenv("VECTOR_REGISTRY_RESET", "").lower() in ("1", "true", "on"):
+            logger.info("VECTOR_REGISTRY_RESET set; clearing vector registry")
+            self.reset_registry()
+        try:
+            host = self.pc.describe_index(self.index_name).host
+            stats = self.index.describe_index_stats()
+            namespaces = stats.get('namespaces') or {}
+            vector_count = (namespaces.get(self.namespace) or {}).get('vector_count', 0)
+        except Exception as e:
+            logger.warning(f"Could not check vector registry against the index: {e}")
+            return
+        key = self._registry_key(self.INDEX_HOST_KEY)
+        recorded = self.registry.get(key)
+        if recorded is not None and recorded != host:
+            logger.info(f"Index {self.index_name} was recreated; clearing vector registry")
+            self.reset_registry()
+        elif not vector_count and len(self.registry) > 1:
+            logger.info(f"Namespace '{self.namespace}' is empty; clearing vector registry")
+            self.reset_registry()
+        self.registry.set(key, host)
+
+    def is_stored(self, doc_id: str, text: str) -> bool:
+        """
+        Check whether a document is already stored with exactly this text.
+
+        Args:
+            doc_id (str): The document's stable ID.
+            text (str): The text that would be upserted.
+
+        Returns:
+            bool: True if an upsert would change nothing.
+        """
+        if self.registry is None:
+            return False
+        return self.registry.get(self._registry_key(doc_id)) == content_digest(text)
+
+    def filter_unchanged(self, vectors: List[tuple]) -> List[tuple]:
+        """
+        Drop vectors that are already stored unchanged, and repeated IDs within the batch.
+
+        Args:
+            vectors (List[tuple]): List of (id, text, metadata) tuples.
+
+        Returns:
+            List[tuple]: The vectors that still need embedding and upserting.
+        """
+        latest = {item[0]: item for item in vectors if len(item) == 3}
+        changed = [item for doc_id, item in latest.items() if not self.is_stored(doc_id, item[1])]
+        skipped = len(latest) - len(changed)
+        if skipped:
+            self.skipped_unchanged += skipped
+            logger.info(f"Skipping {skipped}/{len(latest)} documents already stored unchanged")
+        return changed
+
     def upsert_vectors(self, vectors: List[tuple]) -> bool:
         """
         Upsert vectors into the index using Pinecone's inference API.
         
         Uses index.upsert_records() with text that gets embedded automatically
-        by the llama-text-embed-v2 model.
+        by the llama-text-embed-v2 model. Documents already stored with the same
+        ID and content are skipped, so re-ingesting unchanged pages costs no
+        embedding or write.
 
         Args:
             vectors (List[tuple]): List of (id, text, metadata) tuples.
@@ -69,6 +176,10 @@ class PineconeHandler:
             logger.warning("Pinecone index not initialized.")
             return False
         
+        vectors = self.filter_unchanged(vectors)
+        if not vectors:
+            return True
+        
         try:
             # Format data for Pinecone v8 inference API
             # Format: [{"id": "...", "text": "..."}]
@@ -78,7 +189,7 @@ class PineconeHandler:
                 if len(item) == 3:
                     doc_id, text, metadata = item
                     # Limit text length to avoid API errors
-                    truncated_text = text[:8000] if len(text) > 8000 else text
+                    truncated_text = text[:MAX_RECORD_CHARS]
                     
                     # Create record without metadata first (simpler)
                     record = {
@@ -96,6 +207,9 @@ class PineconeHandler:
             )
             
             logger.info(f"✓ Upserted {len(records)} records to Pinecone namespace '{self.namespace}'.")
+            if self.registry is not None:
+                for record in records:
+                    self.registry.set(self._registry_key(record["id"]), content_digest(record["text"]))
             return True
         except Exception as e:
             logger.error(f"Error upserting to Pinecone: {e}")
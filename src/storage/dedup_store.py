@@ -0,0 +1,339 @@
+import logging
+import os
+import math
+import mmap
+import struct
+import hashlib
+from abc import ABC, abstractmethod
+from typing import List, Optional, Set, Union
+
+logger = logging.getLogger(__name__)
+
+Key = Union[str, bytes]
+
+DEFAULT_CAPACITY = 5_000_000
+
+class DedupStore(ABC):
+    """
+    Base class for stores of seen content/URL hashes.
+
+    Stores support `key in store` and `store.add(key)`, so they can be used
+    anywhere a plain set of hash strings was used before. Keys are reduced to
+    16-byte digests internally.
+    """
+
+    @staticmethod
+    def _digest(key: Key) -> bytes:
+        if isinstance(key, str):
+            key = key.encode('utf-8')
+        return hashlib.blake2b(key, digest_size=16).digest()
+
+    @abstractmethod
+    def __contains__(self, key: Key) -> bool:
+        pass
+
+    @abstractmethod
+    def add(self, key: Key):
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    def close(self):
+        """Flush and release any resources held by the store."""
+        pass
+
+
+class DigestSetStore(DedupStore):
+    """
+    Exact set of 16-byte binary digests.
+
+    With a capacity, memory is bounded by keeping two generations: once the
+    current generation is full it becomes the previous one and the old previous
+    generation is dropped, so the most recently seen keys are always retained.
+    """
+
+    def __init__(self, capacity: Optional[int] = None):
+        """
+        Args:
+            capacity: Approximate maximum number of keys retained (None = unbounded).
+        """
+        self.capacity = capacity
+        self._current: Set[bytes] = set()
+        self._previous: Set[bytes] = set()
+
+    def __contains__(self, key: Key) -> bool:
+        digest = self._digest(key)
+        return digest in self._current or digest in self._previous
+
+    def add(self, key: Key):
+        self._current.add(self._digest(key))
+        if self.capacity and len(self._current) >= max(1, self.capacity // 2):
+            self._previous = self._current
+            self._current = set()
+
+    def __len__(self) -> int:
+        return len(self._current) + len(self._previous)
+
+
+class _BloomBits:
+    """Bloom filter bit logic over any writable buffer (bytearray or mmap)."""
+
+    def __init__(self, buffer, offset: int, num_bits: int, num_hashes: int):
+        self.buffer = buffer
+        self.offset = offset
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+
+    @staticmethod
+    def size_for(capacity: int, error_rate: float):
+        """Return (num_bits, num_hashes) for a capacity and false-positive rate."""
+        num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        num_hashes = max(1, int(round(num_bits / capacity * math.log(2))))
+        return num_bits, num_hashes
+
+    def _positions(self, digest: bytes) -> List[int]:
+        # Kirsch-Mitzenmacher double hashing from one 128-bit digest
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def contains(self, digest: bytes) -> bool:
+        buffer, offset = self.buffer, self.offset
+        return all(buffer[offset + (p >> 3)] & (1 << (p & 7)) for p in self._positions(digest))
+
+    def add(self, digest: bytes) -> bool:
+        """Set the digest's bits; return True if any bit was newly set."""
+        buffer, offset = self.buffer, self.offset
+        added = False
+        for p in self._positions(digest):
+            index, bit = offset + (p >> 3), 1 << (p & 7)
+            if not buffer[index] & bit:
+                buffer[index] |= bit
+                added = True
+        return added
+
+
+class ScalableBloomFilter(DedupStore):
+    """
+    In-memory scalable Bloom filter.
+
+    Starts with one filter sized for initial_capacity; when it fills up a new,
+    larger filter with a tighter error rate is added, so the compound
+    false-positive rate stays below error_rate. The number of filters grows
+    logarithmically with the number of keys, and total memory linearly with it.
+
+    With a capacity, memory is bounded the way DigestSetStore bounds it: once
+    the current generation of filters holds capacity // 2 keys it becomes the
+    previous generation and the old previous one is dropped.
+    """
+
+    def __init__(self, initial_capacity: int = 10_000, error_rate: float = 0.001,
+                 growth: int = 2, tightening: float = 0.9, capacity: Optional[int] = None):
+        """
+        Args:
+            initial_capacity: Keys the first filter holds before a new one is added.
+            error_rate: Target overall false-positive rate.
+            growth: Capacity multiplier for each new filter.
+            tightening: Error-rate multiplier for each new filter.
+            capacity: Approximate maximum number of keys retained (None = unbounded).
+        """
+        self.initial_capacity = initial_capacity
+        # Two generations are checked, so each gets half the error budget
+        self.error_rate = error_rate / 2 if capacity else error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self.capacity = capacity
+        self._previous: List[_BloomBits] = []
+        self._previous_count = 0
+        self._start_generation()
+
+    def _start_generation(self):
+        self._filters: List[_BloomBits] = []
+        self._capacities: List[int] = []
+        self._counts: List[int] = []
+        self._add_filter()
+
+    def _add_filter(self):
+        index = len(self._filters)
+        capacity = self.initial_capacity * (self.growth ** index)
+        # First filter gets error_rate * (1 - r); the geometric series sums to error_rate
+        error_rate = self.error_rate * (1 - self.tightening) * (self.tightening ** index)
+        num_bits, num_hashes = _BloomBits.size_for(capacity, error_rate)
+        self._filters.append(_BloomBits(bytearray((num_bits + 7) // 8), 0, num_bits, num_hashes))
+        self._capacities.append(capacity)
+        self._counts.append(0)
+
+    def __contains__(self, key: Key) -> bool:
+        digest = self._digest(key)
+        return any(f.contains(digest) for f in reversed(self._filters)) or \
+            any(f.contains(digest) for f in self._previous)
+
+    def add(self, key: Key):
+        digest = self._digest(key)
+        if any(f.contains(digest) for f in self._filters):
+            return
+        if self.capacity and sum(self._counts) >= max(1, self.capacity // 2):
+            self._previous, self._previous_count = self._filters, sum(self._counts)
+            self._start_generation()
+        elif self._counts[-1] >= self._capacities[-1]:
+            self._add_filter()
+        self._filters[-1].add(digest)
+        self._counts[-1] += 1
+
+    def __len__(self) -> int:
+        return sum(self._counts) + self._previous_count
+
+    @property
+    def size_bytes(self) -> int:
+        """Memory used by the filter bit arrays."""
+        return sum(len(f.buffer) for f in self._filters + self._previous)
+
+
+class _BloomFile:
+    """One Bloom filter generation stored in a memory-mapped file."""
+
+    MAGIC = b'T1BLOOM1'
+    HEADER = struct.Struct('<8sQQQ')  # magic, num_bits, num_hashes, count
+
+    def __init__(self, path: str, capacity: int, error_rate: float):
+        self.path = path
+        num_bits, num_hashes = _BloomBits.size_for(capacity, error_rate)
+        if not os.path.exists(path):
+            with open(path, 'wb') as f:
+                f.write(self.HEADER.pack(self.MAGIC, num_bits, num_hashes, 0))
+                f.truncate(self.HEADER.size + (num_bits + 7) // 8)
+
+        self._file = open(path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, num_bits, num_hashes, self.count = self.HEADER.unpack_from(self._map, 0)
+        if magic != self.MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a dedup store file")
+        # Existing files keep the parameters they were created with
+        self._bits = _BloomBits(self._map, self.HEADER.size, num_bits, num_hashes)
+
+    def contains(self, digest: bytes) -> bool:
+        return self._bits.contains(digest)
+
+    def add(self, digest: bytes):
+        if self._bits.add(digest):
+            self.count += 1
+            self.HEADER.pack_into(self._map, 0, self.MAGIC, self._bits.num_bits, self._bits.num_hashes, self.count)
+
+    def flush(self):
+        if self._map is not None:
+            self._map.flush()
+
+    def close(self):
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class MmapBloomStore(DedupStore):
+    """
+    Bloom filter stored in memory-mapped files.
+
+    The files survive restarts, so dedup holds across runs, and their size is
+    fixed at creation so memory use stays flat no matter how long the process
+    crawls. Like DigestSetStore, keys are kept in two generations: once the
+    current file holds capacity // 2 keys it replaces the previous file
+    (`<path>.prev`) and a fresh one is started, so the false-positive rate
+    stays near error_rate and the most recently seen keys are always retained.
+    """
+
+    def __init__(self, path: str, capacity: int = DEFAULT_CAPACITY, error_rate: float = 0.001):
+        """
+        Args:
+            path: File backing the current generation (created if missing).
+            capacity: Approximate maximum number of keys retained.
+            error_rate: Target false-positive rate across both generations.
+        """
+        self.path = path
+        self.previous_path = path + '.prev'
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.generation_capacity = max(1, capacity // 2)
+        # Two generations are checked, so each gets half the error budget
+        self.error_rate = error_rate / 2
+        self._current = _BloomFile(path, self.generation_capacity, self.error_rate)
+        self._previous = None
+        if os.path.exists(self.previous_path):
+            try:
+                self._previous = _BloomFile(self.previous_path, self.generation_capacity, self.error_rate)
+            except ValueError:
+                self._current.close()
+                raise
+        logger.info(f"Opened dedup store {path} ({len(self)} keys)")
+
+    def __contains__(self, key: Key) -> bool:
+        digest = self._digest(key)
+        return self._current.contains(digest) or (self._previous is not None and self._previous.contains(digest))
+
+    def add(self, key: Key):
+        digest = self._digest(key)
+        if self._current.contains(digest):
+            return
+        if self._current.count >= self.generation_capacity:
+            self._rotate()
+        self._current.add(digest)
+
+    def _rotate(self):
+        """Make the full current file the previous generation and start an empty one."""
+        if self._previous is not None:
+            self._previous.close()
+        self._current.close()
+        os.replace(self.path, self.previous_path)
+        self._previous = _BloomFile(self.previous_path, self.generation_capacity, self.error_rate)
+        self._current = _BloomFile(self.path, self.generation_capacity, self.error_rate)
+        logger.info(f"Rotated dedup store {self.path} after {self._previous.count} keys")
+
+    def __len__(self) -> int:
+        return self._current.count + (self._previous.count if self._previous is not None else 0)
+
+    def flush(self):
+        """Write dirty pages back to the files."""
+        self._current.flush()
+
+    def close(self):
+        self._current.close()
+        if self._previous is not None:
+            self._previous.close()
+
+
+def create_dedup_store(kind: Optional[str] = None, path: Optional[str] = None) -> DedupStore:
+    """
+    Build a dedup store from arguments or the DEDUP_STORE* environment variables.
+
+    Args:
+        kind: 'set' (exact digests, default), 'bloom' (scalable in-memory Bloom filter) or 'mmap'
+            (persistent on-disk Bloom filter); all retain about DEDUP_CAPACITY keys.
+        path: File for the 'mmap' store.
+
+    Returns:
+        DedupStore: The configured store.
+    """
+    kind = (kind or os.getenv("DEDUP_STORE", "set")).lower()
+    error_rate = float(os.getenv("DEDUP_ERROR_RATE", "0.001"))
+    capacity = int(os.getenv("DEDUP_CAPACITY", str(DEFAULT_CAPACITY)))
+
+    if kind == 'bloom':
+        return ScalableBloomFilter(error_rate=error_rate, capacity=capacity)
+    if kind == 'mmap':
+        path = path or os.getenv("DEDUP_STORE_PATH", os.path.join(".cache", "dedup.bloom"))
+        try:
+            return MmapBloomStore(path, capacity=capacity, error_rate=error_rate)
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not open dedup store {path}, falling back to in-memory: {e}")
+            return DigestSetStore(capacity=capacity)
+    if kind != 'set':
+        logger.warning(f"Unknown DEDUP_STORE '{kind}', using 'set'")
+    return DigestSetStore(capacity=capacity)
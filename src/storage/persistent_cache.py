@@ -0,0 +1,189 @@
+import logging
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Any, Optional, Dict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "t1_cache.sqlite3")
+
+class PersistentCache:
+    """
+    Thread-safe, persistent key/value cache backed by SQLite.
+
+    Entries are JSON-serialised, expire after a TTL, and each namespace is
+    bounded to max_entries with least-recently-used eviction. Several
+    namespaces (LLM responses, search results, ...) can share one file.
+    """
+
+    def __init__(self,
+                 namespace: str,
+                 path: Optional[str] = None,
+                 default_ttl: Optional[float] = None,
+                 max_entries: int = 10_000):
+        """
+        Args:
+            namespace: Logical partition of the cache file.
+            path: SQLite file (defaults to T1_CACHE_PATH or .cache/t1_cache.sqlite3).
+                Use ':memory:' for a non-persistent cache.
+            default_ttl: Seconds before an entry expires (None = never).
+            max_entries: Maximum entries kept in this namespace.
+        """
+        self.namespace = namespace
+        self.path = path or os.getenv("T1_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory and self.path != ':memory:':
+            os.makedirs(directory, exist_ok=True)
+        # One shared connection guarded by a lock; safe under thread-pool executors
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._lock:
+            if self.path != ':memory:':
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " namespace TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " expires_at REAL,"
+                " last_access REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cache_lru ON cache (namespace, last_access)")
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a key.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            Optional[Any]: The cached value, or None if missing or expired.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                if row is not None:
+                    self._conn.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE cache SET last_access = ? WHERE namespace = ? AND key = ?",
+                (now, self.namespace, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """
+        Store a value.
+
+        Args:
+            key (str): Cache key.
+            value (Any): JSON-serialisable value.
+            ttl (Optional[float]): Seconds until expiry; defaults to default_ttl.
+
+        Returns:
+            bool: True if stored.
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        try:
+            payload = json.dumps(value)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Value for cache key {key} is not serialisable: {e}")
+            return False
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, payload, expires_at, now)
+            )
+            self._evict()
+            self._conn.commit()
+        return True
+
+    def _evict(self):
+        """Drop expired entries, then the least recently used ones beyond max_entries."""
+        count = self._conn.execute(
+            "SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+        if count <= self.max_entries:
+            return
+        self._conn.execute(
+            "DELETE FROM cache WHERE namespace = ? AND expires_at IS NOT NULL AND expires_at <= ?",
+            (self.namespace, time.time())
+        )
+        # Evict down to 90% so we don't pay this on every insert once full
+        target = int(self.max_entries * 0.9)
+        self._conn.execute(
+            "DELETE FROM cache WHERE namespace = ? AND key IN ("
+            " SELECT key FROM cache WHERE namespace = ? ORDER BY last_access ASC"
+            " LIMIT MAX(0, (SELECT COUNT(*) FROM cache WHERE namespace = ?) - ?))",
+            (self.namespace, self.namespace, self.namespace, target)
+        )
+
+    def delete(self, key: str) -> bool:
+        """
+        Remove a key.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            bool: True if an entry was removed.
+        """
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key))
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def clear(self) -> bool:
+        """
+        Remove every entry in this namespace.
+
+        Returns:
+            bool: True if successful.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+            self._conn.commit()
+        return True
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters for this process.
+
+        Returns:
+            Dict[str, Any]: hits, misses and hit_ratio.
+        """
+        total = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'hit_ratio': self.hits / total if total else 0.0}
+
+    def close(self):
+        """Close the underlying connection."""
+        with self._lock:
+            self._conn.close()
@@ -11,13 +11,18 @@ os.environ["NUMEXPR_NUM_THREADS"] = "1"
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 os.environ["TORCH_NUM_THREADS"] = "1"
 
-import uuid
-from typing import Dict, Any, List
+import asyncio
+from concurrent.futures import CancelledError
+from typing import Dict, Any, Awaitable, List, Optional, Set, Tuple
 
 from src.core.ingestion.ingestor import Ingestor
 from src.core.preprocess.preprocessor import Preprocessor
 from src.core.analysis.analyzer import Analyzer
+from src.core.analysis.llm_executor import CancelToken, cancel_scope
+from src.core.pipeline.streaming import StreamingPipeline
 from src.models.embeddings.pinecone_handler import PineconeHandler
+from src.utils.async_utils import run_sync
+from src.utils.urls import canonicalize_url, document_id
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +42,12 @@ class Core:
         self.ingestor = Ingestor()
         self.preprocessor = Preprocessor()
         self.analyzer = Analyzer()
+        # Sources scoring below this (0-1) against the query are not summarized
+        self.relevance_threshold = float(os.getenv("RELEVANCE_THRESHOLD", "0.1"))
+        # "streaming" overlaps all stages per document; "batch" finishes each stage before the next
+        self.pipeline_mode = os.getenv("PIPELINE_MODE", "streaming").lower()
+        # Cancel tokens of runs in progress, cancelled by aclose()
+        self._active_runs: Set[CancelToken] = set()
         
         # Initialize Vector DB
         self.vector_db = PineconeHandler(index_name="abc", namespace="intelligence")
@@ -47,12 +58,52 @@ class Core:
         """
         Run the full data processing pipeline.
 
+        Synchronous wrapper for arun_pipeline. The scraper's HTTP session stays open
+        for later calls; close() releases it.
+
+        Args:
+            input_data (Dict[str, Any]): The input data containing 'query' or 'source'.
+
+        Returns:
+            Dict[str, Any]: The results of the analysis.
+        """
+        return run_sync(self.arun_pipeline(input_data))
+
+    async def arun_pipeline(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the full data processing pipeline on the running event loop.
+
+        Blocking work (planning, parsing, model calls) runs on worker threads, so
+        several pipelines can run concurrently on one loop and share the scraper's
+        HTTP session. Call aclose() when the Core is no longer needed.
+
         Args:
             input_data (Dict[str, Any]): The input data containing 'query' or 'source'.
 
         Returns:
             Dict[str, Any]: The results of the analysis.
         """
+        return await self._cancellable(self._run_pipeline(input_data))
+
+    async def _cancellable(self, run: Awaitable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Await a pipeline run under its own cancel token.
+
+        If the run fails or is cancelled (or aclose() is called meanwhile), the
+        model calls it queued are dropped and running ones stop at their next
+        checkpoint; runs of other pipelines sharing the LLM executor are unaffected.
+        """
+        with cancel_scope() as token:
+            self._active_runs.add(token)
+            try:
+                return await run
+            except BaseException:
+                self.analyzer.llm_executor.cancel_pending(token)
+                raise
+            finally:
+                self._active_runs.discard(token)
+
+    async def _run_pipeline(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         logger.info("Starting pipeline execution...")
         
         query = input_data.get("query")
@@ -64,92 +115,214 @@ class Core:
         # 1. Planning / Source Discovery
         if not sources and query:
             logger.info(f"Generating research plan for: {query}")
-            sources = self.analyzer.generate_plan(query)
+            sources = await asyncio.to_thread(self.analyzer.generate_plan, query)
             if not sources:
                 return {"status": "error", "message": "Could not generate valid sources."}
         elif isinstance(sources, str):
             sources = [sources]
 
-        # 2. Ingestion
+        # 2-4. Ingestion, preprocessing, summaries and storage
         logger.info(f"Ingesting from {len(sources)} sources...")
-        raw_items = self.ingestor.fetch_osint(sources)
+        metrics = None
+        if self.pipeline_mode == "batch":
+            raw_items = await self.ingestor.afetch_osint(sources)
+            processed_items, summaries = await asyncio.to_thread(self._summarize_and_store, raw_items, query)
+        else:
+            streamed = await StreamingPipeline(self).run(sources, query)
+            processed_items, summaries, metrics = streamed["processed_items"], streamed["summaries"], streamed["metrics"]
+
+        # 5. Analysis (Executive Report)
+        executive_report = "No data gathered."
+        if summaries:
+            executive_report = await asyncio.to_thread(
+                self.analyzer.generate_executive_report, summaries, query or "Provided Sources"
+            )
+
+        logger.info("Pipeline execution completed.")
         
+        result = {
+            "status": "completed", 
+            "sources_processed": len(processed_items),
+            "executive_report": executive_report,
+            "detailed_results": processed_items
+        }
+        if metrics:
+            result["metrics"] = metrics
+        return result
+
+    def run_batch(self, queries: List[str], sources: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
+        """
+        Run many research queries as one batch.
+
+        Synchronous wrapper for arun_batch. The scraper's HTTP session stays open
+        for later calls; close() releases it.
+
+        Args:
+            queries: Research queries
+            sources: Optional source URLs per query; queries without an entry are planned
+
+        Returns:
+            Dict[str, Any]: Per-query results under 'results', plus batch totals.
+        """
+        return run_sync(self.arun_batch(queries, sources))
+
+    async def arun_batch(self, queries: List[str], sources: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
+        """
+        Run many research queries as one batch on the running event loop.
+
+        Queries are planned concurrently and their URL sets are merged by canonical
+        URL. Each unique page is then fetched, summarized and stored once, kept
+        if it is relevant to any query that planned it. The summaries fan back out
+        to one executive report per query.
+
+        Args:
+            queries: Research queries
+            sources: Optional source URLs per query; queries without an entry are planned
+
+        Returns:
+            Dict[str, Any]: Per-query results (same shape as arun_pipeline) under
+                'results', plus planned/unique source counts and pipeline metrics.
+        """
+        return await self._cancellable(self._run_batch(queries, sources))
+
+    async def _run_batch(self, queries: List[str], sources: Optional[Dict[str, List[str]]]) -> Dict[str, Any]:
+        queries = list(dict.fromkeys(q for q in queries if q))
+        if not queries:
+            return {"status": "error", "message": "No queries provided."}
+        sources = dict(sources or {})
+        logger.info(f"Starting batch of {len(queries)} queries...")
+
+        # 1. Planning, concurrently across pooled browsers
+        to_plan = [q for q in queries if not sources.get(q)]
+        if to_plan:
+            sources.update(await asyncio.to_thread(self.analyzer.generate_plans, to_plan))
+
+        # 2. Merge plans: one fetch per canonical URL, remembering which queries wanted it
+        unique_urls: Dict[str, str] = {}
+        url_queries: Dict[str, List[str]] = {}
+        query_urls: Dict[str, List[str]] = {}
+        planned = 0
+        for query in queries:
+            urls = sources.get(query) or []
+            if isinstance(urls, str):
+                urls = [urls]
+            planned += len(urls)
+            query_urls[query] = []
+            for url in urls:
+                url = unique_urls.setdefault(canonicalize_url(url), url)
+                if query not in url_queries.setdefault(url, []):
+                    url_queries[url].append(query)
+                    query_urls[query].append(url)
+        urls = list(url_queries)
+        logger.info(f"Batch planned {planned} sources, {len(urls)} unique")
+
+        # 3. Fetch, summarize and store each unique page once
+        streamed = await StreamingPipeline(self).run(urls, url_queries=url_queries)
+        by_url = {item["url"]: item for item in streamed["processed_items"]}
+
+        # 4. Fan out to per-query reports
+        async def report(query: str) -> Dict[str, Any]:
+            if not query_urls[query]:
+                return {"status": "error", "message": "Could not generate valid sources."}
+            items = []
+            for url in query_urls[query]:
+                item = by_url.get(url)
+                relevance = item["relevance_by_query"].get(query, 1.0) if item else None
+                if item and relevance >= self.relevance_threshold:
+                    items.append({"url": url, "summary": item["summary"], "relevance": relevance})
+            executive_report = "No data gathered."
+            if items:
+                executive_report = await asyncio.to_thread(
+                    self.analyzer.generate_executive_report,
+                    [f"Source: {item['url']}\n{item['summary']}" for item in items], query
+                )
+            return {
+                "status": "completed",
+                "sources_processed": len(items),
+                "executive_report": executive_report,
+                "detailed_results": items,
+            }
+
+        reports = await asyncio.gather(*[report(query) for query in queries])
+        logger.info("Batch execution completed.")
+        return {
+            "status": "completed",
+            "planned_sources": planned,
+            "unique_sources": len(urls),
+            "sources_processed": len(by_url),
+            "results": dict(zip(queries, reports)),
+            "metrics": streamed["metrics"],
+        }
+
+    async def aclose(self):
+        """Cancel model calls of runs still in progress and close the scraper's and URL validator's HTTP sessions."""
+        for token in list(self._active_runs):
+            self.analyzer.llm_executor.cancel_pending(token)
+        await self.ingestor.scraper.aclose()
+        await self.analyzer.url_validator.aclose()
+
+    def close(self):
+        """Release the Core's resources from synchronous code (HTTP session, parse pool, dedup store)."""
+        self.ingestor.close()
+
+    def _summarize_and_store(self, raw_items: List[Dict[str, Any]], query: str) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Clean, summarize and store all fetched sources one stage at a time.
+
+        Args:
+            raw_items: Output of Ingestor.afetch_osint
+            query: The research query (may be None)
+
+        Returns:
+            Tuple of the processed items and the per-source summaries
+        """
         processed_items = []
         summaries = []
         vectors_to_upsert = []
 
-        # 3. Preprocessing & Storage Loop (Parallelized)
-        import asyncio
-
-        async def process_item(item):
+        # 3. Preprocessing (CPU bound, fast)
+        documents = []
+        for item in raw_items:
             if item.get("status") == "success":
-                content = item.get("content", "")
-                url = item.get("url")
-                
-                # Preprocess (CPU bound, fast)
-                clean_content = self.preprocessor.clean_text(content)
-                
+                clean_content = self.preprocessor.clean_text(item.get("content", ""))
                 if clean_content:
-                    # Generate individual summary (I/O bound - LLM Call)
-                    # We run this in a thread executor to avoid blocking the loop if it's synchronous requests
-                    loop = asyncio.get_event_loop()
-                    try:
-                        summary = await loop.run_in_executor(None, self.analyzer.generate_summary, clean_content[:15000])
-                    except Exception as e:
-                        logger.error(f"Summary generation failed for {url}: {e}")
-                        summary = "Error generating summary."
-
-                    doc_id = str(uuid.uuid4())
-                    return {
-                        "valid": True,
-                        "vector_tuple": (doc_id, clean_content, {"url": url, "query": query}),
-                        "summary_text": f"Source: {url}\n{summary}",
-                        "result_item": {"url": url, "summary": summary}
-                    }
-            return {"valid": False}
-
-        # Create or retrieve event loop to run the tasks
+                    documents.append((item.get("url"), clean_content, item.get("title") or ""))
+
+        # Drop off-topic sources before spending any LLM calls on them (scored per page,
+        # as the streaming pipeline does, so both modes keep the same sources)
+        relevance_scores = [1.0] * len(documents)
+        if query and documents:
+            scores = self.analyzer.score_relevance_batch(
+                [{"title": title, "content": content} for _, content, title in documents], query,
+                use_batch_idf=False
+            )
+            kept = [(doc, score) for doc, score in zip(documents, scores) if score >= self.relevance_threshold]
+            logger.info(f"Relevance filter kept {len(kept)}/{len(documents)} sources (threshold {self.relevance_threshold})")
+            documents = [doc for doc, _ in kept]
+            relevance_scores = [score for _, score in kept]
+
+        # Per-source summaries; short articles share batched LLM requests
         try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        # Run processing tasks concurrently
-        task_list = [process_item(item) for item in raw_items]
-        if task_list:
-            if loop.is_running():
-                 # Should not happen in this sync wrapper context, but for safety
-                 logger.warning("Event loop already running, executing sequentially as fallback")
-                 results = [loop.run_until_complete(t) for t in task_list] 
-            else:
-                 results = loop.run_until_complete(asyncio.gather(*task_list))
-        else:
-            results = []
+            summary_texts = self.analyzer.generate_summaries_batch([content for _, content, _ in documents])
+        except CancelledError:
+            # A cancelled run must not store placeholder summaries
+            raise
+        except Exception as e:
+            logger.error(f"Summary generation failed: {e}")
+            summary_texts = ["Error generating summary."] * len(documents)
 
-        for res in results:
-            if res["valid"]:
-                vectors_to_upsert.append(res["vector_tuple"])
-                summaries.append(res["summary_text"])
-                processed_items.append(res["result_item"])
+        for (url, clean_content, _), summary, relevance in zip(documents, summary_texts, relevance_scores):
+            doc_id = document_id(url)
+            vectors_to_upsert.append((doc_id, clean_content, {"url": url, "query": query}))
+            summaries.append(f"Source: {url}\n{summary}")
+            processed_items.append({"url": url, "summary": summary, "relevance": relevance})
 
         # 4. Storage (Batch Upsert)
         if vectors_to_upsert:
             self.vector_db.upsert_vectors(vectors_to_upsert)
 
-        # 5. Analysis (Executive Report)
-        executive_report = "No data gathered."
-        if summaries:
-            executive_report = self.analyzer.generate_executive_report(summaries, query or "Provided Sources")
+        return processed_items, summaries
 
-        logger.info("Pipeline execution completed.")
-        
-        return {
-            "status": "completed", 
-            "sources_processed": len(processed_items),
-            "executive_report": executive_report,
-            "detailed_results": processed_items
-        }
 
 if __name__ == "__main__":
     # Basic test
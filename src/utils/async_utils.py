@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Coroutine, Optional
+
+logger = logging.getLogger(__name__)
+
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_pid: Optional[int] = None
+_background_lock = threading.Lock()
+# Async callbacks awaited before a run_sync helper loop shuts down, by loop
+_helper_loop_callbacks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, list]" = weakref.WeakKeyDictionary()
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the process-wide event loop that serves synchronous callers, starting it on first use.
+
+    The loop runs forever on a daemon thread, so loop-bound resources such as the
+    scraper's pooled HTTP session survive from one sync call to the next.
+
+    Returns:
+        asyncio.AbstractEventLoop: The running background loop
+    """
+    global _background_loop, _background_pid
+    with _background_lock:
+        # A forked child inherits the loop object but not the thread running it
+        if _background_loop is None or _background_pid != os.getpid():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="sync-loop", daemon=True).start()
+            _background_loop, _background_pid = loop, os.getpid()
+        return _background_loop
+
+async def _run_with_cleanup(coro: Coroutine, cleanup: Optional[Callable[[], Awaitable[Any]]]) -> Any:
+    try:
+        return await coro
+    finally:
+        if cleanup is not None:
+            try:
+                await cleanup()
+            except Exception as e:
+                logger.debug(f"Cleanup after sync call failed: {e}")
+
+async def _run_on_helper_loop(coro: Coroutine, cleanup: Optional[Callable[[], Awaitable[Any]]]) -> Any:
+    loop = asyncio.get_running_loop()
+    _helper_loop_callbacks[loop] = []
+    try:
+        return await _run_with_cleanup(coro, cleanup)
+    finally:
+        for callback in _helper_loop_callbacks.pop(loop, []):
+            try:
+                await callback()
+            except Exception as e:
+                logger.debug(f"Helper loop cleanup failed: {e}")
+
+def on_helper_loop_exit(callback: Callable[[], Awaitable[Any]]) -> bool:
+    """
+    Await `callback` on the current loop before it shuts down, if it is a run_sync helper loop.
+
+    Helper loops are closed as soon as their call returns, so loop-bound
+    resources created on one (e.g. an HTTP session) must be released first.
+
+    Args:
+        callback: Async callable to await on the helper loop
+
+    Returns:
+        bool: True if registered, False when not running on a helper loop
+    """
+    callbacks = _helper_loop_callbacks.get(asyncio.get_running_loop())
+    if callbacks is None:
+        return False
+    callbacks.append(callback)
+    return True
+
+def run_sync(coro: Coroutine, cleanup: Optional[Callable[[], Awaitable[Any]]] = None) -> Any:
+    """
+    Run a coroutine to completion from synchronous code.
+
+    Every call runs on the same long-lived background loop (get_background_loop),
+    so pooled HTTP sessions and their warm connections are reused across sync
+    calls; pass an async close method as `cleanup` only for resources that must
+    not outlive the call. Code already running on the background loop gets a
+    fresh loop on a helper thread rather than deadlocking it; callbacks registered
+    with on_helper_loop_exit run before that loop closes. A sync call still
+    blocks its caller, so async code should await the async API (e.g.
+    Core.arun_pipeline) instead.
+
+    Args:
+        coro: The coroutine to run
+        cleanup: Optional async callable awaited on the same loop after coro finishes
+
+    Returns:
+        The coroutine's result
+    """
+    loop = get_background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+
+    if running is loop:
+        logger.warning("Sync API called on the background loop; running it on a helper thread")
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="run-sync") as pool:
+            return pool.submit(asyncio.run, _run_on_helper_loop(coro, cleanup)).result()
+    if running is not None:
+        logger.warning("Sync API called inside a running event loop; it blocks that loop until it returns")
+
+    future = asyncio.run_coroutine_threadsafe(_run_with_cleanup(coro, cleanup), loop)
+    try:
+        return future.result()
+    except BaseException:
+        # Interrupted caller (e.g. KeyboardInterrupt): stop the work on the background loop too
+        future.cancel()
+        raise
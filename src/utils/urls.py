@@ -0,0 +1,61 @@
+import hashlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track the click and never change the page
+TRACKING_PARAMS = {'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid', 'ref_src', '_ga'}
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+def canonicalize_url(url: str) -> str:
+    """
+    Reduce a URL to a canonical form so trivially different links to one page compare equal.
+
+    Lower-cases the scheme and host, drops default ports, fragments, tracking
+    parameters (utm_* and common click ids) and a trailing slash, and sorts the
+    remaining query parameters. Unparseable input is returned stripped.
+
+    Args:
+        url: The URL
+
+    Returns:
+        str: The canonical URL
+    """
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    if not parts.scheme or not parts.netloc:
+        return url
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if ':' in host:
+        host = f"[{host}]"
+    if port and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    if parts.username:
+        credentials = parts.username + (f":{parts.password}" if parts.password else "")
+        host = f"{credentials}@{host}"
+
+    path = parts.path or '/'
+    if len(path) > 1 and path.endswith('/'):
+        path = path.rstrip('/') or '/'
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+def document_id(url: str) -> str:
+    """
+    Stable vector-store ID for a page: the same canonical URL always maps to the same ID,
+    across runs and interpreters (unlike the salted built-in hash()).
+
+    Args:
+        url: The page URL
+
+    Returns:
+        str: "doc_" followed by 32 hex characters of the canonical URL's SHA-256
+    """
+    return "doc_" + hashlib.sha256(canonicalize_url(url).encode('utf-8')).hexdigest()[:32]
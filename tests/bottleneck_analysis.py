@@ -93,5 +93,12 @@ def run_bottleneck_test(query: str = "quantum computing trends 2025"):
 
 if __name__ == "__main__":
     import sys
-    query = sys.argv[1] if len(sys.argv) > 1 else "latest advancements in solid state batteries 2024"
+    args = sys.argv[1:]
+    if "--stub-llm" in args:
+        # Offline, reproducible LLM timings (tune with LLM_STUB_LATENCY / LLM_STUB_429_RATE / LLM_STUB_SEED)
+        args.remove("--stub-llm")
+        os.environ["LLM_BACKEND"] = "stub"
+        os.environ.setdefault("LLM_STUB_LATENCY", "lognormal:0.8:0.4")
+        os.environ.setdefault("LLM_CACHE", "off")
+    query = args[0] if args else "latest advancements in solid state batteries 2024"
     run_bottleneck_test(query)
@@ -0,0 +1,84 @@
+"""
+Offline Analyzer for unit tests.
+
+make_analyzer builds an Analyzer whose model client, rate limiter and caches
+are injected, so tests make no API calls and open nothing under .cache/.
+Fake clients record every prompt they receive.
+"""
+
+import os
+import threading
+from typing import Any, Optional
+from unittest import mock
+
+from src.core.analysis.analyzer import Analyzer
+from src.core.analysis.llm_executor import LLMExecutor
+from src.core.analysis.rate_limiter import RateLimiter
+from src.core.analysis.url_validator import URLValidator
+from src.storage.persistent_cache import PersistentCache
+
+# Default caches stay off while the Analyzer is built; tests inject in-memory ones
+OFFLINE_ENV = {
+    "LLM_BACKEND": "gemini",
+    "LLM_CACHE": "off",
+    "SEARCH_CACHE": "off",
+}
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeModels:
+    """Answers every prompt with "response #<n>" and records the prompts."""
+
+    def __init__(self):
+        self.calls = 0
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def generate_content(self, model: str, contents: Any) -> FakeResponse:
+        with self._lock:
+            self.calls += 1
+            self.prompts.append(contents)
+        return FakeResponse(f"response #{self.calls}")
+
+
+class FakeClient:
+    def __init__(self, models: Optional[FakeModels] = None):
+        self.models = models or FakeModels()
+
+
+def memory_cache(namespace: str, **kwargs: Any) -> PersistentCache:
+    """Return a non-persistent cache for one namespace."""
+    return PersistentCache(namespace, path=":memory:", **kwargs)
+
+
+def make_analyzer(client: Any = None,
+                  response_cache: Optional[PersistentCache] = None,
+                  search_cache: Optional[PersistentCache] = None,
+                  rate_limiter: Optional[RateLimiter] = None,
+                  llm_executor: Optional[LLMExecutor] = None) -> Analyzer:
+    """
+    Build an Analyzer with injected dependencies and no on-disk state.
+
+    Args:
+        client: Model client (defaults to a FakeClient).
+        response_cache: LLM response cache (None disables caching).
+        search_cache: Search result cache (None disables caching).
+        rate_limiter: Model-call quota (defaults to an effectively unlimited one).
+        llm_executor: Pool for model calls (defaults to the shared executor).
+
+    Returns:
+        Analyzer: The configured analyzer.
+    """
+    with mock.patch.dict(os.environ, OFFLINE_ENV):
+        return Analyzer(
+            client=client or FakeClient(),
+            rate_limiter=rate_limiter or RateLimiter(requests_per_minute=60000),
+            llm_executor=llm_executor,
+            response_cache=response_cache,
+            search_cache=search_cache,
+            url_validator=URLValidator(cache=memory_cache("url_validation")),
+        )
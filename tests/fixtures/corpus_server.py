@@ -0,0 +1,163 @@
+"""
+Local multi-host HTTP server for the synthetic article corpus.
+
+The server runs in a separate process so it does not share the event loop,
+CPU time or memory accounting of the pipeline being measured. Each "host"
+is its own port on 127.0.0.1, so per-host connection limits and circuit
+breakers behave as they would against real sites. Besides normal hosts
+there is a slow host (every response delayed) and a failing host (every
+response is a 503). A share of URLs are exact duplicates: different
+URLs serving the same article.
+"""
+
+import asyncio
+import multiprocessing
+import random
+from functools import lru_cache
+from typing import Any, Dict, List
+
+from aiohttp import web
+
+from tests.fixtures.html_corpus import generate_article
+
+
+def _serve(config: Dict[str, Any], conn) -> None:
+    """Process entry point: bind every host port, report them, serve until told to stop."""
+
+    @lru_cache(maxsize=4096)
+    def page(index: int) -> str:
+        return generate_article(index, config['paragraphs'], config['words_per_paragraph'], config['seed'])
+
+    roles: Dict[int, str] = {}
+
+    async def article(request: web.Request) -> web.Response:
+        role = roles.get(request.url.port, 'normal')
+        if role == 'failing':
+            return web.Response(status=503, text="Service Unavailable")
+        if role == 'slow':
+            await asyncio.sleep(config['slow_delay'])
+        return web.Response(text=page(int(request.match_info['n'])), content_type='text/html')
+
+    async def start():
+        app = web.Application()
+        app.router.add_get('/article/{n}', article)
+        app.router.add_get('/article/{n}/{alias}', article)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        ports = {}
+        for name in [f"host{i}" for i in range(config['hosts'])] + ['slow', 'failing']:
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+            roles[port] = name if name in ('slow', 'failing') else 'normal'
+            ports[name] = port
+        return runner, ports
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    runner, ports = loop.run_until_complete(start())
+    conn.send(ports)
+    loop.run_until_complete(loop.run_in_executor(None, conn.recv))
+    loop.run_until_complete(runner.cleanup())
+    loop.close()
+
+
+class CorpusServer:
+    """
+    Serves `size` synthetic article URLs across several local hosts.
+
+    Usage:
+        with CorpusServer(size=1000) as server:
+            urls = server.urls
+    """
+
+    def __init__(self,
+                 size: int,
+                 paragraphs: int = 12,
+                 words_per_paragraph: int = 60,
+                 hosts: int = 16,
+                 duplicate_ratio: float = 0.1,
+                 slow_ratio: float = 0.01,
+                 slow_delay: float = 0.5,
+                 fail_ratio: float = 0.01,
+                 seed: int = 0):
+        """
+        Args:
+            size: Number of URLs.
+            paragraphs: Body paragraphs per page (controls page weight).
+            words_per_paragraph: Words per paragraph.
+            hosts: Number of normal hosts (ports) the URLs are spread over.
+            duplicate_ratio: Share of URLs that serve another URL's article.
+            slow_ratio: Share of URLs on the slow host.
+            slow_delay: Seconds the slow host waits before answering.
+            fail_ratio: Share of URLs on the failing (always 503) host.
+            seed: Seed for the corpus and URL layout.
+        """
+        self.config = {
+            'size': size,
+            'paragraphs': paragraphs,
+            'words_per_paragraph': words_per_paragraph,
+            'hosts': hosts,
+            'duplicate_ratio': duplicate_ratio,
+            'slow_ratio': slow_ratio,
+            'slow_delay': slow_delay,
+            'fail_ratio': fail_ratio,
+            'seed': seed,
+        }
+        self.ports: Dict[str, int] = {}
+        self.urls: List[str] = []
+        self._process = None
+        self._conn = None
+
+    def _build_urls(self) -> List[str]:
+        rng = random.Random(self.config['seed'])
+        hosts = self.config['hosts']
+        urls = []
+        for i in range(self.config['size']):
+            roll = rng.random()
+            if roll < self.config['fail_ratio']:
+                host = 'failing'
+            elif roll < self.config['fail_ratio'] + self.config['slow_ratio']:
+                host = 'slow'
+            else:
+                host = f"host{i % hosts}"
+            base = f"http://127.0.0.1:{self.ports[host]}/article"
+            if i and rng.random() < self.config['duplicate_ratio']:
+                urls.append(f"{base}/{rng.randrange(i)}/mirror{i}")
+            else:
+                urls.append(f"{base}/{i}")
+        return urls
+
+    def start(self) -> List[str]:
+        """
+        Start the server process.
+
+        Returns:
+            List[str]: The corpus URLs.
+        """
+        ctx = multiprocessing.get_context('spawn')
+        self._conn, child = ctx.Pipe()
+        self._process = ctx.Process(target=_serve, args=(self.config, child), daemon=True)
+        self._process.start()
+        self.ports = self._conn.recv()
+        self.urls = self._build_urls()
+        return self.urls
+
+    def stop(self):
+        """Shut the server process down."""
+        if self._process is not None:
+            try:
+                self._conn.send('stop')
+            except (BrokenPipeError, OSError):
+                pass
+            self._process.join(timeout=5)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+
+    def __enter__(self) -> "CorpusServer":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
@@ -0,0 +1,84 @@
+"""
+Synthetic HTML corpus used by the offline tests and benchmarks.
+
+Pages look like typical news articles: a head with Open Graph / Twitter
+metadata, navigation and footer boilerplate, and an <article> body. Output
+is fully determined by the seed so benchmark runs are comparable.
+"""
+
+import random
+from typing import List
+
+WORDS = (
+    "battery solid state lithium anode cathode energy density research lab "
+    "startup funding market supply chain vehicle range charging cycle cost "
+    "manufacturing pilot production partnership government policy security "
+    "analyst report quarter growth risk regulation export semiconductor data "
+    "network infrastructure threat actor campaign vulnerability disclosure patch"
+).split()
+
+
+def generate_paragraph(rng: random.Random, words: int) -> str:
+    """Return one paragraph of pseudo-random prose."""
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def generate_article(index: int, paragraphs: int = 12, words_per_paragraph: int = 60, seed: int = 0) -> str:
+    """
+    Generate one article page.
+
+    Args:
+        index: Article number (also varies the content).
+        paragraphs: Number of body paragraphs.
+        words_per_paragraph: Words in each paragraph.
+        seed: Corpus seed.
+
+    Returns:
+        str: The HTML document.
+    """
+    rng = random.Random(seed * 1_000_003 + index)
+    title = f"Article {index}: " + " ".join(rng.choice(WORDS) for _ in range(6))
+    body = "\n".join(f"<p>{generate_paragraph(rng, words_per_paragraph)}</p>" for _ in range(paragraphs))
+    nav = "".join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(20))
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<meta property="og:title" content="{title}">
+<meta property="og:type" content="article">
+<meta name="twitter:card" content="summary">
+<meta name="author" content="Analyst {index % 7}">
+<meta property="article:published_time" content="2025-11-{(index % 28) + 1:02d}T08:00:00Z">
+<script>var analytics = {{"page": {index}}};</script>
+<style>body {{ font-family: sans-serif; }}</style>
+</head>
+<body>
+<header><nav><ul>{nav}</ul></nav></header>
+<main>
+<article>
+<h1>{title}</h1>
+{body}
+</article>
+<aside><p>Subscribe to our newsletter for more updates like this one.</p></aside>
+</main>
+<footer><p>Privacy policy and terms of service apply to this website.</p></footer>
+</body>
+</html>"""
+
+
+def generate_corpus(size: int, paragraphs: int = 12, words_per_paragraph: int = 60, seed: int = 0) -> List[str]:
+    """
+    Generate a list of article pages.
+
+    Args:
+        size: Number of documents.
+        paragraphs: Body paragraphs per document (controls page weight).
+        words_per_paragraph: Words per paragraph.
+        seed: Corpus seed.
+
+    Returns:
+        List[str]: HTML documents.
+    """
+    return [generate_article(i, paragraphs, words_per_paragraph, seed) for i in range(size)]
@@ -0,0 +1,87 @@
+"""
+Per-document parsing benchmark for Parser.extract_article_content.
+
+Compares the previous extraction path (html.parser tree plus a second
+html.parser parse for metadata) with the single-parse lxml path, on the
+synthetic fixture corpus.
+
+It also reports batch throughput of the process-pool parse stage
+(ParallelParser) at increasing worker counts.
+
+Usage:
+    python tests/parser_benchmark.py [num_docs] [paragraphs]
+"""
+
+import os
+import sys
+import time
+from statistics import median
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.axis.parsers.data_parser import Parser
+from src.core.ingestion.parallel_parser import ParallelParser
+from tests.fixtures.html_corpus import generate_corpus
+
+
+def legacy_extract(parser: Parser, html: str, url: str):
+    """Reproduce the old cost profile: article tree + separate metadata parse."""
+    parser.extract_metadata(html)
+    return parser.extract_article_content(html, url)
+
+
+def time_per_doc(func, corpus):
+    """Return per-document wall times in milliseconds."""
+    timings = []
+    for i, html in enumerate(corpus):
+        start = time.perf_counter()
+        func(html, f"https://example.com/{i}")
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def run_parser_benchmark(num_docs: int = 200, paragraphs: int = 12):
+    corpus = generate_corpus(num_docs, paragraphs=paragraphs)
+    avg_kb = sum(len(d) for d in corpus) / len(corpus) / 1024
+
+    legacy = Parser(features='html.parser')
+    single = Parser()
+
+    # Both paths must produce the same article
+    for html in corpus[:10]:
+        a = legacy.extract_article_content(html, '')
+        b = single.extract_article_content(html, '')
+        assert a['title'] == b['title'] and a['content'] == b['content'] and a['metadata'] == b['metadata']
+
+    legacy_ms = time_per_doc(lambda h, u: legacy_extract(legacy, h, u), corpus)
+    single_ms = time_per_doc(single.extract_article_content, corpus)
+
+    print("=" * 60)
+    print(" PARSER BENCHMARK")
+    print("=" * 60)
+    print(f"Documents: {num_docs} (avg {avg_kb:.1f} KB)")
+    print(f"Legacy (html.parser x2): median {median(legacy_ms):.2f} ms/doc")
+    print(f"Single parse ({single.features}): median {median(single_ms):.2f} ms/doc")
+    print(f"Speedup: {median(legacy_ms) / median(single_ms):.2f}x")
+
+    print("-" * 60)
+    documents = [(html, f"https://example.com/{i}") for i, html in enumerate(corpus)]
+    baseline = None
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        pool = ParallelParser(max_workers=workers, chunk_size=16)
+        list(pool.parse_batch(documents[:workers]))  # warm up the workers
+        start = time.perf_counter()
+        list(pool.parse_batch(documents))
+        rate = num_docs / (time.perf_counter() - start)
+        pool.close()
+        baseline = baseline or rate
+        print(f"Parse pool x{workers}: {rate:.0f} docs/sec ({rate / baseline:.2f}x)")
+        workers *= 2
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    docs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    paras = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+    run_parser_benchmark(docs, paras)
@@ -0,0 +1,272 @@
+"""
+Offline end-to-end pipeline benchmark.
+
+Serves the synthetic corpus from a local multi-host server (tests/fixtures/
+corpus_server.py) and drives Ingestor.fetch_osint and Core.run_pipeline at
+increasing URL counts. The LLM is the in-process stub, so no network or API
+key is needed and LLM timings are reproducible.
+
+Each run appends one JSON line per (target, size) to the history file:
+wall time, throughput, p50/p95/p99 latency per stage, and peak RSS. It
+also prints the change against the previous matching entry.
+
+Usage:
+    python tests/pipeline_benchmark.py [--sizes 10,100,1000,10000] [--targets fetch_osint,run_pipeline]
+                                       [--history tests/benchmark_history.jsonl] [--llm-latency fixed:0.05]
+"""
+
+import argparse
+import functools
+import inspect
+import json
+import logging
+import math
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.fixtures.corpus_server import CorpusServer
+
+DEFAULT_HISTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_history.jsonl")
+BENCHMARK_QUERY = "solid state battery supply chain"
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered), math.ceil(pct / 100 * len(ordered))) - 1)
+    return ordered[rank]
+
+
+class StageTimer:
+    """Collects per-call latencies for named pipeline stages."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            self.samples[stage].append(seconds)
+
+    def instrument(self, obj: Any, method: str, stage: str):
+        """Wrap one method on one instance so every call is timed under `stage`."""
+        original = getattr(obj, method)
+        if inspect.iscoroutinefunction(original):
+            @functools.wraps(original)
+            async def timed_async(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await original(*args, **kwargs)
+                finally:
+                    self.record(stage, time.perf_counter() - start)
+            setattr(obj, method, timed_async)
+        else:
+            @functools.wraps(original)
+            def timed(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    self.record(stage, time.perf_counter() - start)
+            setattr(obj, method, timed)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {
+            stage: {
+                'count': len(values),
+                'p50_ms': round(percentile(values, 50) * 1000, 3),
+                'p95_ms': round(percentile(values, 95) * 1000, 3),
+                'p99_ms': round(percentile(values, 99) * 1000, 3),
+            }
+            for stage, values in self.samples.items()
+        }
+
+
+class PeakRSS:
+    """Samples this process's resident set size in the background and keeps the peak."""
+
+    def __init__(self, interval: float = 0.05):
+        import psutil
+        self.process = psutil.Process()
+        self.interval = interval
+        self.start_mb = 0.0
+        self.peak_mb = 0.0
+        self._running = False
+        self._thread = None
+
+    def _rss_mb(self) -> float:
+        return self.process.memory_info().rss / (1024 * 1024)
+
+    def _sample(self):
+        while self._running:
+            self.peak_mb = max(self.peak_mb, self._rss_mb())
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self.start_mb = self.peak_mb = self._rss_mb()
+        self._running = True
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._running = False
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, self._rss_mb())
+
+
+def instrument_ingestor(ingestor, timer: StageTimer):
+    timer.instrument(ingestor.scraper, '_fetch_url', 'fetch')
+    timer.instrument(ingestor, '_parse_item', 'parse')
+    timer.instrument(ingestor.filter, 'is_duplicate', 'dedup')
+
+
+def run_fetch_osint(urls: List[str], timer: StageTimer) -> int:
+    from src.core.ingestion.ingestor import Ingestor
+    ingestor = Ingestor()
+    instrument_ingestor(ingestor, timer)
+    try:
+        return len(ingestor.fetch_osint(urls))
+    finally:
+        ingestor.close()
+
+
+def run_pipeline(urls: List[str], timer: StageTimer) -> int:
+    from src.system_core import Core
+    core = Core()
+    instrument_ingestor(core.ingestor, timer)
+    timer.instrument(core.preprocessor, 'clean_text', 'clean')
+    timer.instrument(core.analyzer, '_generate_with_retry', 'llm_request')
+    timer.instrument(core.vector_db, 'upsert_vectors', 'upsert')
+    try:
+        result = core.run_pipeline({"query": BENCHMARK_QUERY, "source": urls})
+        return result.get("sources_processed", 0)
+    finally:
+        core.ingestor.close()
+
+
+TARGETS = {'fetch_osint': run_fetch_osint, 'run_pipeline': run_pipeline}
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+
+def previous_entry(history: str, target: str, size: int) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(history):
+        return None
+    last = None
+    with open(history) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get('target') == target and entry.get('size') == size:
+                last = entry
+    return last
+
+
+def run_benchmark(sizes: List[int], targets: List[str], history: str, server_options: Dict[str, Any]):
+    revision = git_revision()
+    print("=" * 72)
+    print(" PIPELINE BENCHMARK (offline)")
+    print("=" * 72)
+    for size in sizes:
+        for target in targets:
+            # A fresh server (and fresh pipeline objects) per run so dedup state and caches don't carry over
+            with CorpusServer(size=size, **server_options) as server:
+                timer = StageTimer()
+                with PeakRSS() as rss:
+                    start = time.perf_counter()
+                    items_out = TARGETS[target](server.urls, timer)
+                    wall = time.perf_counter() - start
+
+            entry = {
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'revision': revision,
+                'target': target,
+                'size': size,
+                'config': {**server_options, 'llm_latency': os.environ.get("LLM_STUB_LATENCY"),
+                           'pipeline_mode': os.environ.get("PIPELINE_MODE", "streaming")},
+                'wall_s': round(wall, 3),
+                'throughput_per_s': round(size / wall, 2) if wall else None,
+                'items_out': items_out,
+                'stages': timer.summary(),
+                'start_rss_mb': round(rss.start_mb, 1),
+                'peak_rss_mb': round(rss.peak_mb, 1),
+            }
+            before = previous_entry(history, target, size)
+            with open(history, 'a') as f:
+                f.write(json.dumps(entry) + "\n")
+
+            change = ""
+            if before and before.get('throughput_per_s'):
+                delta = entry['throughput_per_s'] / before['throughput_per_s'] - 1
+                change = f" ({delta:+.1%} vs {before.get('revision') or 'previous'})"
+            print(f"{target:<13} n={size:<6} {wall:8.2f}s  {entry['throughput_per_s']:>9.1f} urls/s{change}  "
+                  f"peak RSS {entry['peak_rss_mb']:.0f} MB  out={items_out}")
+            for stage, stats in entry['stages'].items():
+                print(f"    {stage:<12} n={stats['count']:<6} p50 {stats['p50_ms']:9.2f} ms  "
+                      f"p95 {stats['p95_ms']:9.2f} ms  p99 {stats['p99_ms']:9.2f} ms")
+    print("=" * 72)
+    print(f"History: {history}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default="10,100,1000,10000")
+    parser.add_argument("--targets", default="fetch_osint,run_pipeline")
+    parser.add_argument("--history", default=DEFAULT_HISTORY)
+    parser.add_argument("--paragraphs", type=int, default=12)
+    parser.add_argument("--hosts", type=int, default=16)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.1)
+    parser.add_argument("--slow-ratio", type=float, default=0.01)
+    parser.add_argument("--slow-delay", type=float, default=0.5)
+    parser.add_argument("--fail-ratio", type=float, default=0.01)
+    parser.add_argument("--llm-latency", default="fixed:0.05")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Offline, reproducible environment; anything already set in the shell wins
+    os.environ.setdefault("LLM_BACKEND", "stub")
+    os.environ.setdefault("LLM_STUB_LATENCY", args.llm_latency)
+    os.environ.setdefault("LLM_CACHE", "off")
+    os.environ.setdefault("HTTP_CACHE_DIR", "off")
+    os.environ.setdefault("GEMINI_RPM", "100000")
+    os.environ.setdefault("GEMINI_TPM", "1000000000")
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+
+    server_options = {
+        'paragraphs': args.paragraphs,
+        'hosts': args.hosts,
+        'duplicate_ratio': args.duplicate_ratio,
+        'slow_ratio': args.slow_ratio,
+        'slow_delay': args.slow_delay,
+        'fail_ratio': args.fail_ratio,
+        'seed': args.seed,
+    }
+    run_benchmark(
+        sizes=[int(s) for s in args.sizes.split(",") if s],
+        targets=[t for t in args.targets.split(",") if t],
+        history=args.history,
+        server_options=server_options,
+    )
+
+
+if __name__ == "__main__":
+    main()
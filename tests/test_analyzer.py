@@ -0,0 +1,93 @@
+import json
+import re
+import time
+import unittest
+from unittest import mock
+
+from src.core.analysis import analyzer as analyzer_module
+from tests.fixtures.analyzer import FakeClient, FakeModels, FakeResponse, make_analyzer, memory_cache
+
+
+class BatchModels(FakeModels):
+    """Answers batched prompts with JSON, optionally leaving one document out."""
+
+    def __init__(self, drop_id=None):
+        super().__init__()
+        self.drop_id = drop_id
+
+    def generate_content(self, model, contents):
+        super().generate_content(model, contents)
+        ids = re.findall(r'<document id="(\d+)">\n(\S+)', contents)
+        if not ids:
+            return FakeResponse("single summary")
+        entries = [{"id": doc_id, "summary": f"summary of {word}"} for doc_id, word in ids if doc_id != self.drop_id]
+        return FakeResponse("```json\n" + json.dumps(entries) + "\n```")
+
+
+class TestBatchedSummaries(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = make_analyzer(client=FakeClient(BatchModels()), response_cache=memory_cache("llm_responses"))
+        self.analyzer.batch_summaries = True
+        self.analyzer.batch_max_documents = 10
+
+    def test_batches_cut_request_count(self):
+        documents = [f"doc{i} short news item about topic {i}." for i in range(50)]
+        summaries = self.analyzer.generate_summaries_batch(documents)
+        self.assertEqual(summaries, [f"summary of doc{i}" for i in range(50)])
+        self.assertEqual(self.analyzer.client.models.calls, 5)
+
+        # Batched results are cached under the batch template, not SUMMARY_PROMPT
+        self.assertEqual(self.analyzer.generate_summaries_batch(documents[:20]), summaries[:20])
+        self.assertEqual(self.analyzer.client.models.calls, 5)
+        self.assertEqual(self.analyzer.generate_summary(documents[7]), "single summary")
+        self.assertEqual(self.analyzer.client.models.calls, 6)
+
+    def test_missing_entries_fall_back_to_individual_calls(self):
+        self.analyzer.client.models = BatchModels(drop_id="2")
+        summaries = self.analyzer.generate_summaries_batch(["docA one", "docB two", "docC three"])
+        self.assertEqual(summaries, ["summary of docA", "single summary", "summary of docC"])
+        self.assertEqual(self.analyzer.client.models.calls, 2)
+
+    def test_long_documents_are_summarized_individually(self):
+        self.analyzer.batch_max_tokens = 100
+        summaries = self.analyzer.generate_summaries_batch(["docA " + "x " * 500, "docB short", "docC short"])
+        self.assertEqual(summaries, ["single summary", "summary of docB", "summary of docC"])
+
+
+class TestSearchCache(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = make_analyzer(search_cache=memory_cache("search_results"))
+        self.searches = []
+
+        def fake_search(query, time_filter=None):
+            self.searches.append((query, time_filter))
+            return [] if "blocked" in query else [f"https://example.com/{len(self.searches)}"]
+
+        self.analyzer._duckduckgo_search_selenium = fake_search
+
+    def test_normalized_query_hits_cache(self):
+        first = self.analyzer._search("AI  chips, 2025", time_filter="m")
+        second = self.analyzer._search("ai chips 2025", time_filter="m")
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.searches), 1)
+
+        self.analyzer._search("ai chips 2025", time_filter="d")
+        self.assertEqual(len(self.searches), 2)
+
+    def test_ttl_follows_time_filter(self):
+        with mock.patch.dict(analyzer_module.SEARCH_CACHE_TTLS, {'d': 0.05}):
+            self.analyzer._search("breaking news", time_filter="d")
+            self.analyzer._search("evergreen topic")
+            time.sleep(0.1)
+            self.analyzer._search("breaking news", time_filter="d")
+            self.analyzer._search("evergreen topic")
+        self.assertEqual(len(self.searches), 3)
+
+    def test_empty_results_are_not_cached(self):
+        self.analyzer._search("blocked query")
+        self.analyzer._search("blocked query")
+        self.assertEqual(len(self.searches), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
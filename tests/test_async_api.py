@@ -0,0 +1,170 @@
+import asyncio
+import os
+import threading
+import unittest
+from unittest import mock
+
+from src.core.analysis import rate_limiter
+from src.core.analysis.llm_executor import LLMExecutor
+from src.core.ingestion.ingestor import Ingestor
+from src.utils.async_utils import run_sync
+from tests.fixtures.corpus_server import CorpusServer
+
+PIPELINE_ENV = {
+    "LLM_BACKEND": "stub",
+    "LLM_STUB_LATENCY": "fixed:0.01",
+    "LLM_CACHE": "off",
+    "HTTP_CACHE_DIR": "off",
+    "GEMINI_RPM": "100000",
+}
+
+
+class TestRunSync(unittest.IsolatedAsyncioTestCase):
+    async def test_inside_running_loop_does_not_deadlock(self):
+        async def answer():
+            await asyncio.sleep(0.01)
+            return 42
+
+        self.assertEqual(run_sync(answer()), 42)
+
+    def test_cleanup_runs_on_the_same_loop(self):
+        loops = []
+
+        async def work():
+            loops.append(asyncio.get_running_loop())
+            return "done"
+
+        async def cleanup():
+            loops.append(asyncio.get_running_loop())
+
+        self.assertEqual(run_sync(work(), cleanup=cleanup), "done")
+        self.assertIs(loops[0], loops[1])
+
+
+class TestAsyncAPI(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = CorpusServer(size=24, hosts=3, duplicate_ratio=0.0, slow_ratio=0.0, fail_ratio=0.0, seed=4)
+        cls.urls = cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    async def test_async_ingestion_keeps_session_until_closed(self):
+        ingestor = Ingestor()
+        try:
+            items = await ingestor.afetch_osint(self.urls[:6])
+            self.assertEqual(sum(item["status"] == "success" for item in items), 6)
+            session = ingestor.scraper.scheduler._session
+            scraped = await ingestor.scraper.ascrape_osint_sources(self.urls[6:8])
+            self.assertEqual([item["status_code"] for item in scraped], [200, 200])
+            self.assertIs(ingestor.scraper.scheduler._session, session)
+        finally:
+            await ingestor.scraper.aclose()
+            ingestor.close()
+        self.assertIsNone(ingestor.scraper.scheduler._session)
+
+    def test_sync_wrappers_reuse_the_session(self):
+        ingestor = Ingestor()
+        try:
+            self.assertEqual(len(ingestor.scraper.scrape_osint_sources(self.urls[:2])), 2)
+            session = ingestor.scraper.scheduler._session
+            self.assertFalse(session.closed)
+            self.assertEqual(len(ingestor.fetch_osint(self.urls[2:4])), 2)
+            self.assertIs(ingestor.scraper.scheduler._session, session)
+        finally:
+            ingestor.close()
+        self.assertTrue(session.closed)
+        self.assertFalse(ingestor.scraper.scheduler.has_open_session)
+
+    def test_helper_loop_session_is_closed_and_background_session_kept(self):
+        ingestor = Ingestor()
+        scheduler = ingestor.scraper.scheduler
+        sessions = []
+        get_session = scheduler.get_session
+
+        async def recording_get_session():
+            session = await get_session()
+            sessions.append(session)
+            return session
+
+        async def sync_call_on_background_loop():
+            # The sync API called from the background loop runs on a helper loop
+            return ingestor.fetch_osint(self.urls[2:4])
+
+        scheduler.get_session = recording_get_session
+        try:
+            self.assertEqual(len(ingestor.fetch_osint(self.urls[:2])), 2)
+            background = sessions[-1]
+            self.assertEqual(len(run_sync(sync_call_on_background_loop())), 2)
+            helper = sessions[-1]
+            self.assertIsNot(helper, background)
+            self.assertTrue(helper.closed)
+            self.assertFalse(background.closed)
+            self.assertEqual(len(ingestor.fetch_osint(self.urls[4:6])), 2)
+            self.assertIs(sessions[-1], background)
+        finally:
+            ingestor.close()
+        self.assertTrue(background.closed)
+
+    async def test_concurrent_pipelines_on_one_loop(self):
+        from src.system_core import Core
+        with mock.patch.dict(os.environ, PIPELINE_ENV), \
+                mock.patch.dict(rate_limiter._shared_limiters, clear=True):
+            cores = [Core() for _ in range(3)]
+            try:
+                results = await asyncio.gather(*[
+                    core.arun_pipeline({"source": self.urls[i * 8:(i + 1) * 8]}) for i, core in enumerate(cores)
+                ])
+            finally:
+                for core in cores:
+                    await core.aclose()
+                    core.ingestor.close()
+        self.assertEqual([r["status"] for r in results], ["completed"] * 3)
+        self.assertEqual([r["sources_processed"] for r in results], [8, 8, 8])
+        self.assertTrue(all(r["executive_report"] for r in results))
+
+    async def test_cancelling_one_pipeline_leaves_others_running(self):
+        from src.system_core import Core
+        env = {**PIPELINE_ENV, "LLM_STUB_LATENCY": "fixed:0.05", "SUMMARY_BATCH": "off",
+               "PIPELINE_WORKERS": "summarize=2"}
+        executor = LLMExecutor(max_in_flight=1)
+        with mock.patch.dict(os.environ, env), mock.patch.dict(rate_limiter._shared_limiters, clear=True):
+            cores = [Core() for _ in range(2)]
+            for core in cores:
+                core.analyzer.llm_executor = executor
+                core.analyzer.summarizer.executor = executor
+            async def wait_for_queued(count):
+                for _ in range(500):
+                    if executor.get_stats()["queued"] >= count:
+                        return
+                    await asyncio.sleep(0.01)
+
+            # Hold the only LLM worker so both pipelines' calls stay queued until the cancel
+            gate = threading.Event()
+            blocker = executor.submit(gate.wait, 5)
+            try:
+                cancelled = asyncio.ensure_future(cores[0].arun_pipeline({"source": self.urls[:8]}))
+                await wait_for_queued(2)
+                kept = asyncio.ensure_future(cores[1].arun_pipeline({"source": self.urls[8:16]}))
+                await wait_for_queued(4)
+                cancelled.cancel()
+                gate.set()
+                with self.assertRaises(asyncio.CancelledError):
+                    await cancelled
+                result = await kept
+            finally:
+                gate.set()
+                blocker.result(timeout=5)
+                for core in cores:
+                    await core.aclose()
+                    core.ingestor.close()
+                executor.shutdown()
+        self.assertGreaterEqual(executor.get_stats()["cancelled"], 1)
+        self.assertEqual(result["sources_processed"], 8)
+        self.assertFalse(any("Error" in item["summary"] for item in result["detailed_results"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
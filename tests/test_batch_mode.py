@@ -0,0 +1,110 @@
+import os
+import unittest
+from unittest import mock
+
+from src.core.analysis import rate_limiter
+from src.utils.urls import canonicalize_url
+from tests.fixtures.corpus_server import CorpusServer
+
+PIPELINE_ENV = {
+    "LLM_BACKEND": "stub",
+    "LLM_STUB_LATENCY": "fixed:0.01",
+    "LLM_CACHE": "off",
+    "HTTP_CACHE_DIR": "off",
+    "GEMINI_RPM": "100000",
+}
+
+
+class TestCanonicalizeURL(unittest.TestCase):
+    def test_equivalent_links_compare_equal(self):
+        canonical = canonicalize_url("https://example.com/news/story?b=2&a=1")
+        for variant in (
+            "HTTPS://Example.COM:443/news/story/?a=1&b=2",
+            "https://example.com/news/story?a=1&utm_source=x&b=2#comments",
+            "https://example.com/news/story?fbclid=abc&b=2&a=1",
+        ):
+            self.assertEqual(canonicalize_url(variant), canonical)
+        self.assertEqual(canonical, "https://example.com/news/story?a=1&b=2")
+
+    def test_meaningful_differences_are_kept(self):
+        self.assertNotEqual(canonicalize_url("http://example.com/a"), canonicalize_url("https://example.com/a"))
+        self.assertNotEqual(canonicalize_url("http://example.com/a?id=1"), canonicalize_url("http://example.com/a?id=2"))
+        self.assertEqual(canonicalize_url("http://example.com:8080"), "http://example.com:8080/")
+        self.assertEqual(canonicalize_url(" not a url "), "not a url")
+
+
+class TestRunBatch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = CorpusServer(size=30, hosts=3, duplicate_ratio=0.0, slow_ratio=0.0, fail_ratio=0.0, seed=6)
+        cls.urls = cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def make_core(self):
+        from src.system_core import Core
+        with mock.patch.dict(os.environ, PIPELINE_ENV), \
+                mock.patch.dict(rate_limiter._shared_limiters, clear=True):
+            core = Core()
+        core.relevance_threshold = 0.0
+        self.addCleanup(core.ingestor.close)
+        return core
+
+    def test_overlapping_queries_share_fetches_and_summaries(self):
+        # Three queries over 20 URLs each; they overlap heavily and spell some URLs differently
+        sources = {
+            "grid storage": self.urls[0:20],
+            "battery research": [url + "?utm_source=feed" for url in self.urls[5:25]],
+            "semiconductor threat": [url + "#top" for url in self.urls[10:30]],
+        }
+        core = self.make_core()
+        batch = core.run_batch(list(sources), sources)
+
+        self.assertEqual(batch["planned_sources"], 60)
+        self.assertEqual(batch["unique_sources"], 30)
+        self.assertEqual(batch["metrics"]["stages"]["fetch"]["in"], 30)
+        self.assertEqual(batch["sources_processed"], 30)
+        for query, result in batch["results"].items():
+            self.assertEqual(result["status"], "completed")
+            self.assertEqual(result["sources_processed"], 20)
+            self.assertTrue(result["executive_report"])
+        # A page shared by all three queries is reported to each with its own relevance
+        shared = self.urls[12]
+        relevances = {
+            query: next(i["relevance"] for i in result["detailed_results"] if canonicalize_url(i["url"]) == shared)
+            for query, result in batch["results"].items()
+        }
+        self.assertEqual(set(relevances), set(sources))
+
+        # Running the queries one by one fetches and summarizes every overlapping page again
+        separate_fetches = separate_calls = 0
+        for query, urls in sources.items():
+            single = self.make_core()
+            result = single.run_pipeline({"query": query, "source": urls})
+            separate_fetches += result["metrics"]["stages"]["fetch"]["in"]
+            separate_calls += single.analyzer.client.calls
+        self.assertEqual(separate_fetches, 60)
+        self.assertLess(core.analyzer.client.calls, separate_calls)
+
+    def test_off_topic_pages_are_dropped_per_query(self):
+        core = self.make_core()
+        core.relevance_threshold = 0.5
+        batch = core.run_batch(["zzz unmatched topic"], {"zzz unmatched topic": self.urls[:5]})
+        result = batch["results"]["zzz unmatched topic"]
+        self.assertEqual(result["sources_processed"], 0)
+        self.assertEqual(result["executive_report"], "No data gathered.")
+        self.assertEqual(core.analyzer.client.calls, 0)
+
+    def test_queries_without_sources_report_errors(self):
+        core = self.make_core()
+        with mock.patch.object(core.analyzer, "generate_plans", return_value={"q2": []}) as plans:
+            batch = core.run_batch(["q1", "q2"], {"q1": self.urls[:2]})
+        plans.assert_called_once_with(["q2"])
+        self.assertEqual(batch["results"]["q2"]["status"], "error")
+        self.assertEqual(batch["results"]["q1"]["sources_processed"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
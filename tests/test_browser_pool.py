@@ -0,0 +1,88 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from src.core.analysis.browser_pool import BrowserPool
+
+
+class FakeDriver:
+    launched = 0
+
+    def __init__(self):
+        FakeDriver.launched += 1
+        self.alive = True
+        self.quit_called = False
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise RuntimeError("browser crashed")
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+class TestBrowserPool(unittest.TestCase):
+    def setUp(self):
+        FakeDriver.launched = 0
+        self.pool = BrowserPool(size=2, max_uses=3, driver_factory=FakeDriver)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_reuses_warm_driver(self):
+        for _ in range(2):
+            with self.pool.driver():
+                pass
+        self.assertEqual(FakeDriver.launched, 1)
+
+    def test_recycles_after_max_uses(self):
+        first = None
+        for _ in range(3):
+            with self.pool.driver() as driver:
+                first = first or driver
+        self.assertTrue(first.quit_called)
+        self.assertEqual(self.pool.recycled, 1)
+        with self.pool.driver() as driver:
+            self.assertIsNot(driver, first)
+
+    def test_unhealthy_and_failed_drivers_are_replaced(self):
+        with self.pool.driver() as driver:
+            pass
+        driver.alive = False
+        with self.pool.driver() as replacement:
+            self.assertIsNot(replacement, driver)
+        with self.assertRaises(ValueError):
+            with self.pool.driver():
+                raise ValueError("search failed")
+        self.assertEqual(self.pool.created, 0)
+
+    def test_bounds_concurrent_browsers(self):
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def search(_):
+            with self.pool.driver():
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                time.sleep(0.02)
+                with lock:
+                    active[0] -= 1
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            list(executor.map(search, range(12)))
+        self.assertLessEqual(peak[0], 2)
+        self.assertLessEqual(self.pool.created, 2)
+
+    def test_acquire_times_out_when_exhausted(self):
+        held = [self.pool.acquire(), self.pool.acquire()]
+        with self.assertRaises(TimeoutError):
+            self.pool.acquire(timeout=0.1)
+        for driver in held:
+            self.pool.release(driver)
+
+
+if __name__ == "__main__":
+    unittest.main()
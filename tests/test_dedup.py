@@ -0,0 +1,133 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src.axis.filters.content_filter import Filter
+from src.axis.filters.near_duplicate import SimHashIndex
+from tests.fixtures.html_corpus import generate_corpus
+from src.axis.parsers.data_parser import Parser
+from src.storage.dedup_store import DEFAULT_CAPACITY, DigestSetStore, ScalableBloomFilter, MmapBloomStore, create_dedup_store
+
+
+class TestNearDuplicates(unittest.TestCase):
+    def setUp(self):
+        parser = Parser()
+        self.articles = [parser.extract_article_content(html, '')['content'] for html in generate_corpus(5)]
+
+    def test_syndicated_copy_is_filtered(self):
+        content_filter = Filter()
+        seen = set()
+        original = {'url': 'https://a.example/story', 'content': self.articles[0]}
+        syndicated = {
+            'url': 'https://b.example/story',
+            'content': "Reposted from our partners. " + self.articles[0] + " Share this story.",
+        }
+        self.assertFalse(content_filter.is_duplicate(original, seen))
+        self.assertTrue(content_filter.is_duplicate(syndicated, seen))
+
+    def test_distinct_articles_are_kept(self):
+        content_filter = Filter()
+        seen = set()
+        for i, content in enumerate(self.articles):
+            self.assertFalse(content_filter.is_duplicate({'url': f'https://x.example/{i}', 'content': content}, seen))
+
+    def test_capacity_evicts_oldest(self):
+        index = SimHashIndex(max_distance=3, capacity=2)
+        fingerprints = [index.fingerprint(text) for text in self.articles[:3]]
+        for fingerprint in fingerprints:
+            index.add(fingerprint)
+        self.assertEqual(len(index), 2)
+        self.assertIsNone(index.find(fingerprints[0]))
+        self.assertEqual(index.find(fingerprints[2]), fingerprints[2])
+
+
+class TestDedupStores(unittest.TestCase):
+    def test_digest_set_is_bounded(self):
+        store = DigestSetStore(capacity=100)
+        for i in range(1000):
+            store.add(f"key-{i}")
+        self.assertLessEqual(len(store), 100)
+        self.assertIn("key-999", store)
+        self.assertNotIn("key-0", store)
+
+    def test_default_store_is_bounded(self):
+        with mock.patch.dict(os.environ, {}, clear=True):
+            store = create_dedup_store()
+        self.assertIsInstance(store, DigestSetStore)
+        self.assertEqual(store.capacity, DEFAULT_CAPACITY)
+
+    def test_scalable_bloom_grows_within_error_rate(self):
+        store = ScalableBloomFilter(initial_capacity=1000, error_rate=0.01)
+        for i in range(10_000):
+            store.add(f"seen-{i}")
+        self.assertTrue(all(f"seen-{i}" in store for i in range(10_000)))
+        false_positives = sum(f"unseen-{i}" in store for i in range(10_000))
+        self.assertLess(false_positives / 10_000, 0.01)
+
+    def test_mmap_store_survives_reopen(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "dedup.bloom")
+            store = MmapBloomStore(path, capacity=10_000)
+            store.add("https://example.com/a")
+            store.close()
+            size = os.path.getsize(path)
+
+            reopened = MmapBloomStore(path, capacity=10_000)
+            self.assertIn("https://example.com/a", reopened)
+            self.assertNotIn("https://example.com/b", reopened)
+            self.assertEqual(len(reopened), 1)
+            reopened.close()
+            self.assertEqual(os.path.getsize(path), size)
+
+    def test_capped_bloom_keeps_recent_keys(self):
+        store = ScalableBloomFilter(initial_capacity=100, error_rate=0.01, capacity=1000)
+        for i in range(10_000):
+            store.add(f"seen-{i}")
+        self.assertLessEqual(len(store), 1000)
+        self.assertTrue(all(f"seen-{i}" in store for i in range(9_500, 10_000)))
+        self.assertLess(sum(f"seen-{i}" in store for i in range(1000)), 50)
+        with mock.patch.dict(os.environ, {"DEDUP_CAPACITY": "1000"}):
+            self.assertEqual(create_dedup_store('bloom').capacity, 1000)
+
+    def test_mmap_store_rotates_generations(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "dedup.bloom")
+            store = MmapBloomStore(path, capacity=1000, error_rate=0.01)
+            size = os.path.getsize(path)
+            for i in range(5000):
+                store.add(f"seen-{i}")
+            self.assertLessEqual(len(store), 1000)
+            self.assertTrue(all(f"seen-{i}" in store for i in range(4_500, 5000)))
+            false_positives = sum(f"unseen-{i}" in store for i in range(10_000))
+            self.assertLess(false_positives / 10_000, 0.01)
+            store.close()
+            # Both generation files keep their creation size
+            self.assertEqual(os.path.getsize(path), size)
+            self.assertEqual(os.path.getsize(path + ".prev"), size)
+
+            reopened = MmapBloomStore(path, capacity=1000, error_rate=0.01)
+            self.assertIn("seen-4999", reopened)
+            self.assertEqual(len(reopened), len(store))
+            reopened.close()
+
+    def test_mmap_fallback_is_bounded(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "not-a-store")
+            with open(path, 'wb') as f:
+                f.write(b"x" * 64)
+            with mock.patch.dict(os.environ, {"DEDUP_CAPACITY": "1000"}):
+                store = create_dedup_store('mmap', path)
+        self.assertIsInstance(store, DigestSetStore)
+        self.assertEqual(store.capacity, 1000)
+
+    def test_filter_accepts_store(self):
+        content_filter = Filter()
+        store = ScalableBloomFilter()
+        item = {'url': 'https://example.com/a', 'content': "word " * 100}
+        self.assertFalse(content_filter.is_duplicate(item, store))
+        self.assertTrue(content_filter.is_duplicate(item, store))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+import os
+import subprocess
+import sys
+import unittest
+from unittest import mock
+
+from src.core.analysis import rate_limiter
+from src.models.embeddings.pinecone_handler import PineconeHandler, content_digest
+from src.storage.persistent_cache import PersistentCache
+from src.utils.urls import document_id
+from tests.fixtures.corpus_server import CorpusServer
+
+PIPELINE_ENV = {
+    "LLM_BACKEND": "stub",
+    "LLM_STUB_LATENCY": "fixed:0",
+    "LLM_CACHE": "off",
+    "HTTP_CACHE_DIR": "off",
+    "GEMINI_RPM": "100000",
+}
+
+
+class FakeIndex:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.batches = []
+
+    def upsert_records(self, namespace, records):
+        if self.fail:
+            raise RuntimeError("index unavailable")
+        self.batches.append([record["id"] for record in records])
+
+    def describe_index_stats(self):
+        stored = sum(len(batch) for batch in self.batches)
+        return {"namespaces": {"intelligence": {"vector_count": stored}} if stored else {}}
+
+
+class FakePinecone:
+    def __init__(self, host: str):
+        self.host = host
+
+    def describe_index(self, name):
+        return mock.Mock(host=self.host)
+
+
+def make_handler(index=None):
+    with mock.patch.dict(os.environ, {"PINECONE_API_KEY": ""}):
+        handler = PineconeHandler(registry=PersistentCache("vector_index", path=":memory:"))
+    handler.index = index or FakeIndex()
+    return handler
+
+
+class TestDocumentIds(unittest.TestCase):
+    def test_ids_are_stable_across_interpreters(self):
+        url = "https://example.com/report?id=7"
+        code = "from src.utils.urls import document_id; print(document_id('https://example.com/report?id=7'))"
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        ids = {
+            subprocess.check_output([sys.executable, "-c", code], cwd=root, text=True,
+                                    env={**os.environ, "PYTHONHASHSEED": seed}).strip()
+            for seed in ("1", "2")
+        }
+        self.assertEqual(ids, {document_id(url)})
+        self.assertRegex(document_id(url), r"^doc_[0-9a-f]{32}$")
+
+    def test_equivalent_urls_share_an_id(self):
+        self.assertEqual(document_id("https://Example.com/a/?utm_medium=x#top"), document_id("https://example.com/a"))
+        self.assertNotEqual(document_id("https://example.com/a"), document_id("https://example.com/b"))
+
+
+class TestSkipUnchanged(unittest.TestCase):
+    def test_only_new_or_changed_documents_are_upserted(self):
+        handler = make_handler()
+        vectors = [(document_id(f"https://example.com/{i}"), f"text {i}", {}) for i in range(3)]
+        self.assertTrue(handler.upsert_vectors(vectors))
+        self.assertTrue(handler.upsert_vectors(vectors))
+        changed = vectors[:2] + [(vectors[2][0], "text 2, updated", {})]
+        self.assertTrue(handler.upsert_vectors(changed))
+
+        self.assertEqual(handler.index.batches, [[v[0] for v in vectors], [vectors[2][0]]])
+        self.assertEqual(handler.skipped_unchanged, 5)
+        self.assertTrue(handler.is_stored(vectors[2][0], "text 2, updated"))
+
+    def test_failed_upserts_are_not_recorded(self):
+        handler = make_handler(FakeIndex(fail=True))
+        vectors = [("doc_a", "alpha", {})]
+        self.assertFalse(handler.upsert_vectors(vectors))
+        handler.index.fail = False
+        self.assertTrue(handler.upsert_vectors(vectors))
+        self.assertEqual(handler.index.batches, [["doc_a"]])
+
+    def test_registry_is_keyed_by_index_and_namespace(self):
+        registry = PersistentCache("vector_index", path=":memory:")
+        with mock.patch.dict(os.environ, {"PINECONE_API_KEY": ""}):
+            first = PineconeHandler(index_name="a", registry=registry)
+            other = PineconeHandler(index_name="b", registry=registry)
+        first.index, other.index = FakeIndex(), FakeIndex()
+        first.upsert_vectors([("doc_a", "alpha", {})])
+        self.assertTrue(first.is_stored("doc_a", "alpha"))
+        self.assertFalse(other.is_stored("doc_a", "alpha"))
+
+    def test_registry_is_cleared_when_index_is_recreated_or_empty(self):
+        handler = make_handler()
+        handler.pc = FakePinecone("idx-1.pinecone.io")
+        handler._validate_registry()
+        handler.upsert_vectors([("doc_a", "alpha", {})])
+
+        # Same index, still holding the record: entries are kept
+        handler._validate_registry()
+        self.assertTrue(handler.is_stored("doc_a", "alpha"))
+
+        # Recreated under the same name: a new host
+        handler.pc = FakePinecone("idx-2.pinecone.io")
+        handler._validate_registry()
+        self.assertFalse(handler.is_stored("doc_a", "alpha"))
+
+        # Emptied namespace
+        handler.upsert_vectors([("doc_a", "alpha", {})])
+        handler.index = FakeIndex()
+        handler._validate_registry()
+        self.assertFalse(handler.is_stored("doc_a", "alpha"))
+
+        handler.index.upsert_records("intelligence", [{"id": "doc_a", "text": "alpha"}])
+        handler.upsert_vectors([("doc_b", "beta", {})])
+        with mock.patch.dict(os.environ, {"VECTOR_REGISTRY_RESET": "1"}):
+            handler._validate_registry()
+        self.assertFalse(handler.is_stored("doc_b", "beta"))
+
+    def test_digest_covers_only_stored_text(self):
+        self.assertEqual(content_digest("x" * 9000), content_digest("x" * 8000 + "y"))
+
+
+class TestIdempotentPipeline(unittest.TestCase):
+    def test_rerun_over_same_sources_upserts_nothing(self):
+        from src.system_core import Core
+        with CorpusServer(size=12, hosts=2, duplicate_ratio=0.0, slow_ratio=0.0, fail_ratio=0.0, seed=8) as server, \
+                mock.patch.dict(os.environ, PIPELINE_ENV), \
+                mock.patch.dict(rate_limiter._shared_limiters, clear=True):
+            handler = make_handler()
+            results = []
+            for _ in range(2):
+                # A fresh Core per run, as a new process would have
+                core = Core()
+                core.vector_db = handler
+                results.append(core.run_pipeline({"source": server.urls}))
+                core.ingestor.close()
+
+        self.assertEqual(results[0]["sources_processed"], 12)
+        self.assertEqual(results[1]["sources_processed"], 12)
+        upserted = [doc_id for batch in handler.index.batches for doc_id in batch]
+        self.assertEqual(sorted(upserted), sorted(document_id(url) for url in server.urls))
+        self.assertEqual(handler.skipped_unchanged, 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
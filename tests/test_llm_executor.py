@@ -0,0 +1,147 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import CancelledError
+
+from src.core.analysis.llm_executor import LLMExecutor, cancel_scope
+from src.core.analysis.llm_stub import StubLLMClient
+from tests.fixtures.analyzer import make_analyzer
+
+
+class TestLLMExecutor(unittest.TestCase):
+    def setUp(self):
+        self.executor = LLMExecutor(max_in_flight=3)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_in_flight_cap_and_queue_metrics(self):
+        results = self.executor.map(lambda i: time.sleep(0.03) or i * 2, range(10))
+        self.assertEqual(results, [i * 2 for i in range(10)])
+        stats = self.executor.get_stats()
+        self.assertEqual(stats['peak_in_flight'], 3)
+        self.assertGreaterEqual(stats['max_queue_depth'], 7)
+        self.assertEqual((stats['completed'], stats['queued'], stats['in_flight']), (10, 0, 0))
+
+    def test_nested_work_runs_inline(self):
+        executor = LLMExecutor(max_in_flight=1)
+        try:
+            self.assertEqual(executor.run(lambda: executor.map(lambda i: i + 1, [1, 2])), [2, 3])
+        finally:
+            executor.shutdown()
+
+    def test_failures_are_counted(self):
+        with self.assertRaises(ValueError):
+            self.executor.run(lambda: int("x"))
+        self.assertEqual(self.executor.get_stats()['failed'], 1)
+
+    def test_cancel_pending_is_cooperative(self):
+        started = threading.Event()
+        observed = []
+
+        def long_call():
+            started.set()
+            while not self.executor.should_stop():
+                time.sleep(0.01)
+            observed.append("stopped")
+            raise CancelledError()
+
+        running = [self.executor.submit(long_call) for _ in range(3)]
+        queued = [self.executor.submit(time.sleep, 0) for _ in range(4)]
+        started.wait(1)
+        self.assertEqual(self.executor.cancel_pending(), 4)
+        for future in running + queued:
+            with self.assertRaises(CancelledError):
+                future.result(timeout=1)
+        self.assertEqual(observed, ["stopped"] * 3)
+        stats = self.executor.get_stats()
+        self.assertEqual((stats['cancelled'], stats['queued'], stats['in_flight']), (7, 0, 0))
+        # Work submitted after the cancel runs normally
+        self.assertEqual(self.executor.run(lambda: "fresh"), "fresh")
+
+    def test_cancel_token_only_affects_its_own_work(self):
+        executor = LLMExecutor(max_in_flight=1)
+        gate = threading.Event()
+        calls = []
+        try:
+            blocker = executor.submit(gate.wait, 1)
+            with cancel_scope() as mine:
+                queued = [executor.submit(calls.append, "mine") for _ in range(2)]
+            other = executor.submit(calls.append, "other")
+            self.assertEqual(executor.cancel_pending(mine), 2)
+            gate.set()
+            self.assertTrue(blocker.result(timeout=1))
+            other.result(timeout=1)
+            for future in queued:
+                with self.assertRaises(CancelledError):
+                    future.result(timeout=1)
+        finally:
+            executor.shutdown()
+        self.assertEqual(calls, ["other"])
+
+    def test_cancelling_a_token_stops_running_work_and_children(self):
+        started = threading.Event()
+
+        def long_call():
+            started.set()
+            while not self.executor.should_stop():
+                time.sleep(0.01)
+            raise CancelledError()
+
+        with cancel_scope() as run:
+            with cancel_scope() as stage:
+                running = self.executor.submit(long_call)
+        started.wait(1)
+        self.executor.cancel_pending(run)
+        with self.assertRaises(CancelledError):
+            running.result(timeout=1)
+        self.assertTrue(stage.cancelled)
+        # Orchestration under a cancelled token starts nothing new
+        with cancel_scope(stage), self.assertRaises(CancelledError):
+            self.executor.fan_out(lambda i: i, [1, 2])
+        self.assertEqual(self.executor.run(lambda: "fresh"), "fresh")
+
+    def test_cancelling_the_awaiting_task_drops_queued_work(self):
+        executor = LLMExecutor(max_in_flight=1)
+        calls = []
+
+        async def scenario():
+            blocker = asyncio.ensure_future(executor.run_async(time.sleep, 0.1))
+            waiter = asyncio.ensure_future(executor.run_async(calls.append, "ran"))
+            await asyncio.sleep(0.02)
+            waiter.cancel()
+            await blocker
+            with self.assertRaises(asyncio.CancelledError):
+                await waiter
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            executor.shutdown()
+        self.assertEqual(calls, [])
+        self.assertEqual(executor.get_stats()['cancelled'], 1)
+
+    def test_analyzer_model_calls_respect_cap(self):
+        analyzer = make_analyzer(client=StubLLMClient(latency="fixed:0.02"), llm_executor=self.executor)
+        analyzer.batch_summaries = False
+        summaries = analyzer.generate_summaries_batch([f"document {i} about grids" for i in range(9)])
+        self.assertEqual(len(summaries), 9)
+        self.assertEqual(analyzer.client.peak_in_flight, 3)
+        self.assertEqual(self.executor.get_stats()['completed'], 9)
+
+    def test_chunk_calls_of_long_documents_fan_out(self):
+        analyzer = make_analyzer(client=StubLLMClient(latency="fixed:0.05"), llm_executor=self.executor)
+        analyzer.summarizer.chunk_tokens = 200
+        analyzer.batch_summaries = False
+        long_docs = ["\n\n".join(f"Section {i} of {name}. " + "detail " * 120 for i in range(6))
+                     for name in ("alpha", "beta")]
+        summaries = analyzer.generate_summaries_batch(long_docs)
+        self.assertEqual(len(summaries), 2)
+        # Chunk requests from both documents share the pool instead of running one by one
+        self.assertEqual(analyzer.client.peak_in_flight, 3)
+        self.assertEqual(self.executor.get_stats()['peak_in_flight'], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
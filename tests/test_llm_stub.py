@@ -0,0 +1,105 @@
+import json
+import os
+import time
+import unittest
+import urllib.error
+import urllib.request
+from unittest import mock
+
+from src.core.analysis.analyzer import Analyzer
+from src.core.analysis.llm_stub import StubAPIError, StubLLMClient, StubLLMServer
+from src.core.analysis.rate_limiter import RateLimiter
+
+
+def post_json(url, payload):
+    request = urllib.request.Request(url, data=json.dumps(payload).encode(), headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return response.status, json.loads(response.read())
+
+
+class TestStubLLMClient(unittest.TestCase):
+    def make_analyzer(self, client):
+        with mock.patch.dict(os.environ, {"LLM_BACKEND": "stub"}):
+            analyzer = Analyzer()
+        self.assertIsInstance(analyzer.client, StubLLMClient)
+        analyzer.client = client
+        analyzer.response_cache = None
+        analyzer.rate_limiter = RateLimiter(requests_per_minute=60000)
+        return analyzer
+
+    def test_outputs_are_deterministic(self):
+        first = StubLLMClient(seed=1).models.generate_content(model="m", contents="Summarize quantum sensors").text
+        second = StubLLMClient(seed=2).models.generate_content(model="m", contents="Summarize quantum sensors").text
+        self.assertEqual(first, second)
+        self.assertIn("### 1. Intelligence Extraction", first)
+
+    def test_structured_prompts_get_structured_answers(self):
+        analyzer = self.make_analyzer(StubLLMClient())
+        patterns = analyzer.detect_patterns("Ransomware hit hospitals. Ransomware crews demand payment.")
+        self.assertEqual(patterns[0]["pattern"], "Recurring focus on ransomware")
+        summaries = analyzer.generate_summaries_batch(["solar panels installed", "wind farms expanded"])
+        self.assertIn("solar", summaries[0])
+        self.assertIn("wind", summaries[1])
+        self.assertEqual(analyzer.client.calls, 2)
+
+    def test_injected_errors_exercise_retries(self):
+        client = StubLLMClient(error_rate_429=0.3, retry_delay=0.01, seed=3)
+        analyzer = self.make_analyzer(client)
+        results = [analyzer.generate_summary(f"document {i}") for i in range(20)]
+        self.assertGreater(client.errors[429], 0)
+        self.assertGreater(analyzer.rate_limiter.throttle_count, 0)
+        self.assertGreater(sum(r.startswith("###") for r in results), 15)
+
+    def test_error_injection_is_reproducible(self):
+        def run():
+            client = StubLLMClient(error_rate_429=0.3, error_rate_503=0.2, seed=7)
+            outcomes = []
+            for i in range(30):
+                try:
+                    client.complete(f"prompt {i % 10}")
+                    outcomes.append(None)
+                except StubAPIError as e:
+                    outcomes.append(e.code)
+            return outcomes
+
+        first = run()
+        self.assertEqual(first, run())
+        self.assertTrue({429, 503} <= set(first))
+
+    def test_latency_distribution(self):
+        client = StubLLMClient(latency="uniform:0.02:0.04")
+        start = time.monotonic()
+        client.complete("ping")
+        self.assertGreaterEqual(time.monotonic() - start, 0.02)
+
+
+class TestStubLLMServer(unittest.TestCase):
+    def setUp(self):
+        self.client = StubLLMClient(error_rate_429=0.0)
+        self.server = StubLLMServer(self.client)
+        self.base_url = self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_generate_content_rest_shape(self):
+        status, body = post_json(
+            f"{self.base_url}/v1beta/models/gemini-2.0-flash:generateContent",
+            {"contents": [{"parts": [{"text": "Summarize grid storage"}]}]},
+        )
+        self.assertEqual(status, 200)
+        text = body["candidates"][0]["content"]["parts"][0]["text"]
+        self.assertEqual(text, StubLLMClient.respond("Summarize grid storage"))
+
+    def test_injected_429_is_gemini_shaped(self):
+        self.client.error_rate_429 = 1.0
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            post_json(f"{self.base_url}/v1beta/models/m:generateContent",
+                      {"contents": [{"parts": [{"text": "x"}]}]})
+        self.assertEqual(ctx.exception.code, 429)
+        error = json.loads(ctx.exception.read())["error"]
+        self.assertEqual(error["status"], "RESOURCE_EXHAUSTED")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import unittest
+
+from src.axis.parsers.data_parser import Parser
+from src.core.ingestion.ingestor import Ingestor
+from src.core.ingestion.parallel_parser import ParallelParser
+from tests.fixtures.html_corpus import generate_article, generate_corpus
+
+
+class TestParser(unittest.TestCase):
+    def test_single_parse_matches_html_parser(self):
+        html = generate_article(3)
+        fast = Parser().extract_article_content(html, "https://example.com/3")
+        reference = Parser(features='html.parser').extract_article_content(html, "https://example.com/3")
+        self.assertEqual(fast, reference)
+        self.assertTrue(fast['title'].startswith("Article 3:"))
+        self.assertEqual(fast['author'], "Analyst 3")
+        self.assertEqual(fast['metadata']['type'], "article")
+        self.assertNotIn("newsletter", fast['content'])
+
+    def test_empty_title_tag_falls_back_to_h1(self):
+        html = "<html><head><title></title></head><body><h1>Headline</h1></body></html>"
+        self.assertEqual(Parser().extract_article_content(html, '')['title'], "Headline")
+
+
+    def test_parallel_parse_ordered_and_unordered(self):
+        corpus = generate_corpus(10, paragraphs=3)
+        documents = [(html, f"https://example.com/{i}") for i, html in enumerate(corpus)]
+        expected = [Parser().extract_article_content(html, url) for html, url in documents]
+        pool = ParallelParser(max_workers=2, chunk_size=3)
+        try:
+            ordered = list(pool.parse_batch(documents, ordered=True))
+            self.assertEqual([index for index, _ in ordered], list(range(10)))
+            self.assertEqual([article for _, article in ordered], expected)
+
+            unordered = dict(pool.parse_batch(documents, ordered=False))
+            self.assertEqual([unordered[i] for i in range(10)], expected)
+        finally:
+            pool.close()
+
+    def test_failed_fetch_cancels_pending_chunk_parses(self):
+        ingestor = Ingestor(parse_workers=0)
+        started, cancelled = asyncio.Event(), []
+
+        class SlowPool:
+            chunk_size = 1
+
+            async def parse_chunk_async(self, chunk):
+                started.set()
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(chunk[0][0])
+                    raise
+
+        async def failing_fetch(urls):
+            yield {'index': 0, 'url': urls[0], 'status_code': 200, 'html': generate_article(0)}
+            await started.wait()
+            raise RuntimeError("connection reset")
+
+        ingestor.parallel_parser = SlowPool()
+        ingestor.scraper.iter_fetch = failing_fetch
+        with self.assertRaises(RuntimeError):
+            asyncio.run(ingestor._fetch_and_parse_async(["https://example.com/0", "https://example.com/1"]))
+        self.assertEqual(cancelled, [0])
+
+    def test_pool_failure_parses_off_the_event_loop(self):
+        ingestor = Ingestor(parse_workers=0)
+        threads = []
+
+        class BrokenPool:
+            async def parse_chunk_async(self, chunk):
+                raise RuntimeError("pool crashed")
+
+        parse = ingestor.parser.extract_article_content
+
+        def recording_parse(html, url):
+            threads.append(threading.get_ident())
+            return parse(html, url)
+
+        ingestor.parallel_parser = BrokenPool()
+        ingestor.parser.extract_article_content = recording_parse
+
+        async def run():
+            return threading.get_ident(), await ingestor._parse_chunk([(0, generate_article(0), "https://example.com/0")])
+
+        loop_thread, [(index, parsed)] = asyncio.run(run())
+        self.assertEqual((index, parsed['status']), (0, 'success'))
+        self.assertNotIn(loop_thread, threads)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+
+from src.core.analysis.patterns import Pattern, PatternValidationError, merge_patterns, parse_patterns
+from tests.fixtures.analyzer import FakeModels, FakeResponse, make_analyzer, memory_cache
+
+
+class ScriptedModels(FakeModels):
+    def __init__(self, replies):
+        super().__init__()
+        self.replies = list(replies)
+
+    def generate_content(self, model, contents):
+        super().generate_content(model, contents)
+        return FakeResponse(self.replies.pop(0))
+
+
+class TestPatterns(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = make_analyzer(response_cache=memory_cache("llm_responses"))
+
+    def test_parse_tolerates_fences_prose_and_bad_items(self):
+        text = ('Here you go:\n```json\n[{"pattern": "Attacks spike on Mondays", "confidence": "80%", '
+                '"category": "Temporal"}, {"pattern": "", "confidence": 0.5}, "junk"]\n```')
+        patterns = parse_patterns(text)
+        self.assertEqual(patterns, [Pattern("Attacks spike on Mondays", 0.8, "temporal")])
+        with self.assertRaises(PatternValidationError):
+            parse_patterns('[{"pattern": "x", "confidence": 7}]')
+        with self.assertRaises(PatternValidationError):
+            parse_patterns("no json here")
+
+    def test_detect_patterns_repairs_invalid_output(self):
+        self.analyzer.client.models = ScriptedModels([
+            "Pattern: lots of DDoS (very confident)",
+            '[{"pattern": "DDoS against banks", "confidence": 0.9, "category": "behavioral"}]',
+        ])
+        patterns = self.analyzer.detect_patterns("feed data")
+        self.assertEqual(patterns[0]["pattern"], "DDoS against banks")
+        self.assertEqual(patterns[0]["confidence"], 0.9)
+        self.assertEqual(self.analyzer.client.models.calls, 2)
+
+        # Validated result is cached: no model call, no re-parse or repair
+        self.assertEqual(self.analyzer.detect_patterns("feed data"), patterns)
+        self.assertEqual(self.analyzer.client.models.calls, 2)
+
+    def test_repair_attempts_are_bounded(self):
+        self.analyzer.pattern_repair_attempts = 2
+        self.analyzer.client.models = ScriptedModels([f"bad reply {i}" for i in range(5)])
+        patterns = self.analyzer.detect_patterns("other data")
+        self.assertEqual(patterns[0]["confidence"], 0.0)
+        self.assertEqual(self.analyzer.client.models.calls, 3)
+
+        # Nothing from the failed run is cached: the model is asked again
+        self.analyzer.detect_patterns("other data")
+        self.assertEqual(self.analyzer.client.models.calls, 6)
+
+    def test_no_patterns_is_an_empty_list(self):
+        self.analyzer.client.models = ScriptedModels(["[]"])
+        self.assertEqual(self.analyzer.detect_patterns("quiet feed"), [])
+        self.assertEqual(self.analyzer.detect_patterns("quiet feed"), [])
+        self.assertEqual(self.analyzer.client.models.calls, 1)
+
+    def test_merge_counts_patterns_across_documents(self):
+        merged = merge_patterns([
+            [Pattern("Ransomware targets hospitals", 0.8, "behavioral", sources=("a",))],
+            [Pattern("ransomware targets  hospitals!", 0.6, sources=("b",)), Pattern("Other", 0.9)],
+        ])
+        self.assertEqual(merged[0].count, 2)
+        self.assertAlmostEqual(merged[0].confidence, 0.7)
+        self.assertEqual(merged[0].category, "behavioral")
+        self.assertEqual(merged[0].sources, ("a", "b"))
+        self.assertEqual(merged[1].pattern, "Other")
+
+
+if __name__ == "__main__":
+    unittest.main()
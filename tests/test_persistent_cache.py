@@ -0,0 +1,44 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from tests.fixtures.analyzer import make_analyzer, memory_cache
+
+
+class TestPersistentCache(unittest.TestCase):
+    def test_eviction_bounds_entries(self):
+        cache = memory_cache("bounded", max_entries=10)
+        for i in range(50):
+            cache.set(f"k{i}", i)
+        self.assertLessEqual(len(cache), 10)
+        self.assertEqual(cache.get("k49"), 49)
+        self.assertIsNone(cache.get("k0"))
+
+    def test_expired_entries_are_misses(self):
+        cache = memory_cache("ttl", default_ttl=-1)
+        cache.set("k", "v")
+        self.assertIsNone(cache.get("k"))
+
+
+class TestAnalyzerResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = make_analyzer(response_cache=memory_cache("llm_responses", default_ttl=60))
+
+    def test_identical_input_hits_cache(self):
+        first = self.analyzer.generate_summary("Some   article text")
+        second = self.analyzer.generate_summary("Some article text")
+        self.assertEqual(first, second)
+        self.assertEqual(self.analyzer.client.models.calls, 1)
+
+        self.analyzer.generate_summary("Different article text")
+        self.assertEqual(self.analyzer.client.models.calls, 2)
+
+    def test_cache_is_thread_safe(self):
+        self.analyzer.generate_summary("warm")
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: self.analyzer.generate_summary("warm"), range(32)))
+        self.assertEqual(set(results), {"response #1"})
+        self.assertEqual(self.analyzer.client.models.calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import json
+import os
+import tempfile
+import unittest
+import urllib.error
+import urllib.request
+from unittest import mock
+
+from src.core.analysis import rate_limiter
+from tests.fixtures.corpus_server import CorpusServer
+from tests.pipeline_benchmark import percentile, run_benchmark
+
+BENCHMARK_ENV = {
+    "LLM_BACKEND": "stub",
+    "LLM_STUB_LATENCY": "fixed:0",
+    "LLM_CACHE": "off",
+    "HTTP_CACHE_DIR": "off",
+    "GEMINI_RPM": "100000",
+}
+
+
+def fresh_limiters():
+    # Earlier tests may have created the shared limiter at the default 15 RPM
+    return mock.patch.dict(rate_limiter._shared_limiters, clear=True)
+
+
+class TestCorpusServer(unittest.TestCase):
+    def test_hosts_duplicates_and_failures(self):
+        with CorpusServer(size=40, hosts=4, duplicate_ratio=0.3, slow_ratio=0.1, slow_delay=0.01,
+                          fail_ratio=0.1, seed=5) as server:
+            self.assertEqual(len(server.urls), 40)
+            self.assertEqual(len(server.ports), 6)
+            mirror = next(url for url in server.urls if "/mirror" in url and str(server.ports['failing']) not in url)
+            with urllib.request.urlopen(mirror, timeout=5) as response:
+                mirror_body = response.read()
+            with urllib.request.urlopen(mirror.rsplit("/", 1)[0], timeout=5) as response:
+                self.assertEqual(response.read(), mirror_body)
+
+            failing = next(url for url in server.urls if f":{server.ports['failing']}/" in url)
+            with self.assertRaises(urllib.error.HTTPError) as ctx:
+                urllib.request.urlopen(failing, timeout=5)
+            self.assertEqual(ctx.exception.code, 503)
+
+    def test_url_layout_is_reproducible(self):
+        first = CorpusServer(size=50, seed=3)
+        second = CorpusServer(size=50, seed=3)
+        first.ports = second.ports = {**{f"host{i}": 1000 + i for i in range(16)}, 'slow': 2000, 'failing': 2001}
+        self.assertEqual(first._build_urls(), second._build_urls())
+
+
+class TestPipelineBenchmark(unittest.TestCase):
+    def test_percentile(self):
+        values = [float(v) for v in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_run_records_history(self):
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.dict(os.environ, BENCHMARK_ENV), fresh_limiters():
+            history = os.path.join(tmp, "history.jsonl")
+            options = {'hosts': 2, 'slow_ratio': 0.0, 'fail_ratio': 0.0, 'duplicate_ratio': 0.2, 'seed': 1}
+            for _ in range(2):
+                run_benchmark([10], ["fetch_osint", "run_pipeline"], history, options)
+            with open(history) as f:
+                entries = [json.loads(line) for line in f]
+
+        self.assertEqual([e['target'] for e in entries], ["fetch_osint", "run_pipeline"] * 2)
+        fetch, pipeline = entries[:2]
+        self.assertEqual(fetch['stages']['fetch']['count'], 10)
+        self.assertGreater(fetch['items_out'], 0)
+        self.assertIn('llm_request', pipeline['stages'])
+        self.assertGreater(pipeline['peak_rss_mb'], 0)
+        for key in ('p50_ms', 'p95_ms', 'p99_ms'):
+            self.assertIn(key, pipeline['stages']['clean'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import time
+import unittest
+
+from src.core.analysis.rate_limiter import RateLimiter, parse_retry_delay
+from tests.fixtures.analyzer import FakeClient, FakeModels, FakeResponse, make_analyzer
+
+
+class FlakyModels(FakeModels):
+    def generate_content(self, model, contents):
+        with self._lock:
+            self.calls += 1
+            if self.calls == 1:
+                raise RuntimeError('429 RESOURCE_EXHAUSTED {"retryDelay": "0s"}')
+        return FakeResponse("ok")
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_requests_are_spaced_to_quota(self):
+        limiter = RateLimiter(requests_per_minute=600, burst=1)
+        start = time.monotonic()
+        for _ in range(5):
+            limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.35)
+
+    def test_token_quota_limits_large_requests(self):
+        limiter = RateLimiter(requests_per_minute=6000, tokens_per_minute=6000)
+        self.assertEqual(limiter.reserve(6000), 0.0)
+        self.assertAlmostEqual(limiter.reserve(100), 1.0, places=1)
+
+    def test_throttle_pauses_and_recovers(self):
+        limiter = RateLimiter(requests_per_minute=6000)
+        limiter.report_throttled(retry_after=0.2)
+        self.assertEqual(limiter.rate_factor, 0.5)
+        self.assertGreater(limiter.reserve(), 0.1)
+        for _ in range(5):
+            limiter.report_success()
+        self.assertAlmostEqual(limiter.rate_factor, 1.0)
+
+    def test_parse_retry_delay(self):
+        self.assertEqual(parse_retry_delay('"retryDelay": "23s"'), 23.0)
+
+    def test_analyzer_retries_through_limiter(self):
+        analyzer = make_analyzer(client=FakeClient(FlakyModels()), rate_limiter=RateLimiter(requests_per_minute=6000))
+        self.assertEqual(analyzer.generate_summary("text"), "ok")
+        self.assertEqual(analyzer.rate_limiter.throttle_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
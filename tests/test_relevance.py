@@ -0,0 +1,73 @@
+import time
+import unittest
+
+from src.axis.filters.content_filter import Filter
+from src.axis.filters.relevance import RelevanceEngine, tokenize
+from src.core.analysis.analyzer import Analyzer
+from tests.fixtures.html_corpus import generate_corpus
+
+
+class TestRelevanceEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = RelevanceEngine()
+        self.documents = [
+            {"title": "Solid state batteries reach production",
+             "content": "Solid state batteries promise higher density. Battery makers scale solid state cells."},
+            {"title": "Markets today", "content": "Stocks rallied while bonds slipped and the dollar held steady."},
+            {"title": "EV roundup", "content": "Electric vehicles sold well; one maker mentioned batteries once."},
+        ]
+
+    def test_ranks_on_topic_documents_first(self):
+        scores = self.engine.score_batch(self.documents, "latest solid state batteries")
+        self.assertGreater(scores[0], scores[2])
+        self.assertGreater(scores[2], scores[1])
+        self.assertEqual(scores[1], 0.0)
+        self.assertTrue(all(0.0 <= s <= 1.0 for s in scores))
+
+    def test_stopword_only_query_keeps_everything(self):
+        self.assertEqual(tokenize("the latest news"), [])
+        self.assertEqual(self.engine.score_batch(self.documents, "the latest news"), [1.0, 1.0, 1.0])
+
+    def test_embedding_similarity_is_blended(self):
+        def embedder(texts):
+            return [[1.0, 0.0] if "dollar" in text or text == "currency" else [0.0, 1.0] for text in texts]
+
+        engine = RelevanceEngine(embedder=embedder, embedding_weight=0.5)
+        scores = engine.score_batch(self.documents, "currency")
+        self.assertEqual(scores[1], 0.5)
+        self.assertEqual(scores[0], 0.0)
+
+    def test_batch_of_thousand_documents_is_fast(self):
+        corpus = [{"content": html} for html in generate_corpus(1000, paragraphs=4, words_per_paragraph=60)]
+        start = time.perf_counter()
+        scores = self.engine.score_batch(corpus, "market analysis security")
+        elapsed = time.perf_counter() - start
+        self.assertEqual(len(scores), 1000)
+        self.assertLess(elapsed, 0.5)
+
+    def test_filter_drops_low_relevance_items(self):
+        content_filter = Filter()
+        kept = content_filter.filter_by_relevance(self.documents, "solid state batteries", threshold=0.05)
+        self.assertEqual([d["title"] for d in kept], ["Solid state batteries reach production", "EV roundup"])
+        self.assertIn("relevance", kept[1])
+        self.assertNotIn("relevance", self.documents[2])
+        self.assertEqual(content_filter.calculate_relevance_score(self.documents[0]), 1.0)
+
+    def test_single_document_scores_do_not_depend_on_batch(self):
+        document = {"title": "Grid report", "content": "Utilities expanded storage capacity across the grid. " * 4}
+        single = self.engine.score(document, "grid storage batteries")
+        self.assertEqual(single, self.engine.score_batch(self.documents + [document], "grid storage batteries",
+                                                         use_batch_idf=False)[-1])
+        # An on-topic page matching part of a multi-word query clears the default gate
+        self.assertGreater(single, 0.3)
+        self.assertGreater(Filter().calculate_relevance_score(document, ["grid", "outage", "forecast"]), 0.1)
+
+    def test_analyzer_scores_against_query(self):
+        analyzer = Analyzer()
+        self.assertEqual(analyzer.score_relevance("anything"), 1.0)
+        self.assertGreater(analyzer.score_relevance(self.documents[0], query="solid state batteries"), 0.3)
+        self.assertEqual(analyzer.score_relevance({"content": "bonds slipped", "query": "batteries"}), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
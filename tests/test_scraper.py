@@ -0,0 +1,215 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from aiohttp import web
+
+from src.axis.scrapers.osint_scraper import Scraper
+from src.axis.scrapers.http_cache import HTTPCache
+from src.axis.scrapers.resilience import RetryPolicy, CircuitBreaker
+
+
+class LocalSite:
+    """Small aiohttp server used to exercise the scraper without network access."""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.hits = 0
+        self.flaky_calls = 0
+        self.app = web.Application()
+        self.app.router.add_get('/page/{n}', self.page)
+        self.app.router.add_get('/slow', self.slow)
+        self.app.router.add_get('/pdf', self.pdf)
+        self.app.router.add_get('/big', self.big)
+        self.app.router.add_get('/latin', self.latin)
+        self.app.router.add_get('/etag', self.etag)
+        self.app.router.add_get('/flaky', self.flaky)
+        self.app.router.add_get('/down', self.down)
+        self.app.router.add_get('/throttled', self.throttled)
+        self.runner = None
+        self.base_url = ''
+
+    async def page(self, request):
+        self.hits += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.02)
+            return web.Response(text=f"<html><body><p>Page {request.match_info['n']}</p></body></html>",
+                                content_type='text/html')
+        finally:
+            self.active -= 1
+
+    async def slow(self, request):
+        await asyncio.sleep(1.0)
+        return web.Response(text="<html><body><p>Slow</p></body></html>", content_type='text/html')
+
+    async def pdf(self, request):
+        return web.Response(body=b'%PDF-1.4', content_type='application/pdf')
+
+    async def big(self, request):
+        return web.Response(body=b'<html><body>' + b'x' * 200000 + b'</body></html>', content_type='text/html')
+
+    async def latin(self, request):
+        body = '<html><head><meta charset="iso-8859-1"></head><body><p>caf\u00e9</p></body></html>'.encode('latin-1')
+        return web.Response(body=body, headers={'Content-Type': 'text/html'})
+
+    async def etag(self, request):
+        self.hits += 1
+        if request.headers.get('If-None-Match') == '"v1"':
+            return web.Response(status=304)
+        return web.Response(text="<html><body><p>Versioned</p></body></html>",
+                            content_type='text/html', headers={'ETag': '"v1"'})
+
+    async def flaky(self, request):
+        self.flaky_calls += 1
+        if self.flaky_calls == 1:
+            return web.Response(status=429, headers={'Retry-After': '0'})
+        return web.Response(text="<html><body><p>Recovered</p></body></html>", content_type='text/html')
+
+    async def down(self, request):
+        return web.Response(status=503)
+
+    async def throttled(self, request):
+        return web.Response(status=429, headers={'Retry-After': '0'})
+
+    async def start(self):
+        self.runner = web.AppRunner(self.app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+class TestScraper(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.site = LocalSite()
+        await self.site.start()
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.scraper = Scraper(max_in_flight=8, per_host_limit=3, http_cache=HTTPCache(self.cache_dir.name))
+        self.scraper.retry_policy = RetryPolicy(base_delay=0.01)
+
+    async def asyncTearDown(self):
+        await self.scraper.aclose()
+        await self.site.stop()
+        self.cache_dir.cleanup()
+
+    async def test_per_host_limit_and_session_reuse(self):
+        urls = [f"{self.site.base_url}/page/{i}" for i in range(20)]
+        results = await self.scraper._scrape_async(urls)
+        self.assertEqual([r['url'] for r in results], urls)
+        self.assertTrue(all(r['status_code'] == 200 for r in results))
+        self.assertLessEqual(self.site.peak, 3)
+        # Per-host semaphores are dropped once the host goes idle
+        self.assertEqual(self.scraper.scheduler._bind_loop().host_slots, {})
+
+        session = await self.scraper.scheduler.get_session()
+        await self.scraper._scrape_async(urls[:2])
+        self.assertIs(session, await self.scraper.scheduler.get_session())
+
+    async def test_iter_fetch_yields_in_completion_order(self):
+        urls = [f"{self.site.base_url}/slow"] + [f"{self.site.base_url}/page/{i}" for i in range(3)]
+        seen = []
+        async for result in self.scraper.iter_fetch(urls):
+            seen.append(result['index'])
+        self.assertEqual(sorted(seen), [0, 1, 2, 3])
+        self.assertEqual(seen[-1], 0)
+
+    async def test_body_cap_content_type_and_charset(self):
+        self.scraper.max_body_bytes = 1024
+        pdf, big, latin = await self.scraper._scrape_async(
+            [f"{self.site.base_url}/pdf", f"{self.site.base_url}/big", f"{self.site.base_url}/latin"])
+        self.assertEqual(pdf['html'], '')
+        self.assertIn('application/pdf', pdf['error'])
+        self.assertEqual(len(big['html']), 1024)
+        self.assertTrue(big['truncated'])
+        self.assertIn('caf\u00e9', latin['html'])
+        self.assertFalse(latin['truncated'])
+
+    async def test_conditional_request_served_from_cache(self):
+        url = f"{self.site.base_url}/etag"
+        first = (await self.scraper._scrape_async([url]))[0]
+        second = (await self.scraper._scrape_async([url]))[0]
+        self.assertFalse(first['from_cache'])
+        self.assertTrue(second['from_cache'])
+        self.assertEqual(first['html'], second['html'])
+        self.assertEqual(self.scraper.http_cache.hit_ratio, 0.5)
+
+        # A 304 revalidates the entry, so its max_age starts over
+        cache = self.scraper.http_cache
+        path = cache._path(url)
+        validated = os.path.getmtime(path) - 3600
+        os.utime(path, (validated, validated))
+        self.assertTrue((await self.scraper._scrape_async([url]))[0]['from_cache'])
+        self.assertGreater(os.path.getmtime(path), validated + 3000)
+        cache.max_age = 1800
+        self.assertIsNotNone(cache.load(url))
+
+    def test_http_cache_prunes_by_size_and_age(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = HTTPCache(tmp, max_bytes=4000, max_age=None)
+            for i in range(20):
+                self.assertTrue(cache.store(f"https://example.com/{i}", "x" * 500, '"v"', None))
+            self.assertGreater(cache.pruned, 0)
+            self.assertLessEqual(sum(size for _, size, _ in cache._scan()), 4000)
+            self.assertIsNotNone(cache.load("https://example.com/19"))
+
+            cache.max_age = -1
+            self.assertIsNone(cache.load("https://example.com/19"))
+            cache.prune()
+            self.assertEqual(cache._scan(), [])
+
+    async def test_retry_honours_retry_after(self):
+        result = (await self.scraper._scrape_async([f"{self.site.base_url}/flaky"]))[0]
+        self.assertEqual(result['status_code'], 200)
+        self.assertEqual(result['attempts'], 2)
+
+    async def test_circuit_breaker_fails_fast(self):
+        self.scraper.circuit_breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+        url = f"{self.site.base_url}/down"
+        first = (await self.scraper._scrape_async([url]))[0]
+        self.assertEqual(first['status_code'], 503)
+        self.assertEqual(first['attempts'], 3)
+        later = (await self.scraper._scrape_async([url]))[0]
+        self.assertIn('Circuit open', later['error'])
+        self.assertEqual(later['attempts'], 0)
+
+    async def test_rate_limiting_does_not_open_circuit(self):
+        self.scraper.circuit_breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+        url = f"{self.site.base_url}/throttled"
+        for _ in range(2):
+            result = (await self.scraper._scrape_async([url]))[0]
+            self.assertEqual(result['status_code'], 429)
+            self.assertEqual(result['attempts'], 3)
+
+    def test_circuit_breaker_forgets_recovered_and_stale_hosts(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60, max_hosts=2)
+        breaker.record_failure("a")
+        breaker.record_success("a")
+        self.assertEqual(breaker._hosts, {})
+        for host in ("b", "b", "c", "d"):
+            breaker.record_failure(host)
+        self.assertEqual(list(breaker._hosts), ["c", "d"])
+        self.assertEqual(breaker.state("b"), CircuitBreaker.CLOSED)
+        self.assertTrue(breaker.allow("unseen"))
+        self.assertNotIn("unseen", breaker._hosts)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(RetryPolicy.parse_retry_after('7'), 7.0)
+        self.assertIsNone(RetryPolicy.parse_retry_after('soon'))
+        self.assertEqual(RetryPolicy.parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+
+    async def test_invalid_url_reports_error(self):
+        results = await self.scraper._scrape_async(["not-a-url"])
+        self.assertEqual(results[0]['status_code'], 0)
+        self.assertTrue(results[0]['error'])
+
+
+if __name__ == "__main__":
+    unittest.main()
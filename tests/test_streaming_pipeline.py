@@ -0,0 +1,171 @@
+import asyncio
+import os
+import threading
+import unittest
+from concurrent.futures import CancelledError
+from unittest import mock
+
+from src.core.analysis import rate_limiter
+from src.core.analysis.llm_executor import LLMExecutor
+from src.core.pipeline.streaming import StreamingPipeline, parse_worker_spec, _DONE
+from tests.fixtures.corpus_server import CorpusServer
+
+PIPELINE_ENV = {
+    "LLM_BACKEND": "stub",
+    "LLM_STUB_LATENCY": "fixed:0.01",
+    "LLM_CACHE": "off",
+    "HTTP_CACHE_DIR": "off",
+    "GEMINI_RPM": "100000",
+}
+
+
+def article_id(url):
+    return int(url.split("/article/")[1].split("/")[0])
+
+
+def articles(result):
+    return sorted(article_id(item["url"]) for item in result["detailed_results"])
+
+
+def relevance(result):
+    return {article_id(item["url"]): round(item["relevance"], 6) for item in result["detailed_results"]}
+
+
+def fresh_limiters():
+    # Earlier tests may have created the shared limiter at the default 15 RPM
+    return mock.patch.dict(rate_limiter._shared_limiters, clear=True)
+
+
+class TestStreamingHelpers(unittest.IsolatedAsyncioTestCase):
+    def test_parse_worker_spec(self):
+        self.assertEqual(parse_worker_spec("fetch=64, summarize=8,bogus=3,parse=x"), {"fetch": 64, "summarize": 8})
+        self.assertEqual(parse_worker_spec(None), {})
+
+    async def test_take_drains_up_to_batch_and_keeps_done_marker(self):
+        queue = asyncio.Queue(maxsize=4)
+        for item in ({"index": 0}, {"index": 1}, _DONE):
+            queue.put_nowait(item)
+        self.assertEqual(await StreamingPipeline._take(queue, 5), [{"index": 0}, {"index": 1}])
+        self.assertIsNone(await StreamingPipeline._take(queue, 5))
+
+    async def test_take_waits_briefly_to_fill_a_batch(self):
+        queue = asyncio.Queue(maxsize=4)
+        queue.put_nowait({"index": 0})
+        asyncio.get_running_loop().call_later(0.05, queue.put_nowait, {"index": 1})
+        self.assertEqual(await StreamingPipeline._take(queue, 2, wait=1.0), [{"index": 0}, {"index": 1}])
+        queue.put_nowait({"index": 2})
+        self.assertEqual(await StreamingPipeline._take(queue, 2, wait=0.05), [{"index": 2}])
+        # Nothing is lost from the queue when the wait runs out
+        queue.put_nowait({"index": 3})
+        self.assertEqual(queue.get_nowait(), {"index": 3})
+
+
+class TestStreamingPipeline(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = CorpusServer(size=30, hosts=3, duplicate_ratio=0.2, slow_ratio=0.1, slow_delay=0.3,
+                                  fail_ratio=0.0, seed=2)
+        cls.urls = cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def run_core(self, mode):
+        from src.system_core import Core
+        with mock.patch.dict(os.environ, {**PIPELINE_ENV, "PIPELINE_MODE": mode}), fresh_limiters():
+            core = Core()
+            result = core.run_pipeline({"query": "supply chain", "source": self.urls})
+        core.ingestor.close()
+        return result
+
+    def test_matches_batch_mode(self):
+        streaming = self.run_core("streaming")
+        batch = self.run_core("batch")
+        self.assertEqual(streaming["status"], "completed")
+        # Which copy of a duplicated article survives depends on fetch completion order
+        self.assertEqual(articles(streaming), articles(batch))
+        # The relevance gate does not depend on which pages arrived in the same micro-batch
+        self.assertEqual(relevance(streaming), relevance(batch))
+        self.assertEqual(streaming["sources_processed"], batch["sources_processed"])
+        self.assertNotIn("metrics", batch)
+
+        metrics = streaming["metrics"]
+        self.assertEqual(metrics["stages"]["fetch"]["in"], 30)
+        self.assertEqual(metrics["stages"]["upsert"]["out"], streaming["sources_processed"])
+        # Slow pages are still being fetched when the first summaries come back
+        self.assertLess(metrics["time_to_first_summary_s"], metrics["elapsed_s"])
+        self.assertTrue(all(depth <= 64 for depth in metrics["max_queue_depth"].values()))
+
+    def test_bounded_queues_apply_backpressure(self):
+        from src.system_core import Core
+        with mock.patch.dict(os.environ, PIPELINE_ENV), fresh_limiters():
+            core = Core()
+            pipeline = StreamingPipeline(core, workers={"summarize": 1}, queue_size=2)
+
+            async def run():
+                try:
+                    return await pipeline.run(self.urls, None)
+                finally:
+                    await core.ingestor.scraper.aclose()
+
+            result = asyncio.run(run())
+        core.ingestor.close()
+        self.assertTrue(all(depth <= 2 for depth in result["metrics"]["max_queue_depth"].values()))
+        self.assertEqual(len(result["processed_items"]), len(result["summaries"]))
+        self.assertGreater(len(result["processed_items"]), 0)
+
+    def test_streamed_documents_share_summary_requests(self):
+        from src.system_core import Core
+        with mock.patch.dict(os.environ, PIPELINE_ENV), fresh_limiters():
+            core = Core()
+            executor = LLMExecutor(max_in_flight=4)
+            core.analyzer.llm_executor = executor
+            core.analyzer.summarizer.executor = executor
+            try:
+                result = core.run_pipeline({"source": self.urls})
+            finally:
+                executor.shutdown()
+                core.close()
+        # Counted before the executive report: summary requests only
+        requests = result["metrics"]["llm"]["completed"]
+        self.assertGreater(result["sources_processed"], 20)
+        self.assertLessEqual(requests * 2, result["sources_processed"])
+
+    def test_aclose_stops_the_run_before_anything_is_stored(self):
+        from src.system_core import Core
+        for mode in ("streaming", "batch"):
+            with self.subTest(mode=mode), fresh_limiters(), \
+                    mock.patch.dict(os.environ, {**PIPELINE_ENV, "PIPELINE_MODE": mode, "SUMMARY_BATCH": "off"}):
+                core = Core()
+                executor = LLMExecutor(max_in_flight=1)
+                core.analyzer.llm_executor = executor
+                core.analyzer.summarizer.executor = executor
+                core.vector_db.upsert_vectors = mock.Mock()
+                # Hold the only LLM worker so no summary can finish before the close
+                gate = threading.Event()
+                blocker = executor.submit(gate.wait, 5)
+
+                async def run():
+                    pipeline = asyncio.ensure_future(core.arun_pipeline({"source": self.urls}))
+                    for _ in range(500):
+                        if executor.get_stats()["queued"] >= 1:
+                            break
+                        await asyncio.sleep(0.01)
+                    await core.aclose()
+                    gate.set()
+                    return await pipeline
+
+                try:
+                    with self.assertRaises((CancelledError, asyncio.CancelledError)):
+                        asyncio.run(run())
+                finally:
+                    gate.set()
+                    blocker.result(timeout=5)
+                    executor.shutdown()
+                    core.ingestor.close()
+                core.vector_db.upsert_vectors.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
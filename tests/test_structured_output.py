@@ -0,0 +1,21 @@
+import unittest
+
+from src.core.analysis.structured_output import extract_json
+
+
+class TestExtractJSON(unittest.TestCase):
+    def test_bare_and_fenced_json(self):
+        self.assertEqual(extract_json('[{"id": "1"}]'), [{"id": "1"}])
+        self.assertEqual(extract_json('```json\n{"a": 1}\n```'), {"a": 1})
+
+    def test_json_surrounded_by_prose(self):
+        self.assertEqual(extract_json('Sure! Here it is: [1, 2] Hope that helps.'), [1, 2])
+
+    def test_no_json_raises(self):
+        for text in ("", "no json here", "[unterminated"):
+            with self.assertRaises(ValueError):
+                extract_json(text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from concurrent.futures import CancelledError
+from unittest import mock
+
+from src.core.analysis.rate_limiter import estimate_tokens
+from src.core.analysis.summarization import chunk_text
+from tests.fixtures.analyzer import make_analyzer
+
+
+class TestMapReduceSummarization(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = make_analyzer()
+        self.analyzer.summary_mode = "map_reduce"
+        self.analyzer.summarizer.chunk_tokens = 500
+        self.analyzer.summarizer.reduce_tokens = 800
+
+    def test_chunk_text_respects_budget_and_keeps_content(self):
+        text = "\n\n".join(f"Paragraph {i}. " + "word " * 150 for i in range(40))
+        chunks = chunk_text(text, 500)
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(estimate_tokens(c) <= 500 for c in chunks))
+        self.assertEqual("".join(text.split()), "".join("".join(chunks).split()))
+
+    def test_long_document_is_not_truncated(self):
+        text = "\n\n".join(f"MARKER{i} " + "detail " * 200 for i in range(30))
+        self.analyzer.generate_summary(text)
+        prompts = "\n".join(self.analyzer.client.models.prompts)
+        for i in range(30):
+            self.assertIn(f"MARKER{i} ", prompts)
+        self.assertGreater(self.analyzer.client.models.calls, 1)
+
+    def test_short_document_uses_single_call(self):
+        self.analyzer.generate_summary("short article")
+        self.assertEqual(self.analyzer.client.models.calls, 1)
+
+    def test_executive_report_keeps_every_source(self):
+        summaries = [f"SOURCE{i} " + "finding " * 120 for i in range(150)]
+        report = self.analyzer.generate_executive_report(summaries, "test topic")
+        self.assertTrue(report.startswith("response"))
+        models = self.analyzer.client.models
+        prompts = "\n".join(models.prompts)
+        for i in range(150):
+            self.assertIn(f"SOURCE{i} ", prompts)
+        self.assertTrue(all(estimate_tokens(p) < 1200 for p in models.prompts))
+        self.assertIn("150 intelligence reports", models.prompts[-1])
+
+    def test_executive_report_propagates_cancellation(self):
+        with mock.patch.object(self.analyzer.summarizer, 'reduce', side_effect=CancelledError("cancelled")):
+            with self.assertRaises(CancelledError):
+                self.analyzer.generate_executive_report(["finding"], "test topic")
+
+
+if __name__ == "__main__":
+    unittest.main()
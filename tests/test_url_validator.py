@@ -0,0 +1,84 @@
+import asyncio
+import time
+import unittest
+
+from aiohttp import web
+
+from src.core.analysis.url_validator import URLValidator
+from tests.fixtures.analyzer import memory_cache
+
+
+class TestURLValidator(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.checks = 0
+        app = web.Application()
+        app.router.add_route('*', '/ok/{n}', self.ok)
+        app.router.add_route('*', '/nohead', self.nohead)
+        app.router.add_route('*', '/missing', self.missing)
+        app.router.add_route('*', '/slow', self.slow)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, '127.0.0.1', 0).start()
+        port = self.runner.addresses[0][1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        self.validator = URLValidator(timeout=2.0, cache=memory_cache("url_validation"))
+
+    async def asyncTearDown(self):
+        await self.validator.aclose()
+        await self.runner.cleanup()
+
+    async def ok(self, request):
+        self.checks += 1
+        await asyncio.sleep(0.01 * int(request.match_info['n']))
+        return web.Response(text="ok")
+
+    async def nohead(self, request):
+        if request.method == 'HEAD':
+            return web.Response(status=405)
+        return web.Response(status=206, text="o")
+
+    async def missing(self, request):
+        return web.Response(status=404)
+
+    async def slow(self, request):
+        await asyncio.sleep(1.5)
+        return web.Response(text="slow")
+
+    async def test_keeps_ranked_order_and_falls_back_to_get(self):
+        urls = [f"{self.base_url}/ok/5", f"{self.base_url}/missing",
+                f"{self.base_url}/nohead", f"{self.base_url}/ok/1"]
+        valid = await self.validator.validate_async(urls)
+        self.assertEqual(valid, [urls[0], urls[2], urls[3]])
+
+    async def test_stops_once_target_reached(self):
+        urls = [f"{self.base_url}/slow"] + [f"{self.base_url}/ok/{n}" for n in range(3)]
+        start = time.monotonic()
+        valid = await self.validator.validate_async(urls, target_count=2)
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(len(valid), 2)
+        self.assertNotIn(urls[0], valid)
+
+    async def test_per_call_timeout_overrides_default(self):
+        start = time.monotonic()
+        valid = await self.validator.validate_async([f"{self.base_url}/slow"], timeout=0.2)
+        self.assertEqual(valid, [])
+        self.assertLess(time.monotonic() - start, 1.0)
+
+    async def test_results_are_cached(self):
+        urls = [f"{self.base_url}/ok/{n}" for n in range(3)]
+        await self.validator.validate_async(urls)
+        checks = self.checks
+        self.assertEqual(await self.validator.validate_async(urls), urls)
+        self.assertEqual(self.checks, checks)
+
+    async def test_session_is_reused_until_closed(self):
+        await self.validator.validate_async([f"{self.base_url}/ok/0"])
+        session = await self.validator._get_session()
+        await self.validator.validate_async([f"{self.base_url}/ok/1"])
+        self.assertIs(await self.validator._get_session(), session)
+        await self.validator.aclose()
+        self.assertTrue(session.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()